@@ -1,67 +1,248 @@
-from fastapi import APIRouter, HTTPException
+import time
+
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
-from app.services.ats_scorer import analyze_resume
-from app.services.ats_fixer import apply_fixes
-from app.services.pdf_exporter import generate_resume_pdf
-from app.services.ai_rewriter import rewrite_line_hf
+from app.services.ats_scorer import MIN_RESUME_CHARS, analyze_resume, analyze_resumes
+from app.services.ats_fixer import fix_resume
+from app.services.pdf_exporter import iter_chunks, render_resume_pdf, stream_pdf_zip
+from app.services.executors import cpu, get_process_pool, run_in_process, run_in_thread
+from app.services.ai_rewriter import rewrite_batcher
+from app.services.resume_sessions import EditError, SessionNotFound, VersionConflict, resume_sessions
+from app.config import CPU_POOL_SIZE, PDF_EXPORT_MAX_BATCH, REWRITE_MAX_BULK_LINES
+from app.utils.metrics import span
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 
 @router.post("/score")
-def ats_score(payload: dict):
+async def ats_score(payload: dict, request: Request):
     resume_text = payload.get("resume_text", "")
     skills = payload.get("skills", [])
     experience = payload.get("experience", 0)
 
-    if not resume_text or len(resume_text.strip()) < 50:
+    if not resume_text or len(resume_text.strip()) < MIN_RESUME_CHARS:
         raise HTTPException(
             status_code=400,
             detail="Resume text is empty or too short"
         )
 
-    return analyze_resume(resume_text, skills, experience)
+    return await response_cache.respond(
+        request, "ats/score", payload,
+        lambda: run_in_thread(analyze_resume, resume_text, skills, experience)
+    )
+
+
+@router.post("/score/batch")
+async def ats_score_batch(payload: dict):
+    resumes = payload.get("resumes", [])
+
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resumes to score")
+    if not isinstance(resumes, list) or not all(isinstance(item, dict) for item in resumes):
+        raise HTTPException(status_code=400, detail="resumes must be a list of objects")
+
+    # Whole batches are CPU-bound: a worker process, not a thread
+    return {"results": await run_in_process(analyze_resumes, resumes)}
+
+
+def _valid_fix(item) -> bool:
+    if not isinstance(item, dict):
+        return False
+    number = item.get("line_number")
+    return (
+        all(isinstance(item.get(key) or "", str) for key in ("line", "improved_example", "rewritten"))
+        and (number is None or (isinstance(number, int) and not isinstance(number, bool)))
+    )
 
 
 @router.post("/apply-fixes")
-def apply_ats_fixes(payload: dict):
+async def apply_ats_fixes(payload: dict):
     resume_text = payload.get("resume_text", "")
     feedback = payload.get("feedback", [])
+    # Clients that render the patch can skip the full text in the response
+    include_text = payload.get("include_text", True)
 
-    if not resume_text:
+    if not resume_text or not isinstance(resume_text, str):
         raise HTTPException(status_code=400, detail="Resume text missing")
+    if not isinstance(feedback, list) or not all(_valid_fix(item) for item in feedback):
+        raise HTTPException(
+            status_code=400,
+            detail="feedback must be a list of objects with string line / improved_example / rewritten "
+                   "and an integer line_number"
+        )
+
+    result = await run_in_thread(fix_resume, resume_text, feedback)
+    if not include_text:
+        result.pop("improved_resume")
+    return result
+
+
+# ---------------- EDITING SESSIONS ----------------
+@router.post("/sessions")
+async def create_session(payload: dict):
+    resume_text = payload.get("resume_text", "")
+
+    if not resume_text or len(resume_text.strip()) < MIN_RESUME_CHARS:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text is empty or too short"
+        )
+
+    # The first scan is proportional to the resume; edits are not
+    return await run_in_thread(
+        resume_sessions.create, resume_text, payload.get("skills", []), payload.get("experience", 0)
+    )
+
+
+@router.patch("/sessions/{session_id}")
+async def edit_session(session_id: str, payload: dict):
+    edits = payload.get("edits", [])
+
+    if not isinstance(edits, list):
+        raise HTTPException(status_code=400, detail="edits must be a list")
+
+    try:
+        return resume_sessions.edit(
+            session_id, edits,
+            base_version=payload.get("base_version"),
+            skills=payload.get("skills"),
+            experience=payload.get("experience"),
+        )
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    except VersionConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except EditError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/sessions/{session_id}")
+async def read_session(session_id: str):
+    try:
+        return resume_sessions.read(session_id)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
 
-    return {
-        "improved_resume": apply_fixes(resume_text, feedback)
-    }
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    if not resume_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"deleted": session_id}
 
 
 @router.post("/export-pdf")
-def export_pdf(payload: dict):
+async def export_pdf(payload: dict):
     resume_text = payload.get("resume_text", "")
 
     if not resume_text:
         raise HTTPException(status_code=400, detail="Resume text missing")
 
-    pdf_stream = generate_resume_pdf(resume_text)
+    # Rendering is CPU-bound: keep it off the event loop and the GIL
+    start = time.perf_counter()
+    with span("pdf_render"):
+        pdf_bytes, pages = await run_in_process(render_resume_pdf, resume_text)
+    render_ms = (time.perf_counter() - start) * 1000
 
     return StreamingResponse(
-        pdf_stream,
+        iter_chunks(pdf_bytes),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": "attachment; filename=improved_resume.pdf"
+            "Content-Disposition": "attachment; filename=improved_resume.pdf",
+            "Content-Length": str(len(pdf_bytes)),
+            "X-PDF-Pages": str(pages),
+            "X-Render-Ms": f"{render_ms:.1f}"
+        }
+    )
+
+
+@router.post("/export-pdf/batch")
+async def export_pdf_batch(payload: dict):
+    # [{"filename": ..., "resume_text": ...}] or plain strings
+    resumes = payload.get("resumes", [])
+    if not isinstance(resumes, list) or not all(
+        isinstance(item, str) or (
+            isinstance(item, dict)
+            and isinstance(item.get("resume_text", ""), str)
+            and isinstance(item.get("filename") or "", str)
+        )
+        for item in resumes
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="resumes must be a list of strings or {filename, resume_text} objects with string values"
+        )
+
+    resumes = [
+        (None, item) if isinstance(item, str) else (item.get("filename"), item.get("resume_text", ""))
+        for item in resumes
+    ]
+    resumes = [(name, text) for name, text in resumes if text and text.strip()]
+
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resumes to export")
+
+    if len(resumes) > PDF_EXPORT_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {PDF_EXPORT_MAX_BATCH} resumes per request"
+        )
+
+    # The zip bounds its own in-flight renders; only refuse to start it
+    # while the process pool is already backed up
+    cpu.admit()
+    return StreamingResponse(
+        stream_pdf_zip(resumes, get_process_pool(), max_in_flight=CPU_POOL_SIZE * 2),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=resumes.zip"
         }
     )
 
 
 @router.post("/ai-rewrite")
-def ai_rewrite(payload: dict):
+async def ai_rewrite(payload: dict):
     line = payload.get("line", "")
 
-    if not line.strip():
+    if not isinstance(line, str) or not line.strip():
         raise HTTPException(status_code=400, detail="Line text missing")
 
     return {
-        "rewritten": rewrite_line_hf(line)
+        "rewritten": await rewrite_batcher.submit(line)
+    }
+
+
+@router.post("/ai-rewrite/bulk")
+async def ai_rewrite_bulk(payload: dict):
+    # Accepts plain lines or analyze_resume's line_feedback items as-is
+    lines = payload.get("lines")
+    feedback = payload.get("line_feedback", [])
+    if lines is not None and (not isinstance(lines, list) or not all(isinstance(line, str) for line in lines)):
+        raise HTTPException(status_code=400, detail="lines must be a list of strings")
+    if not lines:
+        if not isinstance(feedback, list) or not all(
+            isinstance(item, dict) and isinstance(item.get("line", ""), str) for item in feedback
+        ):
+            raise HTTPException(status_code=400, detail="line_feedback must be a list of objects with a string line")
+        lines = [item.get("line", "") for item in feedback]
+    lines = [line for line in lines if line.strip()]
+
+    if not lines:
+        raise HTTPException(status_code=400, detail="No lines to rewrite")
+
+    if len(lines) > REWRITE_MAX_BULK_LINES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {REWRITE_MAX_BULK_LINES} lines per request"
+        )
+
+    rewritten = await rewrite_batcher.submit_many(lines)
+
+    return {
+        "rewrites": [
+            {"line": line, "rewritten": new}
+            for line, new in zip(lines, rewritten)
+        ]
     }
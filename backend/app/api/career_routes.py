@@ -1,8 +1,27 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
 from app.services.career_recommender import recommend_career
+from app.services.executors import run_in_thread
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
+MAX_PROGRESSIONS = 10
+
 @router.post("/recommend")
-def career_recommend(data: dict):
-    return recommend_career(data.get("skills", []))
+async def career_recommend(data: dict, request: Request):
+    try:
+        k = min(max(int(data.get("k") or 3), 1), MAX_PROGRESSIONS)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="k must be an integer")
+
+    skills, target_role = data.get("skills", []), data.get("target_role")
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise HTTPException(status_code=400, detail="skills must be a list of strings")
+    # Both end up in the graph's cache key, which must be hashable
+    if target_role is not None and not isinstance(target_role, str):
+        raise HTTPException(status_code=400, detail="target_role must be a string")
+
+    return await response_cache.respond(
+        request, "career/recommend", data,
+        lambda: run_in_thread(recommend_career, skills, k, target_role)
+    )
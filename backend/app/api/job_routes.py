@@ -1,15 +1,65 @@
-from fastapi import APIRouter
-from app.api.schemas import JobRecommendRequest
-from app.services.job_matcher import recommend_jobs
+from fastapi import APIRouter, Request
+from app.api.schemas import JobRecommendRequest, JobSearchRequest
+from app.services.executors import run_in_thread, run_inference
+from app.services.job_catalog import get_catalog
+from app.services.job_matcher import recommend_jobs, semantic_mode
+from app.services.job_search import search_jobs
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
+def catalog_version(catalog):
+    return catalog.version if catalog is not None else None
+
 @router.post("/recommend")
-def recommend_jobs_api(request: JobRecommendRequest):
-    jobs = recommend_jobs(
-        resume_text=request.resume_text,
-        resume_skills=request.skills or [],
-        experience=request.experience or 0
+async def recommend_jobs_api(request: JobRecommendRequest, http_request: Request):
+    catalog = get_catalog()
+    version = catalog_version(catalog)
+
+    # Hybrid results change once the job embeddings / ANN index are ready
+    if request.ranking == "hybrid" and catalog is not None:
+        version = f"{version}-{semantic_mode(catalog)}"
+
+    # Hybrid ranking embeds the resume, so it runs with the other model calls
+    run = run_inference if request.ranking == "hybrid" else run_in_thread
+
+    async def compute():
+        jobs = await run(
+            recommend_jobs,
+            resume_text=request.resume_text,
+            resume_skills=request.skills or [],
+            experience=request.experience or 0,
+            limit=request.limit,
+            offset=request.offset,
+            ranking=request.ranking,
+            catalog=catalog
+        )
+        return {"recommended_jobs": jobs}
+
+    return await response_cache.respond(
+        http_request, "jobs/recommend", request, compute, version=version, tags=("catalog",)
     )
 
-    return {"recommended_jobs": jobs}
+@router.post("/search")
+async def search_jobs_api(request: JobSearchRequest, http_request: Request):
+    catalog = get_catalog()
+
+    async def compute():
+        return await run_in_thread(
+            search_jobs,
+            query=request.query,
+            job_type=request.job_type,
+            market_demand=request.market_demand,
+            skills=request.skills,
+            date_from=request.date_from,
+            date_to=request.date_to,
+            limit=request.limit,
+            offset=request.offset,
+            top_skills=request.top_skills,
+            catalog=catalog
+        )
+
+    return await response_cache.respond(
+        http_request, "jobs/search", request, compute,
+        version=catalog_version(catalog), tags=("catalog",)
+    )
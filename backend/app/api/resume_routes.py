@@ -1,26 +1,122 @@
-from fastapi import APIRouter, UploadFile, File
-import shutil
-import os
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List
+from io import BytesIO
+import itertools
+import time
+import zipfile
 
-from app.utils.text_extractor import extract_text_from_resume
+from app.config import MAX_UPLOAD_MB, MAX_RESUME_PAGES, MAX_BATCH_MB
+from app.services.batch_pipeline import iter_zip, run_batch, to_ndjson
+from app.services.extraction import extract_document
+from app.services.executors import (
+    ExecutorSaturated,
+    cpu,
+    get_process_pool,
+    run_in_thread,
+)
+from app.utils.text_extractor import SUPPORTED_EXTENSIONS, ExtractionLimitError
 from app.services.resume_parser import parse_resume
+from app.utils.metrics import span
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+MAX_BATCH_BYTES = int(MAX_BATCH_MB * 1024 * 1024)
+CHUNK_SIZE = 256 * 1024
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read the (already spooled) upload in chunks, aborting as soon as
+    it grows past `max_bytes`
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File larger than {max_bytes / (1024 * 1024):g} MB"
+    )
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    chunks = []
+    total = 0
+    while chunk := await file.read(CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
 
 @router.post("/upload")
-async def upload_resume(file: UploadFile = File(...)):
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
+async def upload_resume(
+    file: UploadFile = File(...),
+    fast: bool = Query(None, description="Faster PDF layout analysis (see EXTRACT_FAST_LAYOUT)"),
+):
+    filename = file.filename or ""
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX resumes are supported")
+
+    timings = {}
+
+    start = time.perf_counter()
+    data = await read_upload(file, MAX_UPLOAD_BYTES)
+    timings["read_ms"] = round((time.perf_counter() - start) * 1000, 1)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # pdfminer is CPU-bound: keep it off the event loop and out of the GIL
+    # (cached by content hash; long PDFs are split across workers)
+    start = time.perf_counter()
+    try:
+        with span("text_extraction"):
+            text, extraction = await extract_document(data, filename, MAX_RESUME_PAGES, fast)
+    except ExtractionLimitError as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    except ExecutorSaturated:
+        raise
+    except Exception:
+        raise HTTPException(status_code=400, detail="Could not read text from this file")
+    timings["extract_ms"] = round((time.perf_counter() - start) * 1000, 1)
 
-    text = extract_text_from_resume(file_path)
-    parsed_data = parse_resume(text)
+    start = time.perf_counter()
+    parsed_data = await run_in_thread(parse_resume, text)
+    timings["parse_ms"] = round((time.perf_counter() - start) * 1000, 1)
 
     return {
-        "filename": file.filename,
-        "parsed_resume": parsed_data
+        "filename": filename,
+        "parsed_resume": parsed_data,
+        "extraction": extraction,
+        "timings_ms": timings
     }
+
+
+@router.post("/batch")
+async def batch_resumes(files: List[UploadFile] = File(...)):
+    """
+    Screen many resumes (multi-file upload and/or zip archives).
+    Results stream back as NDJSON in completion order, followed by a
+    summary line with per-stage throughput.
+    """
+    sources = []
+    budget = MAX_BATCH_BYTES
+
+    for file in files:
+        data = await read_upload(file, budget)
+        budget -= len(data)
+        filename = file.filename or ""
+
+        if filename.lower().endswith(".zip"):
+            try:
+                zipfile.ZipFile(BytesIO(data)).close()
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"{filename} is not a valid zip archive")
+            sources.append(iter_zip(data))
+        else:
+            sources.append([(filename, data)])
+
+    # run_batch bounds its own in-flight files; only refuse to start it
+    # while the process pool is already backed up
+    cpu.admit()
+    results = run_batch(itertools.chain.from_iterable(sources), get_process_pool())
+
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
@@ -1,10 +1,25 @@
-from pydantic import BaseModel
-from typing import List
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 class JobRecommendRequest(BaseModel):
     resume_text: str
     skills: List[str]
     experience: int
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    ranking: Literal["skills", "lexical", "hybrid"] = "skills"
+
+class JobSearchRequest(BaseModel):
+    query: str = ""
+    job_type: List[Literal["INTERNSHIP", "FRESHER"]] = []
+    market_demand: List[str] = []
+    skills: List[str] = []
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    top_skills: int = Field(10, ge=0, le=50)
 
 class ATSRequest(BaseModel):
     resume: dict
@@ -0,0 +1,127 @@
+import os
+
+# Settings are read from the environment (or backend/.env via the shell)
+
+
+def _env_list(name: str, default: str = "") -> list:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# ---------------- JOB STORE ----------------
+# SQLite job catalog (seeded from datasets/jobs.csv when empty)
+JOBS_DB = os.getenv("JOBS_DB", "datasets/jobs.sqlite")
+
+# ---------------- WORKERS ----------------
+# Catalog snapshots are written once as memory-mapped files under
+# CACHE_DIR/catalog and shared read-only by every worker process
+SHARED_CATALOG = os.getenv("SHARED_CATALOG", "1").lower() in ("1", "true", "yes")
+
+# How often non-leader workers try to take over the scheduler
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "30"))
+
+# ---------------- MODELS ----------------
+# Models to load at startup instead of on first use, e.g. "rewriter,embeddings"
+MODEL_WARMUP = _env_list("MODEL_WARMUP")
+
+# Under gunicorn, models the master loads before forking when MODEL_WARMUP
+# is unset, so workers share one copy instead of each loading its own on
+# first use ("" to skip)
+GUNICORN_PRELOAD_MODELS = _env_list("GUNICORN_PRELOAD_MODELS", "rewriter,embeddings")
+
+# Unload models unused for this many seconds (0 keeps them loaded forever)
+MODEL_IDLE_TTL = float(os.getenv("MODEL_IDLE_TTL", "0"))
+
+# Inference backend per model: torch (fp32), torch-int8 (dynamic
+# quantization at load), onnx or onnx-int8 (ONNX Runtime; needs the
+# artifacts from `python -m app.ml_models.export_models`)
+REWRITER_BACKEND = os.getenv("REWRITER_BACKEND", "torch")
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "torch")
+
+# Exported / downloaded model files; used instead of the hub when present
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+
+# Intra-op threads per model call (torch and ONNX Runtime); 0 = library default
+INFERENCE_INTRA_THREADS = int(os.getenv("INFERENCE_INTRA_THREADS", "0"))
+INFERENCE_INTEROP_THREADS = int(os.getenv("INFERENCE_INTEROP_THREADS", "1"))
+
+# ---------------- AI REWRITE BATCHING ----------------
+# Requests arriving within REWRITE_MAX_WAIT_MS are generated together
+REWRITE_MAX_BATCH = int(os.getenv("REWRITE_MAX_BATCH", "16"))
+REWRITE_MAX_WAIT_MS = float(os.getenv("REWRITE_MAX_WAIT_MS", "10"))
+REWRITE_MAX_BULK_LINES = int(os.getenv("REWRITE_MAX_BULK_LINES", "200"))
+# Lines waiting for the rewriter before new requests get a 503
+REWRITE_MAX_PENDING = int(os.getenv("REWRITE_MAX_PENDING", "1024"))
+
+# ---------------- CACHING ----------------
+# Derived artifacts (embeddings, TF-IDF index, content caches) live here
+CACHE_DIR = os.getenv("CACHE_DIR", "datasets/cache")
+
+# Content-addressed cache for AI rewrites and embeddings
+CONTENT_CACHE_ITEMS = int(os.getenv("CONTENT_CACHE_ITEMS", "4096"))
+CONTENT_CACHE_DISK_MB = int(os.getenv("CONTENT_CACHE_DISK_MB", "256"))  # 0 = memory only
+
+# Whole JSON responses of deterministic endpoints (served with ETags)
+RESPONSE_CACHE_ITEMS = int(os.getenv("RESPONSE_CACHE_ITEMS", "2048"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "600"))  # seconds
+
+# Resume editing sessions (PATCH /ats/sessions/{id}), kept in memory
+RESUME_SESSION_ITEMS = int(os.getenv("RESUME_SESSION_ITEMS", "1000"))
+RESUME_SESSION_TTL = float(os.getenv("RESUME_SESSION_TTL", "3600"))  # idle seconds
+
+# ---------------- SEMANTIC SEARCH ----------------
+# Catalogs with at least this many jobs rank semantic matches through the
+# IVF-PQ index (app.ml_models.ann_index) instead of scoring every job
+ANN_MIN_JOBS = int(os.getenv("ANN_MIN_JOBS", "200000"))
+# Inverted lists scanned per query: more lists, higher recall, slower
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "64"))
+# Best approximate candidates re-scored against the full vectors (0 = off)
+ANN_RERANK = int(os.getenv("ANN_RERANK", "2000"))
+# Semantic matches per query fed into hybrid ranking
+ANN_CANDIDATES = int(os.getenv("ANN_CANDIDATES", "1000"))
+# Index shape at build time; 0 picks from the catalog size / vector size
+ANN_NLIST = int(os.getenv("ANN_NLIST", "0"))
+ANN_SUBQUANTIZERS = int(os.getenv("ANN_SUBQUANTIZERS", "0"))
+
+# ---------------- RESUME UPLOADS ----------------
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "10"))
+MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "20"))
+
+# Extracted text is cached by file content hash (memory + CACHE_DIR)
+EXTRACTION_CACHE_ITEMS = int(os.getenv("EXTRACTION_CACHE_ITEMS", "512"))
+
+# PDFs with at least this many pages are split into page ranges of
+# EXTRACT_PAGES_PER_TASK, extracted in parallel worker processes
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "8"))
+EXTRACT_PAGES_PER_TASK = int(os.getenv("EXTRACT_PAGES_PER_TASK", "4"))
+
+# Skip reading-order analysis in PDF layout (see text_extractor.FAST_LAPARAMS);
+# uploads can also ask for it with ?fast=true
+EXTRACT_FAST_LAYOUT = os.getenv("EXTRACT_FAST_LAYOUT", "0").lower() in ("1", "true", "yes")
+
+# Bulk screening (/resume/batch): total upload size, incl. zip archives
+MAX_BATCH_MB = float(os.getenv("MAX_BATCH_MB", "200"))
+
+# ---------------- PDF EXPORT ----------------
+# Resumes per /ats/export-pdf/batch request
+PDF_EXPORT_MAX_BATCH = int(os.getenv("PDF_EXPORT_MAX_BATCH", "500"))
+
+# ---------------- PROFILING ----------------
+# Lets a request ask for a sampled profile with an "X-Profile: 1" header
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0").lower() in ("1", "true", "yes")
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+
+# ---------------- EXECUTORS ----------------
+# Worker processes for CPU-heavy work such as PDF text extraction
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 2)))
+CPU_QUEUE_LIMIT = int(os.getenv("CPU_QUEUE_LIMIT", str(max(32, CPU_POOL_SIZE * 8))))
+
+# Threads for in-process work on the job catalog (matching, search, scoring)
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", str(min(8, os.cpu_count() or 2))))
+THREAD_QUEUE_LIMIT = int(os.getenv("THREAD_QUEUE_LIMIT", "256"))
+
+# Threads reserved for model calls (AI rewrite, query embeddings)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "1"))
+INFERENCE_QUEUE_LIMIT = int(os.getenv("INFERENCE_QUEUE_LIMIT", "256"))
+
+# Longest a request waits for a free executor before getting a 503
+EXECUTOR_QUEUE_TIMEOUT = float(os.getenv("EXECUTOR_QUEUE_TIMEOUT", "10"))  # seconds
@@ -0,0 +1,279 @@
+"""
+Embedded SQLite job store.
+
+    python -m app.database.job_store import datasets/jobs.csv
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, timedelta
+
+import pandas as pd
+
+from app.config import JOBS_DB
+from app.utils.metrics import span
+from app.utils.skill_matcher import normalize_skills
+
+SEED_FILE = "datasets/jobs.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    skills TEXT NOT NULL DEFAULT '',
+    market_demand TEXT NOT NULL DEFAULT '',
+    date_posted TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(title);
+CREATE INDEX IF NOT EXISTS idx_jobs_date_posted ON jobs(date_posted);
+CREATE INDEX IF NOT EXISTS idx_jobs_demand_date ON jobs(market_demand, date_posted);
+
+CREATE TABLE IF NOT EXISTS job_skills (
+    skill TEXT NOT NULL,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    PRIMARY KEY (skill, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills(job_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+JOB_COLUMNS = ("title", "description", "skills", "market_demand", "date_posted")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def _split_skills(skills) -> list:
+    if isinstance(skills, (list, tuple)):
+        items = skills
+    else:
+        items = str(skills or "").split(",")
+    return normalize_skills(s for s in items if s and s.strip())
+
+
+def job_key(job: dict) -> str:
+    """
+    Stable identity of a posting: an explicit job_key if the source has
+    one, otherwise a hash of its title and description
+    """
+    if job.get("job_key"):
+        return str(job["job_key"])
+    raw = f"{job.get('title', '')}\0{job.get('description', '')}".encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def connect(path=None):
+    """
+    Per-thread connection to the store (schema created and seeded from
+    jobs.csv on first use). WAL mode lets readers keep a consistent
+    snapshot while a refresh transaction is writing.
+    """
+    path = path or JOBS_DB
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[path] = conn
+        _ensure_initialized(conn, path)
+
+    return conn
+
+
+def _ensure_initialized(conn, path):
+    with _init_lock:
+        if path in _initialized:
+            return
+
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('generation', ?)", (uuid.uuid4().hex[:8],)
+            )
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('revision', '0')")
+            empty = conn.execute("SELECT NOT EXISTS (SELECT 1 FROM jobs)").fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        _initialized.add(path)
+
+    if empty and os.path.exists(SEED_FILE):
+        count = import_csv(SEED_FILE, path)
+        print(f"🗄️ Job store seeded with {count} jobs from {SEED_FILE}")
+
+
+def _bump_revision(conn):
+    conn.execute(
+        "UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'"
+    )
+
+
+def _read_version(conn) -> str:
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    return f"{meta['generation']}-{meta['revision']}"
+
+
+def catalog_version(path=None) -> str:
+    """
+    Changes with every committed write; cheap enough to poll
+    """
+    return _read_version(connect(path))
+
+
+# ---------------- WRITES ----------------
+def bulk_upsert(jobs, path=None) -> int:
+    """
+    Insert or update many postings (matched on job_key) and their skill
+    rows in one transaction: readers see all of it or none of it
+    """
+    conn = connect(path)
+    count = 0
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for job in jobs:
+            skills = _split_skills(job.get("skills"))
+            values = {
+                "title": str(job.get("title") or ""),
+                "description": str(job.get("description") or ""),
+                "skills": ",".join(skills),
+                "market_demand": str(job.get("market_demand") or ""),
+                "date_posted": str(job.get("date_posted") or ""),
+            }
+
+            job_id = conn.execute(
+                "INSERT INTO jobs (job_key, title, description, skills, market_demand, date_posted) "
+                "VALUES (:job_key, :title, :description, :skills, :market_demand, :date_posted) "
+                "ON CONFLICT(job_key) DO UPDATE SET "
+                "title = excluded.title, description = excluded.description, "
+                "skills = excluded.skills, market_demand = excluded.market_demand, "
+                "date_posted = excluded.date_posted "
+                "RETURNING id",
+                {"job_key": job_key(job), **values},
+            ).fetchone()[0]
+
+            conn.execute("DELETE FROM job_skills WHERE job_id = ?", (job_id,))
+            conn.executemany(
+                "INSERT INTO job_skills (skill, job_id) VALUES (?, ?)",
+                [(skill, job_id) for skill in skills],
+            )
+            count += 1
+
+        _bump_revision(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return count
+
+
+def import_csv(csv_path, path=None) -> int:
+    with span("csv_import"):
+        df = pd.read_csv(csv_path).fillna("")
+        return bulk_upsert(df.to_dict("records"), path)
+
+
+def refresh_job_dates(today: date = None, path=None) -> int:
+    """
+    Spread posting dates over the last 7 days (by insertion order) in a
+    single UPDATE transaction
+    """
+    today = today or date.today()
+    conn = connect(path)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        updated = conn.execute(
+            "UPDATE jobs SET date_posted = date(?, '-' || ((id - 1) % 7) || ' days')",
+            (today.isoformat(),),
+        ).rowcount
+        _bump_revision(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return updated
+
+
+# ---------------- READS ----------------
+def read_jobs(path=None):
+    """
+    (version, DataFrame of all jobs in insertion order) read from one
+    consistent snapshot
+    """
+    conn = connect(path)
+
+    with span("job_store_read"):
+        conn.execute("BEGIN")
+        try:
+            version = _read_version(conn)
+            df = pd.read_sql_query(
+                "SELECT id, job_key, title, description, skills, market_demand, date_posted "
+                "FROM jobs ORDER BY id",
+                conn,
+            )
+        finally:
+            conn.execute("COMMIT")
+
+    return version, df
+
+
+def recent_jobs_with_skill(skill: str, days: int = 7, limit: int = 100, path=None) -> list:
+    """
+    Jobs posted in the last `days` days that list `skill`
+    (skill index + date index lookup, no table scan)
+    """
+    # Same normalization as the stored skills (aliases, casing)
+    normalized = _split_skills([skill])
+    if not normalized:
+        return []
+
+    since = (date.today() - timedelta(days=days)).isoformat()
+    rows = connect(path).execute(
+        "SELECT j.id, j.title, j.skills, j.market_demand, j.date_posted "
+        "FROM job_skills s JOIN jobs j ON j.id = s.job_id "
+        "WHERE s.skill = ? AND j.date_posted >= ? "
+        "ORDER BY j.date_posted DESC, j.id LIMIT ?",
+        (normalized[0], since, limit),
+    ).fetchall()
+
+    return [
+        dict(zip(("id", "title", "skills", "market_demand", "date_posted"), row))
+        for row in rows
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    importer = sub.add_parser("import", help="upsert postings from a CSV file")
+    importer.add_argument("csv_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        count = import_csv(args.csv_path)
+        print(f"✅ Upserted {count} jobs (version {catalog_version()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,33 @@
 import pandas as pd
 from app.utils.preprocessing import clean_text
 
+# Seed data; the live catalog is the SQLite job store
 JOBS_FILE = "datasets/jobs.csv"
 
-def load_jobs():
+def load_jobs(source=None):
     """
-    Load jobs dataset and preprocess text
+    Load jobs dataset and preprocess text.
+    Reads the job store by default, or a CSV path / buffer if given.
     """
-    df = pd.read_csv(JOBS_FILE)
+    if source is None:
+        from app.database.job_store import read_jobs
+        _, df = read_jobs()
+    else:
+        df = pd.read_csv(source)
 
+    return preprocess_jobs(df)
+
+def preprocess_jobs(df):
     # Clean descriptions
-    df["clean_description"] = df["description"].apply(clean_text)
+    df["clean_description"] = df["description"].fillna("").apply(clean_text)
 
     # Convert skills column into list
-    df["skills"] = df["skills"].apply(
-        lambda x: [skill.strip().lower() for skill in x.split(",")]
+    df["skills"] = df["skills"].fillna("").apply(
+        lambda x: [
+            skill.strip().lower()
+            for skill in str(x).split(",")
+            if skill.strip()
+        ]
     )
 
     return df
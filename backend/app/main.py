@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api import resume_routes, job_routes, ats_routes
-from app.services.scheduler import start_scheduler
+from app.services.scheduler import start_scheduler_when_leader
+from app.services.resume_sessions import resume_sessions
+from app.services.job_catalog import get_catalog
+from app.ml_models.tfidf_model import sync_tfidf_index
 from app.api import career_routes
+from app.config import MODEL_WARMUP, MODEL_IDLE_TTL, PROFILER_ENABLED, PROFILER_INTERVAL_MS
+from app.ml_models.registry import registry
+from app.services.ai_rewriter import rewrite_batcher
+from app.services.executors import ExecutorSaturated, executor_stats, shutdown_executors
+from app.utils.content_cache import cache_stats
+from app.utils.response_cache import response_cache
+from app.utils.skill_matcher import get_skill_matcher
+from app.services.career_recommender import get_career_graph
+from app.utils import metrics
+from app.utils.instrumentation import InstrumentationMiddleware
 
 
 
@@ -12,7 +28,38 @@ app = FastAPI(title="AI Resume Analyzer & Job Matcher")
 # ---------------- START BACKGROUND SCHEDULER ----------------
 @app.on_event("startup")
 def startup_event():
-    start_scheduler()
+    # Compile the skills taxonomy and career graph and load the job
+    # catalog once so the first request doesn't pay for it
+    get_skill_matcher()
+    get_career_graph()
+    catalog = get_catalog()
+    if catalog is not None:
+        # Reloads the persisted TF-IDF index; only refits if jobs changed
+        sync_tfidf_index(catalog)
+
+    # Models load lazily on first use unless listed for warmup
+    registry.warmup(MODEL_WARMUP)
+    registry.start_reaper(MODEL_IDLE_TTL)
+
+    # Only one worker process runs the scheduled refreshes
+    start_scheduler_when_leader()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await rewrite_batcher.close()
+    shutdown_executors()
+
+
+# ---------------- BACKPRESSURE ----------------
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    # Shed load early instead of queueing without bound
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 
 # ---------------- ROUTES ----------------
@@ -31,8 +78,99 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so its latency covers CORS and every route
+app.add_middleware(
+    InstrumentationMiddleware,
+    profiler_enabled=PROFILER_ENABLED,
+    profiler_interval=PROFILER_INTERVAL_MS / 1000,
+)
+
 
 # ---------------- HEALTH CHECK ----------------
 @app.get("/")
-def home():
+async def home():
     return {"message": "API is running successfully"}
+
+
+@app.get("/models")
+async def model_status():
+    # Load state, load time and resident memory per model
+    return registry.stats()
+
+
+@app.get("/cache")
+async def cache_status():
+    # Hit / miss / eviction counters per content cache and for responses
+    return {**cache_stats(), "responses": response_cache.stats()}
+
+
+# ---------------- METRICS ----------------
+@metrics.collector
+def runtime_stats():
+    # The same numbers as /cache and /models, plus catalog and batching
+    caches = {**cache_stats(), "responses": response_cache.stats()}
+    models = registry.stats()
+    lanes = executor_stats()
+    catalog = get_catalog()
+
+    return [
+        ("cache_events_total", "counter", "Cache lookups and evictions by outcome", [
+            ({"cache": name, "event": event}, value)
+            for name, stats in caches.items()
+            for event, value in stats.items()
+            if event not in ("items", "disk_bytes")
+        ]),
+        ("cache_items", "gauge", "Entries held in memory", [
+            ({"cache": name}, stats["items"]) for name, stats in caches.items()
+        ]),
+        ("cache_disk_bytes", "gauge", "Payload bytes in the on-disk tier", [
+            ({"cache": name}, stats.get("disk_bytes")) for name, stats in caches.items()
+        ]),
+        ("model_loaded", "gauge", "1 while the model is in memory", [
+            ({"model": name}, int(stats["loaded"])) for name, stats in models.items()
+        ]),
+        ("model_loads_total", "counter", "Times the model was loaded", [
+            ({"model": name}, stats["loads"]) for name, stats in models.items()
+        ]),
+        ("model_load_seconds", "gauge", "Duration of the most recent load", [
+            ({"model": name}, stats["load_seconds"]) for name, stats in models.items()
+        ]),
+        ("model_rss_bytes", "gauge", "Resident memory added by the most recent load", [
+            ({"model": name}, stats["rss_bytes"]) for name, stats in models.items()
+        ]),
+        ("executor_workers", "gauge", "Concurrent calls each executor runs", [
+            ({"executor": name}, stats["workers"]) for name, stats in lanes.items()
+        ]),
+        ("executor_active", "gauge", "Calls running in each executor", [
+            ({"executor": name}, stats["active"]) for name, stats in lanes.items()
+        ]),
+        ("executor_waiting", "gauge", "Calls queued for a free executor slot", [
+            ({"executor": name}, stats["waiting"]) for name, stats in lanes.items()
+        ]),
+        ("executor_calls_total", "counter", "Executor calls by outcome (rejected = 503)", [
+            ({"executor": name, "outcome": outcome}, stats[outcome])
+            for name, stats in lanes.items()
+            for outcome in ("completed", "failed", "rejected", "timed_out")
+        ]),
+        ("batcher_batches_total", "counter", "Batched model calls", [
+            ({"batcher": rewrite_batcher.name}, rewrite_batcher.batches)
+        ]),
+        ("batcher_items_total", "counter", "Items run through batched calls", [
+            ({"batcher": rewrite_batcher.name}, rewrite_batcher.items)
+        ]),
+        ("catalog_jobs", "gauge", "Jobs in the current catalog snapshot", [
+            ({}, len(catalog) if catalog is not None else 0)
+        ]),
+        ("catalog_age_seconds", "gauge", "Seconds since the catalog snapshot was built", [
+            ({}, round(time.time() - catalog.loaded_at, 1) if catalog is not None else None)
+        ]),
+        ("resume_sessions", "gauge", "Open resume editing sessions in this process", [
+            ({}, resume_sessions.stats()["items"])
+        ]),
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
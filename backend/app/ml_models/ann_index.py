@@ -0,0 +1,575 @@
+"""
+Approximate nearest-neighbour search over the job embeddings (IVF-PQ),
+for catalogs too large to score every job per query.
+
+Every vector is assigned to the nearest of `nlist` coarse centroids (its
+inverted list) and the residual to that centroid is product-quantized:
+split into `m` sub-vectors, each stored as the one-byte id of its nearest
+sub-centroid. A 384-dim float32 vector (1536 bytes) becomes 48 bytes.
+A query only scans the `nprobe` lists whose centroids are closest, and
+scores a posting with one table lookup per sub-vector:
+
+    q . x  ~=  q . centroid[list]  +  sum_j  q_j . codebook_j[code_j]
+
+The best `rerank` candidates are then re-scored exactly against the
+full embedding matrix. nprobe trades latency for recall; rerank makes
+the returned scores exact cosines (0 keeps the approximate ones).
+
+Files under ANN_DIR, memory-mapped on load:
+
+    centroids.npy  codebooks.npy            trained quantizers
+    offsets.npy  codes.npy  keys.npy        main segment, grouped by list
+    delta_lists.npy  delta_codes.npy  ...   postings added since the last compaction
+    deleted.npy                             tombstones over main + delta
+    meta.json                               written last
+
+The daily refresh only appends to the delta and flips tombstones; the
+main segment is rewritten when the delta or the tombstones grow past
+COMPACT_RATIO, and the quantizers are retrained past RETRAIN_RATIO.
+
+    python -m app.ml_models.ann_index build
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from app.config import (
+    ANN_MIN_JOBS, ANN_NLIST, ANN_NPROBE, ANN_RERANK, ANN_SUBQUANTIZERS, CACHE_DIR,
+)
+from app.ml_models.embeddings import MODEL_KEY
+from app.ml_models.job_embeddings import build_job_matrix, get_job_keys, get_job_matrix, match_keys
+from app.utils.file_lock import file_lock
+
+ANN_DIR = Path(CACHE_DIR) / "ann" / MODEL_KEY
+
+FORMAT = 1
+
+# Sub-centroids per sub-quantizer: codes are one byte
+KSUB = 256
+
+# Vectors sampled to train the coarse centroids (per list) and the PQ
+# codebooks (~40 per sub-centroid)
+TRAIN_PER_LIST = 64
+PQ_TRAIN_SAMPLE = 10240
+KMEANS_ITERATIONS = 20
+
+# Merge the delta into the main segment once it, or the tombstones,
+# exceed this share of the main segment
+COMPACT_RATIO = 0.1
+# Retrain once postings added since training exceed this share of the
+# trained size (the centroids stop describing the data)
+RETRAIN_RATIO = 1.0
+
+# Rows per block when assigning vectors to centroids
+ASSIGN_CHUNK = 8192
+
+
+# ---------------- k-means ----------------
+def nearest(x, centroids, chunk: int = ASSIGN_CHUNK):
+    """
+    Index of, and squared L2 distance to, the nearest centroid per row
+    """
+    c_norms = (centroids ** 2).sum(axis=1)
+    labels = np.empty(len(x), dtype=np.int64)
+    distances = np.empty(len(x), dtype=np.float32)
+
+    for start in range(0, len(x), chunk):
+        block = np.asarray(x[start:start + chunk], dtype=np.float32)
+        d = c_norms - 2 * (block @ centroids.T)
+        best = d.argmin(axis=1)
+        labels[start:start + len(block)] = best
+        distances[start:start + len(block)] = d[np.arange(len(block)), best] + (block ** 2).sum(axis=1)
+    return labels, distances
+
+
+def kmeans(x, k: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0):
+    """
+    Lloyd's k-means over float32 rows. Empty clusters are re-seeded with
+    the points farthest from their centroid.
+    """
+    x = np.asarray(x, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    if len(x) <= k:
+        # Fewer points than clusters: every point is a centroid
+        return x[rng.integers(0, len(x), k)] if len(x) else np.zeros((k, x.shape[1]), dtype=np.float32)
+
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        labels, distances = nearest(x, centroids)
+        members = sparse.csr_matrix(
+            (np.ones(len(x), dtype=np.float32), (labels, np.arange(len(x)))), shape=(k, len(x))
+        )
+        counts = np.bincount(labels, minlength=k)
+        filled = counts > 0
+        centroids[filled] = (members @ x)[filled] / counts[filled, None]
+
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = x[np.argsort(-distances)[:len(empty)]]
+    return centroids
+
+
+def default_nlist(n: int) -> int:
+    return int(np.clip(2 ** round(np.log2(max(1.0, np.sqrt(n)))), 16, 65536))
+
+
+def default_subquantizers(dim: int) -> int:
+    # ~8 dimensions per byte; m must divide the vector size
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+# ---------------- Index ----------------
+class IVFPQIndex:
+    """
+    Inverted lists of product-quantized residuals, keyed by uint64 keys.
+    Entries are numbered main segment first, then delta; search returns
+    entry numbers and keys_of() maps them back.
+    """
+
+    def __init__(self, centroids, codebooks, offsets, codes, keys,
+                 delta_lists=None, delta_codes=None, delta_keys=None,
+                 deleted=None, trained_size: int = 0):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.codebooks = np.asarray(codebooks, dtype=np.float32)
+        self.nlist, self.dim = self.centroids.shape
+        self.m, _, self.dsub = self.codebooks.shape
+        self._centroid_norms = (self.centroids ** 2).sum(axis=1)
+
+        # Codes are stored (m, n): one row per sub-quantizer, so a list's
+        # codes for one sub-vector are contiguous and scan as one take()
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.codes = codes
+        self.keys = keys
+        self.delta_lists = np.asarray(delta_lists if delta_lists is not None else [], dtype=np.int64)
+        self.delta_codes = np.asarray(
+            delta_codes if delta_codes is not None else np.empty((self.m, 0)), dtype=np.uint8
+        )
+        self.delta_keys = np.asarray(delta_keys if delta_keys is not None else [], dtype=np.uint64)
+
+        n = len(self.keys) + len(self.delta_keys)
+        # Always an in-memory copy: tombstones change on every refresh
+        self.deleted = np.zeros(n, dtype=bool) if deleted is None else np.array(deleted, dtype=bool)
+        # Postings at training time; growth past it triggers a retrain
+        self.trained_size = trained_size
+        # Directory holding an up-to-date copy of the main segment
+        self.main_saved_in = None
+
+    def __len__(self):
+        return int(len(self.deleted) - self.deleted.sum())
+
+    @property
+    def n_entries(self) -> int:
+        return len(self.deleted)
+
+    @property
+    def n_main(self) -> int:
+        return len(self.keys)
+
+    def keys_of(self, entries) -> np.ndarray:
+        entries = np.asarray(entries, dtype=np.int64)
+        main = entries < self.n_main
+        keys = np.empty(len(entries), dtype=np.uint64)
+        keys[main] = self.keys[entries[main]]
+        keys[~main] = self.delta_keys[entries[~main] - self.n_main]
+        return keys
+
+    def all_keys(self) -> np.ndarray:
+        return np.concatenate([np.asarray(self.keys), self.delta_keys])
+
+    def live_keys(self) -> np.ndarray:
+        return self.all_keys()[~self.deleted]
+
+    # ---------------- Build ----------------
+    @classmethod
+    def train(cls, sample, nlist: int = 0, m: int = 0, seed: int = 0):
+        """
+        An empty index with quantizers trained on `sample` (normalized
+        float32 rows). Pass `nlist` when the sample is smaller than the
+        data it stands for.
+        """
+        sample = np.asarray(sample, dtype=np.float32)
+        dim = sample.shape[1]
+        nlist = nlist or default_nlist(len(sample))
+        m = m or default_subquantizers(dim)
+        if dim % m:
+            raise ValueError(f"{m} sub-quantizers do not divide vector size {dim}")
+
+        rng = np.random.default_rng(seed)
+        coarse = sample
+        if len(sample) > nlist * TRAIN_PER_LIST:
+            coarse = sample[rng.choice(len(sample), nlist * TRAIN_PER_LIST, replace=False)]
+        centroids = kmeans(coarse, nlist, seed=seed)
+
+        if len(sample) > PQ_TRAIN_SAMPLE:
+            sample = sample[rng.choice(len(sample), PQ_TRAIN_SAMPLE, replace=False)]
+        labels, _ = nearest(sample, centroids)
+        residuals = (sample - centroids[labels]).reshape(len(sample), m, dim // m)
+        codebooks = np.stack([kmeans(residuals[:, j], KSUB, seed=seed + j) for j in range(m)])
+
+        return cls(
+            centroids, codebooks,
+            offsets=np.zeros(nlist + 1, dtype=np.int64),
+            codes=np.empty((m, 0), dtype=np.uint8),
+            keys=np.empty(0, dtype=np.uint64),
+        )
+
+    def encode(self, vectors):
+        """
+        Lists (n,) and codes (m, n) of normalized float32 rows
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        lists, _ = nearest(vectors, self.centroids)
+        residuals = vectors - self.centroids[lists]
+        codes = np.empty((self.m, len(vectors)), dtype=np.uint8)
+        for j in range(self.m):
+            codes[j] = nearest(residuals[:, j * self.dsub:(j + 1) * self.dsub], self.codebooks[j])[0]
+        return lists, codes
+
+    def add(self, vectors, keys):
+        """
+        Insert postings into the delta segment (searchable right away).
+        `vectors` is read block by block, so a memory-mapped matrix is
+        never copied whole.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        if not len(keys):
+            return
+        encoded = [self.encode(vectors[start:start + ASSIGN_CHUNK]) for start in range(0, len(keys), ASSIGN_CHUNK)]
+        self.delta_lists = np.concatenate([self.delta_lists] + [lists for lists, _ in encoded])
+        self.delta_codes = np.concatenate([self.delta_codes] + [codes for _, codes in encoded], axis=1)
+        self.delta_keys = np.concatenate([self.delta_keys, keys])
+        self.deleted = np.concatenate([self.deleted, np.zeros(len(keys), dtype=bool)])
+
+    def delete(self, keys) -> int:
+        """
+        Tombstone every live entry with one of `keys`; returns how many
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        if not len(keys) or not self.n_entries:
+            return 0
+        hit = np.isin(self.all_keys(), keys) & ~self.deleted
+        self.deleted |= hit
+        return int(hit.sum())
+
+    def needs_compaction(self) -> bool:
+        main = max(1, self.n_main)
+        return (
+            len(self.delta_keys) > COMPACT_RATIO * main
+            or self.deleted.sum() > COMPACT_RATIO * main
+        )
+
+    def compact(self):
+        """
+        Rewrite the main segment with the delta merged in and tombstoned
+        entries dropped, grouped by list again
+        """
+        main_lists = np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+        lists = np.concatenate([main_lists, self.delta_lists])[~self.deleted]
+        codes = np.concatenate([np.asarray(self.codes), self.delta_codes], axis=1)[:, ~self.deleted]
+        keys = self.all_keys()[~self.deleted]
+
+        order = np.argsort(lists, kind="stable")
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=self.nlist))])
+        self.codes, self.keys = np.ascontiguousarray(codes[:, order]), keys[order]
+        self.delta_lists = np.empty(0, dtype=np.int64)
+        self.delta_codes = np.empty((self.m, 0), dtype=np.uint8)
+        self.delta_keys = np.empty(0, dtype=np.uint64)
+        self.deleted = np.zeros(len(self.keys), dtype=bool)
+        self.main_saved_in = None
+
+    # ---------------- Search ----------------
+    def search(self, query, k: int, nprobe: int = ANN_NPROBE, rerank: int = 0, exact=None):
+        """
+        Best `k` (entries, scores) for a normalized query vector, highest
+        first. With `rerank` and `exact` (entries -> their full vectors),
+        the best max(k, rerank) approximate candidates are re-scored
+        exactly before the cut to k.
+        """
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        coarse = self.centroids @ q
+        # Lists are probed by L2 distance, as postings were assigned; by
+        # inner product alone, lists with short (mixed) centroids are missed
+        nprobe = max(1, min(nprobe, self.nlist))
+        probe = np.argpartition(self._centroid_norms - 2 * coarse, nprobe - 1)[:nprobe]
+
+        # Inner product of each query sub-vector with every sub-centroid
+        table = np.einsum("jkd,jd->jk", self.codebooks, q.reshape(self.m, self.dsub))
+
+        # Probed lists are contiguous slices of the main segment
+        starts, ends = self.offsets[probe], self.offsets[probe + 1]
+        sizes = ends - starts
+        entries = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        lists = np.repeat(probe, sizes)
+        blocks = [self.codes[:, start:end] for start, end in zip(starts, ends) if end > start]
+
+        in_delta = np.flatnonzero(np.isin(self.delta_lists, probe))
+        if len(in_delta):
+            entries = np.concatenate([entries, in_delta + self.n_main])
+            lists = np.concatenate([lists, self.delta_lists[in_delta]])
+            blocks.append(self.delta_codes[:, in_delta])
+
+        if not len(entries):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        codes = np.concatenate(blocks, axis=1)
+        scores = coarse[lists]
+        for j in range(self.m):
+            scores += np.take(table[j], codes[j])
+
+        live = ~self.deleted[entries]
+        entries, scores = entries[live], scores[live]
+        if not len(entries):
+            return entries, scores
+
+        keep = max(k, rerank) if (rerank and exact is not None) else k
+        if len(entries) > keep:
+            best = np.argpartition(-scores, keep - 1)[:keep]
+            entries, scores = entries[best], scores[best]
+
+        if rerank and exact is not None:
+            scores = np.asarray(exact(entries), dtype=np.float32) @ q
+            if len(entries) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+                entries, scores = entries[best], scores[best]
+
+        order = np.argsort(-scores, kind="stable")
+        return entries[order], scores[order]
+
+    # ---------------- Persistence ----------------
+    def save(self, directory=ANN_DIR):
+        """
+        Write the index. The main segment is only rewritten after a
+        compaction; a refresh writes the delta and the tombstones.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        def atomic(name, array):
+            tmp = directory / f".{name}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, directory / name)
+
+        if self.main_saved_in != directory:
+            atomic("centroids.npy", self.centroids)
+            atomic("codebooks.npy", self.codebooks)
+            atomic("offsets.npy", self.offsets)
+            atomic("codes.npy", np.asarray(self.codes))
+            atomic("keys.npy", np.asarray(self.keys))
+        atomic("delta_lists.npy", self.delta_lists)
+        atomic("delta_codes.npy", self.delta_codes)
+        atomic("delta_keys.npy", self.delta_keys)
+        atomic("deleted.npy", self.deleted)
+
+        # Written last: a complete meta.json marks a consistent index
+        tmp = directory / ".meta.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "format": FORMAT,
+                "nlist": self.nlist,
+                "m": self.m,
+                "dim": self.dim,
+                "n_main": self.n_main,
+                "n_delta": len(self.delta_keys),
+                "trained_size": self.trained_size,
+            }, f)
+        os.replace(tmp, directory / "meta.json")
+        self.main_saved_in = directory
+
+    @classmethod
+    def load(cls, directory=ANN_DIR, mmap: bool = True):
+        directory = Path(directory)
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+        if meta.get("format") != FORMAT:
+            raise ValueError("ANN index format changed")
+
+        mode = "r" if mmap else None
+        index = cls(
+            np.load(directory / "centroids.npy"),
+            np.load(directory / "codebooks.npy"),
+            np.load(directory / "offsets.npy"),
+            np.load(directory / "codes.npy", mmap_mode=mode),
+            np.load(directory / "keys.npy", mmap_mode=mode),
+            np.load(directory / "delta_lists.npy"),
+            np.load(directory / "delta_codes.npy"),
+            np.load(directory / "delta_keys.npy"),
+            np.load(directory / "deleted.npy"),
+            meta["trained_size"],
+        )
+
+        consistent = (
+            index.codes.shape == (index.m, index.n_main) and index.n_main == meta["n_main"] == index.offsets[-1]
+            and index.delta_codes.shape == (index.m, len(index.delta_keys))
+            and len(index.delta_keys) == meta["n_delta"] == len(index.delta_lists)
+            and index.n_entries == meta["n_main"] + meta["n_delta"]
+            and (index.nlist, index.m, index.dim) == (meta["nlist"], meta["m"], meta["dim"])
+        )
+        if not consistent:
+            raise ValueError("ANN index files are inconsistent")
+        index.main_saved_in = directory
+        return index
+
+
+# ---------------- Job catalog ----------------
+class JobANN:
+    """
+    The index as seen by one catalog version: entries mapped to job ids,
+    with the catalog's embedding matrix for exact re-scoring
+    """
+
+    def __init__(self, index: IVFPQIndex, positions, matrix):
+        self.index = index
+        self.positions = positions
+        self.matrix = matrix
+
+    def _vectors(self, entries):
+        return self.matrix[self.positions[entries]]
+
+    def search(self, query, k: int, nprobe: int = ANN_NPROBE, rerank: int = ANN_RERANK):
+        """
+        (job_ids, cosine scores) of the best `k` jobs for a normalized
+        query vector
+        """
+        entries, scores = self.index.search(query, k, nprobe=nprobe, rerank=rerank, exact=self._vectors)
+        return self.positions[entries], scores
+
+
+_ann = None
+_ann_version = None
+_sync_lock = threading.Lock()
+_building = set()
+_lock = threading.Lock()
+
+
+def sync_ann_index(catalog, matrix=None, directory=ANN_DIR, nlist: int = ANN_NLIST, m: int = ANN_SUBQUANTIZERS):
+    """
+    Bring the persisted index in line with the catalog: train it on
+    first use or after heavy growth, otherwise insert the new postings
+    and tombstone the removed ones. Worker processes share the
+    directory; the file lock lets one of them update it and the rest
+    load the result.
+    """
+    global _ann, _ann_version
+
+    with _sync_lock:
+        if _ann_version == catalog.version:
+            return _ann
+
+        if matrix is None:
+            matrix = build_job_matrix(catalog)
+        keys = get_job_keys(catalog)
+
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        with file_lock(Path(directory) / ".lock"):
+            index = _sync_locked(matrix, keys, directory, nlist, m)
+
+        # Entry -> job id; every live entry has a key in this catalog
+        positions = match_keys(keys, index.all_keys())
+        _ann, _ann_version = JobANN(index, positions, matrix), catalog.version
+        return _ann
+
+
+def _sync_locked(matrix, keys, directory, nlist, m):
+    start = time.perf_counter()
+    try:
+        index = IVFPQIndex.load(directory)
+    except (OSError, ValueError, KeyError):
+        index = None
+
+    if index is not None and index.dim != matrix.shape[1]:
+        index = None
+
+    if index is not None:
+        live = index.live_keys()
+        added = np.flatnonzero(~np.isin(keys, live))
+        # Duplicate texts share one entry
+        added = added[np.unique(keys[added], return_index=True)[1]]
+        removed = live[~np.isin(live, keys)]
+        if not len(added) and not len(removed):
+            return index
+
+        if len(index) + len(added) - index.trained_size <= RETRAIN_RATIO * index.trained_size:
+            deleted = index.delete(removed)
+            added = np.sort(added)
+            index.add(matrix[added], keys[added])
+            if index.needs_compaction():
+                index.compact()
+            index.save(directory)
+            print(f"🧭 ANN index: +{len(added)} / -{deleted} jobs ({time.perf_counter() - start:.1f}s)")
+            return index
+
+    unique = np.sort(np.unique(keys, return_index=True)[1])
+    nlist = nlist or default_nlist(len(unique))
+    rng = np.random.default_rng(0)
+    n_train = min(len(unique), max(nlist * TRAIN_PER_LIST, PQ_TRAIN_SAMPLE))
+    sample = matrix[np.sort(rng.choice(unique, n_train, replace=False))]
+
+    index = IVFPQIndex.train(sample, nlist=nlist, m=m)
+    index.add(matrix if len(unique) == len(keys) else matrix[unique], keys[unique])
+    index.trained_size = len(unique)
+    index.compact()
+    index.save(directory)
+    print(f"🧭 ANN index trained on {len(unique)} jobs, {index.nlist} lists x {index.m} bytes "
+          f"({time.perf_counter() - start:.1f}s)")
+    return index
+
+
+def _sync_in_background(catalog, matrix):
+    def target():
+        try:
+            sync_ann_index(catalog, matrix)
+        except Exception as exc:
+            print("⚠️ ANN index build failed:", exc)
+        finally:
+            with _lock:
+                _building.discard(catalog.version)
+
+    threading.Thread(target=target, name="ann-index", daemon=True).start()
+
+
+def get_ann_index(catalog):
+    """
+    The JobANN for this catalog, or None when the catalog is small enough
+    for exact search or the index is still being synced (in the
+    background; callers fall back to exact search meanwhile)
+    """
+    if len(catalog) < ANN_MIN_JOBS:
+        return None
+    if _ann_version == catalog.version:
+        return _ann
+
+    matrix = get_job_matrix(catalog)
+    if matrix is None:
+        return None
+
+    with _lock:
+        if catalog.version in _building:
+            return None
+        _building.add(catalog.version)
+
+    _sync_in_background(catalog, matrix)
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--nlist", type=int, default=ANN_NLIST, help="inverted lists (0 = sqrt of the catalog size)")
+    parser.add_argument("--m", type=int, default=ANN_SUBQUANTIZERS, help="bytes per vector (0 = dim / 8)")
+    args = parser.parse_args()
+
+    from app.services.job_catalog import get_catalog
+
+    catalog = get_catalog()
+    ann = sync_ann_index(catalog, build_job_matrix(catalog), nlist=args.nlist, m=args.m)
+    print(f"✅ {len(ann.index)} jobs indexed in {ANN_DIR}")
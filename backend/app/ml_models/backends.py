@@ -0,0 +1,193 @@
+"""
+CPU inference backends for the Hugging Face models:
+
+    torch        fp32 PyTorch, as the models ship
+    torch-int8   PyTorch with every nn.Linear dynamically quantized to
+                 int8 at load (weights int8, activations quantized on the fly)
+    onnx         ONNX Runtime over the exported fp32 graph
+    onnx-int8    ONNX Runtime over the exported graph with int8 weights
+
+ONNX backends need the artifacts written by
+`python -m app.ml_models.export_models` under MODEL_DIR; torch backends
+use the local copy written there too when it exists, else the hub.
+
+    MODEL_DIR/<model id>/hf         tokenizer + fp32 weights
+    MODEL_DIR/<model id>/onnx       exported graph(s)
+    MODEL_DIR/<model id>/onnx-int8  the same graph(s), int8 weights
+"""
+from pathlib import Path
+
+import numpy as np
+
+from app.config import INFERENCE_INTEROP_THREADS, INFERENCE_INTRA_THREADS, MODEL_DIR
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+ONNX_INSTALL_HINT = 'ONNX backends need optimum with ONNX Runtime: pip install "optimum[onnxruntime]"'
+
+
+def check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+
+def model_path(model_id: str, kind: str, root=MODEL_DIR) -> Path:
+    return Path(root) / model_id.replace("/", "--") / kind
+
+
+def _has_files(directory: Path) -> bool:
+    return directory.is_dir() and any(directory.iterdir())
+
+
+def local_or_hub(model_id: str) -> str:
+    local = model_path(model_id, "hf")
+    return str(local) if _has_files(local) else model_id
+
+
+def onnx_dir(model_id: str, backend: str) -> Path:
+    directory = model_path(model_id, backend)
+    if not _has_files(directory):
+        raise RuntimeError(
+            f"No {backend} artifacts for {model_id} in {directory}; "
+            "run `python -m app.ml_models.export_models` first"
+        )
+    return directory
+
+
+# ---------------- Threads ----------------
+_interop_set = False
+
+
+def configure_torch_threads():
+    """
+    Apply INFERENCE_INTRA_THREADS / INFERENCE_INTEROP_THREADS to torch.
+    Inter-op threads can only be set before torch runs parallel work, so
+    that part is attempted once.
+    """
+    global _interop_set
+    import torch
+
+    if INFERENCE_INTRA_THREADS > 0:
+        torch.set_num_threads(INFERENCE_INTRA_THREADS)
+    if not _interop_set and INFERENCE_INTEROP_THREADS > 0:
+        _interop_set = True
+        try:
+            torch.set_num_interop_threads(INFERENCE_INTEROP_THREADS)
+        except RuntimeError:
+            pass
+
+
+def ort_session_options():
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    if INFERENCE_INTRA_THREADS > 0:
+        options.intra_op_num_threads = INFERENCE_INTRA_THREADS
+    if INFERENCE_INTEROP_THREADS > 0:
+        options.inter_op_num_threads = INFERENCE_INTEROP_THREADS
+    return options
+
+
+def quantize_dynamic_int8(model):
+    """
+    Swap every nn.Linear for its dynamically quantized int8 version
+    (in place; the model keeps its class and methods)
+    """
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    model.eval()
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+# ---------------- Text generation ----------------
+def load_text2text(model_id: str, backend: str, **pipeline_kwargs):
+    """
+    A transformers text2text-generation pipeline over the chosen backend
+    """
+    check_backend(backend)
+    from transformers import AutoTokenizer, pipeline
+
+    if backend.startswith("onnx"):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as exc:
+            raise RuntimeError(ONNX_INSTALL_HINT) from exc
+
+        directory = onnx_dir(model_id, backend)
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            directory, session_options=ort_session_options(), provider="CPUExecutionProvider"
+        )
+        tokenizer = AutoTokenizer.from_pretrained(directory)
+        return pipeline("text2text-generation", model=model, tokenizer=tokenizer, **pipeline_kwargs)
+
+    from transformers import AutoModelForSeq2SeqLM
+
+    configure_torch_threads()
+    source = local_or_hub(model_id)
+    model = AutoModelForSeq2SeqLM.from_pretrained(source)
+    if backend == "torch-int8":
+        model = quantize_dynamic_int8(model)
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    return pipeline("text2text-generation", model=model, tokenizer=tokenizer, device=-1, **pipeline_kwargs)
+
+
+# ---------------- Sentence embeddings ----------------
+class OnnxSentenceEncoder:
+    """
+    Sentence-transformers style encoder over an exported ONNX graph:
+    tokenize, run, mean-pool over the attention mask and L2-normalize,
+    which is what the MiniLM sentence-transformers pipeline does
+    """
+
+    def __init__(self, directory: Path, max_length: int = 256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            directory, session_options=ort_session_options(), provider="CPUExecutionProvider"
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.max_length = max_length
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False):
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                list(texts[start:start + batch_size]),
+                padding=True, truncation=True, max_length=self.max_length, return_tensors="np",
+            )
+            hidden = self.model(**batch).last_hidden_state
+            hidden = np.asarray(hidden, dtype=np.float32)
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            vectors.append(pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None))
+
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate(vectors)
+
+
+def load_sentence_encoder(model_id: str, backend: str):
+    """
+    An object with sentence-transformers' encode(texts, ...) over the
+    chosen backend
+    """
+    check_backend(backend)
+
+    if backend.startswith("onnx"):
+        try:
+            import optimum.onnxruntime  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError(ONNX_INSTALL_HINT) from exc
+        return OnnxSentenceEncoder(onnx_dir(model_id, backend))
+
+    from sentence_transformers import SentenceTransformer
+
+    configure_torch_threads()
+    model = SentenceTransformer(local_or_hub(model_id), device="cpu")
+    if backend == "torch-int8":
+        model = quantize_dynamic_int8(model)
+    return model
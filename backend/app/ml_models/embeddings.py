@@ -1,7 +1,47 @@
-from sentence_transformers import SentenceTransformer
+import numpy as np
+
+from app.config import EMBEDDINGS_BACKEND
+from app.ml_models.backends import load_sentence_encoder
+from app.ml_models.registry import registry
+from app.utils.content_cache import ContentCache, content_key
+from app.utils.metrics import inference
 
 # Lightweight & fast model
-model = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "all-MiniLM-L6-v2"
+HUB_ID = f"sentence-transformers/{MODEL_NAME}"
+
+# Vectors differ slightly between backends; never mix them in a cache
+MODEL_KEY = f"{MODEL_NAME}-{EMBEDDINGS_BACKEND}"
+
+def _load_model():
+    return load_sentence_encoder(HUB_ID, EMBEDDINGS_BACKEND)
+
+# Loaded on first use, not at import
+registry.register("embeddings", _load_model, backend=EMBEDDINGS_BACKEND)
+
+embedding_cache = ContentCache("embeddings")
+
+def encode_texts(texts, use_cache: bool = True):
+    """
+    Encode texts, reusing cached vectors for texts seen before.
+    Bulk jobs (e.g. the job embedding matrix) pass use_cache=False
+    so they don't flush the cache.
+    """
+    if not use_cache:
+        model = registry.get("embeddings")
+        with inference("embeddings", len(texts)):
+            return model.encode(texts, show_progress_bar=False)
+
+    keys = [content_key(text, MODEL_KEY) for text in texts]
+    vectors = [embedding_cache.get(key) for key in keys]
+
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        model = registry.get("embeddings")
+        with inference("embeddings", len(missing)):
+            encoded = model.encode([texts[i] for i in missing], show_progress_bar=False)
+        for i, vector in zip(missing, encoded):
+            vectors[i] = vector
+            embedding_cache.set(keys[i], vector)
 
-def encode_texts(texts):
-    return model.encode(texts, show_progress_bar=False)
+    return np.stack(vectors)
@@ -0,0 +1,114 @@
+"""
+Download, export and quantize the models for offline CPU serving
+(see app.ml_models.backends for the layout under MODEL_DIR).
+
+    python -m app.ml_models.export_models                      # both models, every artifact
+    python -m app.ml_models.export_models --models embeddings --no-quantize
+    python -m app.ml_models.export_models --quant-config avx512_vnni
+
+Needs torch, transformers, sentence-transformers and
+optimum[onnxruntime]; the server itself only needs what its configured
+backends use.
+"""
+import argparse
+import shutil
+import time
+
+from app.config import MODEL_DIR
+from app.ml_models.backends import ONNX_INSTALL_HINT, model_path
+from app.ml_models.embeddings import HUB_ID as EMBEDDINGS_ID
+from app.services.ai_rewriter import MODEL_NAME as REWRITER_ID
+
+MODELS = {
+    "rewriter": REWRITER_ID,
+    "embeddings": EMBEDDINGS_ID,
+}
+
+QUANT_CONFIGS = ("avx2", "avx512", "avx512_vnni", "arm64")
+
+
+def save_local_copy(name: str, model_id: str, root):
+    target = model_path(model_id, "hf", root)
+    if name == "embeddings":
+        from sentence_transformers import SentenceTransformer
+        SentenceTransformer(model_id, device="cpu").save(str(target))
+    else:
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        AutoModelForSeq2SeqLM.from_pretrained(model_id).save_pretrained(target)
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(target)
+    return target
+
+
+def export_onnx(name: str, model_id: str, source: str, root):
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer
+
+    target = model_path(model_id, "onnx", root)
+    model_class = ORTModelForFeatureExtraction if name == "embeddings" else ORTModelForSeq2SeqLM
+    model_class.from_pretrained(source, export=True).save_pretrained(target)
+    AutoTokenizer.from_pretrained(source).save_pretrained(target)
+    return target
+
+
+def quantize_onnx(model_id: str, source_dir, root, quant_config: str):
+    """
+    Dynamic int8 quantization of every graph in the exported directory
+    (a seq2seq export has separate encoder / decoder graphs). File names
+    are kept, so the int8 directory loads exactly like the fp32 one.
+    """
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    target = model_path(model_id, "onnx-int8", root)
+    target.mkdir(parents=True, exist_ok=True)
+    config = getattr(AutoQuantizationConfig, quant_config)(is_static=False, per_channel=False)
+
+    for path in sorted(source_dir.iterdir()):
+        if path.suffix == ".onnx":
+            quantizer = ORTQuantizer.from_pretrained(source_dir, file_name=path.name)
+            quantizer.quantize(save_dir=target, quantization_config=config, file_suffix="")
+        elif path.is_file() and not (target / path.name).exists():
+            # config, generation config, tokenizer files
+            shutil.copy2(path, target / path.name)
+    return target
+
+
+def run(names, root, quantize: bool, quant_config: str):
+    try:
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit(ONNX_INSTALL_HINT) from exc
+
+    for name in names:
+        model_id = MODELS[name]
+        print(f"📦 {name}: {model_id}")
+
+        start = time.perf_counter()
+        local = save_local_copy(name, model_id, root)
+        print(f"   fp32 weights   -> {local} ({time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        exported = export_onnx(name, model_id, str(local), root)
+        print(f"   ONNX graph     -> {exported} ({time.perf_counter() - start:.1f}s)")
+
+        if quantize:
+            start = time.perf_counter()
+            quantized = quantize_onnx(model_id, exported, root, quant_config)
+            print(f"   ONNX int8      -> {quantized} ({time.perf_counter() - start:.1f}s)")
+
+    print("✅ Done. Select backends with REWRITER_BACKEND / EMBEDDINGS_BACKEND "
+          "(torch, torch-int8, onnx, onnx-int8)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="skip the onnx-int8 artifacts")
+    parser.add_argument(
+        "--quant-config", choices=QUANT_CONFIGS, default="avx2",
+        help="instruction set the int8 kernels target (avx2 runs on any recent x86)",
+    )
+    args = parser.parse_args()
+
+    run(args.models, args.model_dir, not args.no_quantize, args.quant_config)
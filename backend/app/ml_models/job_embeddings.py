@@ -0,0 +1,197 @@
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.config import CACHE_DIR
+from app.ml_models.embeddings import MODEL_KEY, encode_texts
+from app.ml_models.similarity import normalize_rows
+from app.ml_models.tfidf_model import doc_keys
+from app.utils.file_lock import file_lock
+
+# One .npy per (catalog version, model); reused across restarts
+EMBEDDINGS_DIR = Path(CACHE_DIR) / "embeddings"
+
+# Matrices kept on disk per model: the current one and the previous one
+# (the next build copies unchanged rows from it)
+KEEP_MATRICES = 2
+
+_matrices = {}
+_building = set()
+_lock = threading.Lock()
+
+
+def job_text(title: str, description: str) -> str:
+    """
+    The text a posting is embedded (and keyed) by
+    """
+    return f"{title}. {description}"
+
+
+def job_keys(catalog) -> np.ndarray:
+    """
+    Content key of every job's embedded text, in job id order
+    """
+    titles, descriptions = catalog.column("title"), catalog.column("description")
+    return doc_keys([job_text(t, d) for t, d in zip(titles, descriptions)])
+
+
+def _matrix_path(version: str) -> Path:
+    return EMBEDDINGS_DIR / f"jobs-{version}-{MODEL_KEY}.npy"
+
+
+def _keys_path(matrix_path: Path) -> Path:
+    return matrix_path.with_suffix(".keys.npy")
+
+
+def match_keys(keys, lookup) -> np.ndarray:
+    """
+    Position of each of `lookup` in `keys`, -1 where absent
+    """
+    keys, lookup = np.asarray(keys), np.asarray(lookup)
+    if not len(keys):
+        return np.full(len(lookup), -1, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    found = order[np.minimum(np.searchsorted(keys, lookup, sorter=order), len(keys) - 1)]
+    return np.where(keys[found] == lookup, found, -1)
+
+
+def _matrix_files():
+    return EMBEDDINGS_DIR.glob(f"jobs-*-{MODEL_KEY}.npy")
+
+
+def _previous_matrix(path: Path):
+    """
+    The newest other matrix of this model with its keys, or None
+    """
+    others = [p for p in _matrix_files() if p != path and _keys_path(p).exists()]
+    if not others:
+        return None
+    latest = max(others, key=lambda p: p.stat().st_mtime)
+    try:
+        return np.load(_keys_path(latest)), np.load(latest, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def _encode_catalog(catalog, keys, path: Path):
+    """
+    Rows of postings already embedded for the previous catalog version
+    are copied over (a daily refresh mostly changes dates, not texts);
+    only new texts go through the model
+    """
+    found = np.full(len(keys), -1)
+    previous = _previous_matrix(path)
+    if previous is not None:
+        old_keys, old_matrix = previous
+        found = match_keys(old_keys, keys)
+
+    hit = found >= 0
+    missing = np.flatnonzero(~hit)
+    vectors = None
+    if len(missing):
+        titles, descriptions = catalog.column("title"), catalog.column("description")
+        vectors = normalize_rows(encode_texts(
+            [job_text(titles[i], descriptions[i]) for i in missing.tolist()],
+            use_cache=False
+        ))
+
+    if not hit.any():
+        matrix = vectors if vectors is not None else np.empty((0, 0), dtype=np.float32)
+    else:
+        matrix = np.empty((len(keys), old_matrix.shape[1]), dtype=np.float32)
+        matrix[hit] = old_matrix[found[hit]]
+        if vectors is not None:
+            matrix[missing] = vectors
+
+    print(f"🧬 Job embeddings v{catalog.version}: {len(missing)} encoded, {len(keys) - len(missing)} reused")
+    return matrix
+
+
+def _prune_matrices(keep: Path):
+    matrices = sorted(_matrix_files(), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in [p for p in matrices if p != keep][KEEP_MATRICES - 1:]:
+        for p in (old, _keys_path(old), old.with_suffix(".lock")):
+            p.unlink(missing_ok=True)
+
+
+def build_job_matrix(catalog):
+    """
+    Encode every job once for this catalog version and persist the
+    normalized float32 matrix (and the job keys it was built from),
+    then map it back read-only
+    """
+    path = _matrix_path(catalog.version)
+    if not path.exists():
+        # Worker processes share the file: one encodes, the others wait
+        # for it and map the same pages
+        EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
+        with file_lock(path.with_suffix(".lock")):
+            if not path.exists():
+                keys = job_keys(catalog)
+                matrix = _encode_catalog(catalog, keys, path)
+
+                # Keys first: a matrix on disk always has its keys
+                tmp_path = path.with_suffix(".tmp.npy")
+                np.save(tmp_path, keys)
+                os.replace(tmp_path, _keys_path(path))
+                np.save(tmp_path, matrix)
+                os.replace(tmp_path, path)
+                _prune_matrices(keep=path)
+
+    matrix = np.load(path, mmap_mode="r")
+
+    with _lock:
+        # Older catalog versions are never queried again
+        _matrices.clear()
+        _matrices[catalog.version] = matrix
+        _building.discard(catalog.version)
+
+    return matrix
+
+
+def get_job_keys(catalog) -> np.ndarray:
+    """
+    Keys the catalog's matrix was built from (saved with it), so callers
+    can match its rows to other indexes without re-hashing the catalog
+    """
+    path = _keys_path(_matrix_path(catalog.version))
+    try:
+        return np.load(path)
+    except OSError:
+        return job_keys(catalog)
+
+
+def _build_in_background(catalog):
+    def target():
+        try:
+            build_job_matrix(catalog)
+        except Exception as exc:
+            print("⚠️ Job embedding build failed:", exc)
+            with _lock:
+                _building.discard(catalog.version)
+
+    threading.Thread(target=target, name="job-embeddings", daemon=True).start()
+
+
+def get_job_matrix(catalog, wait: bool = False):
+    """
+    Return the (n_jobs, dim) normalized embedding matrix for the catalog.
+    If it has not been computed yet it is built in the background and
+    None is returned, unless `wait` is set.
+    """
+    matrix = _matrices.get(catalog.version)
+    if matrix is not None:
+        return matrix
+
+    if wait or _matrix_path(catalog.version).exists():
+        return build_job_matrix(catalog)
+
+    with _lock:
+        if catalog.version in _building:
+            return None
+        _building.add(catalog.version)
+
+    _build_in_background(catalog)
+    return None
@@ -0,0 +1,127 @@
+import gc
+import os
+import threading
+import time
+
+
+def _rss_bytes() -> int:
+    """
+    Current resident set size of this process
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        # Peak RSS (KB on Linux) is the best portable fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of heavy models.
+    Models are registered with a loader and only built on first use;
+    one instance is shared by all threads and can be dropped when idle.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        # Loads are serialized so RSS deltas can be attributed to one model
+        self._load_lock = threading.Lock()
+        self._reaper = None
+
+    def register(self, name: str, loader, **info):
+        """
+        `info` (e.g. backend=...) is reported with the model's stats
+        """
+        self._loaders[name] = loader
+        self._stats.setdefault(name, {
+            **info,
+            "loaded": False,
+            "loads": 0,
+            "load_seconds": None,
+            "rss_bytes": None,
+            "last_used": None,
+        })
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is None:
+            model = self._load(name)
+
+        self._stats[name]["last_used"] = time.time()
+        return model
+
+    def _load(self, name: str):
+        loader = self._loaders[name]
+
+        with self._load_lock:
+            # Another thread may have finished loading while we waited
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - start
+
+            self._models[name] = model
+            self._stats[name].update({
+                "loaded": True,
+                "loads": self._stats[name]["loads"] + 1,
+                "load_seconds": round(elapsed, 3),
+                "rss_bytes": max(0, _rss_bytes() - rss_before),
+            })
+
+        print(f"🧠 Model '{name}' loaded in {elapsed:.1f}s")
+        return model
+
+    def warmup(self, names):
+        for name in names:
+            self.get(name)
+
+    def unload(self, name: str):
+        with self._load_lock:
+            if self._models.pop(name, None) is None:
+                return False
+            self._stats[name]["loaded"] = False
+
+        gc.collect()
+        print(f"💤 Model '{name}' unloaded")
+        return True
+
+    def unload_idle(self, ttl: float):
+        now = time.time()
+        for name in list(self._models):
+            last_used = self._stats[name]["last_used"] or 0
+            if now - last_used >= ttl:
+                self.unload(name)
+
+    def start_reaper(self, ttl: float):
+        """
+        Background thread unloading models idle for more than `ttl` seconds
+        """
+        if ttl <= 0 or self._reaper is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(max(1.0, ttl / 4))
+                self.unload_idle(ttl)
+
+        self._reaper = threading.Thread(target=loop, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self):
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+registry = ModelRegistry()
@@ -1,3 +1,4 @@
+import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
 def calculate_similarity(resume_vector, job_vectors):
@@ -6,3 +7,20 @@ def calculate_similarity(resume_vector, job_vectors):
     """
     scores = cosine_similarity(resume_vector, job_vectors)
     return scores.flatten()
+
+def normalize_rows(vectors):
+    """
+    L2-normalize each row as float32 so cosine becomes a plain dot product
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def cosine_scores(query_vector, normalized_matrix):
+    """
+    Cosine similarity of one query against a pre-normalized matrix
+    using a single matrix-vector product
+    """
+    query = normalize_rows(query_vector)[0]
+    return normalized_matrix @ query
@@ -1,9 +1,23 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+from app.config import CACHE_DIR
+from app.utils.file_lock import file_lock
+
+STOP_WORDS = "english"
+MAX_FEATURES = 5000
+
 # Create a global vectorizer so vocabulary is shared
 vectorizer = TfidfVectorizer(
-    stop_words="english",
-    max_features=5000
+    stop_words=STOP_WORDS,
+    max_features=MAX_FEATURES
 )
 
 def fit_transform(texts):
@@ -17,3 +31,200 @@ def transform(texts):
     Transform new text using existing TF-IDF model
     """
     return vectorizer.transform(texts)
+
+
+# ==========================================================
+# PERSISTED JOB INDEX
+# ==========================================================
+
+INDEX_DIR = Path(CACHE_DIR) / "tfidf"
+
+# Refit once appended postings outnumber this share of the fitted corpus
+# (their terms only count if already in the vocabulary, and IDF drifts)
+REFIT_RATIO = 0.5
+
+
+def doc_keys(texts) -> np.ndarray:
+    """
+    Stable 64-bit content key per document, used to detect which
+    postings are already indexed
+    """
+    return np.array(
+        [
+            int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little")
+            for t in texts
+        ],
+        dtype=np.uint64,
+    )
+
+
+class TfidfJobIndex:
+    """
+    TF-IDF vectors of job descriptions as a row-normalized CSR matrix.
+    The vocabulary and IDF weights are frozen at fit time so the index
+    can be reloaded and extended without refitting.
+    """
+
+    def __init__(self, vocabulary: dict, idf, matrix, keys, fitted_docs: int):
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+        self.keys = np.asarray(keys, dtype=np.uint64)
+        self.fitted_docs = fitted_docs
+
+        self._vectorizer = TfidfVectorizer(
+            stop_words=STOP_WORDS,
+            vocabulary=vocabulary
+        )
+        self._vectorizer.idf_ = self.idf
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @classmethod
+    def fit(cls, texts):
+        texts = list(texts)
+        fitted = TfidfVectorizer(stop_words=STOP_WORDS, max_features=MAX_FEATURES)
+        matrix = fitted.fit_transform(texts)
+        vocabulary = {term: int(i) for term, i in fitted.vocabulary_.items()}
+        return cls(vocabulary, fitted.idf_, matrix, doc_keys(texts), len(texts))
+
+    def transform(self, texts):
+        return self._vectorizer.transform(texts).astype(np.float32)
+
+    def append(self, texts):
+        """
+        Add postings using the frozen vocabulary/IDF (no refit)
+        """
+        texts = list(texts)
+        if not texts:
+            return
+        self.matrix = sparse.vstack([self.matrix, self.transform(texts)], format="csr")
+        self.keys = np.concatenate([self.keys, doc_keys(texts)])
+
+    def query(self, text: str):
+        """
+        Sparse query: (job_ids, cosine scores) for every job sharing at
+        least one vocabulary term with `text`, in ascending job id order
+        """
+        q = self.transform([text])
+        if q.nnz == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        hits = (self.matrix @ q.T).tocsc()
+        hits.sort_indices()
+        return hits.indices, hits.data
+
+    def top_k(self, text: str, k: int = 20):
+        """
+        Best `k` (job_ids, scores) for `text`, highest score first
+        """
+        job_ids, scores = self.query(text)
+        if len(job_ids) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            job_ids, scores = job_ids[best], scores[best]
+
+        order = np.argsort(-scores, kind="stable")
+        return job_ids[order], scores[order]
+
+    # ---------------- Persistence ----------------
+    def save(self, directory=INDEX_DIR):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        def atomic(name, write):
+            tmp = directory / f".{name}.tmp"
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, directory / name)
+
+        atomic("idf.npy", lambda f: np.save(f, self.idf))
+        atomic("keys.npy", lambda f: np.save(f, self.keys))
+        atomic("matrix.npz", lambda f: sparse.save_npz(f, self.matrix))
+        # Written last: a complete meta.json marks a consistent index
+        atomic("meta.json", lambda f: f.write(json.dumps({
+            "vocabulary": self.vocabulary,
+            "fitted_docs": self.fitted_docs,
+            "n_docs": len(self),
+        }).encode()))
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR):
+        directory = Path(directory)
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+
+        index = cls(
+            meta["vocabulary"],
+            np.load(directory / "idf.npy"),
+            sparse.load_npz(directory / "matrix.npz"),
+            np.load(directory / "keys.npy"),
+            meta["fitted_docs"],
+        )
+
+        if len(index) != meta["n_docs"] or len(index.keys) != meta["n_docs"]:
+            raise ValueError("TF-IDF index files are inconsistent")
+        return index
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def sync_tfidf_index(catalog, directory=INDEX_DIR):
+    """
+    Bring the persisted index in line with the catalog: reuse it as is,
+    append only new postings, or refit when existing rows changed.
+    Worker processes share the directory; the file lock lets one of them
+    update it and the rest load the result.
+    """
+    global _index, _index_version
+
+    with _index_lock:
+        if _index_version == catalog.version:
+            return _index
+
+        texts = catalog.column("clean_description")
+        keys = doc_keys(texts)
+
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        with file_lock(Path(directory) / ".lock"):
+            index = _sync_locked(texts, keys, directory)
+
+        _index, _index_version = index, catalog.version
+        return index
+
+
+def _sync_locked(texts, keys, directory):
+    # The files on disk may be newer than our copy (another worker
+    # updated them), so always start from what is persisted
+    try:
+        index = TfidfJobIndex.load(directory)
+    except (OSError, ValueError, KeyError):
+        index = _index
+
+    n = len(index) if index is not None else 0
+    reusable = (
+        index is not None
+        and n <= len(keys)
+        and np.array_equal(index.keys, keys[:n])
+        and len(keys) - index.fitted_docs <= REFIT_RATIO * index.fitted_docs
+    )
+
+    if not reusable:
+        index = TfidfJobIndex.fit(texts)
+        index.save(directory)
+        print(f"🔤 TF-IDF index fitted on {len(index)} jobs")
+    elif n < len(keys):
+        index.append(texts[n:])
+        index.save(directory)
+        print(f"🔤 TF-IDF index appended {len(keys) - n} jobs")
+
+    return index
+
+
+def get_tfidf_index(catalog):
+    if _index_version == catalog.version:
+        return _index
+    return sync_tfidf_index(catalog)
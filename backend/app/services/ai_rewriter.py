@@ -1,21 +1,78 @@
-from transformers import pipeline
+from app.config import REWRITE_MAX_BATCH, REWRITE_MAX_PENDING, REWRITE_MAX_WAIT_MS, REWRITER_BACKEND
+from app.ml_models.backends import load_text2text
+from app.ml_models.registry import registry
+from app.services.batcher import MicroBatcher
+from app.services import executors
+from app.utils.content_cache import ContentCache, content_key
+from app.utils.metrics import inference
 
-# Load once at startup (important for speed)
-rewriter = pipeline(
-    "text2text-generation",
-    model="google/flan-t5-base",
-    max_length=128
-)
+MODEL_NAME = "google/flan-t5-base"
 
-def rewrite_line_hf(line: str) -> str:
-    """
-    Rewrite resume bullet using HuggingFace LLM
-    """
-    prompt = (
+# Bump when build_prompt changes so cached rewrites are not reused
+PROMPT_VERSION = 1
+
+rewrite_cache = ContentCache("rewrites")
+
+def _load_rewriter():
+    return load_text2text(MODEL_NAME, REWRITER_BACKEND, max_length=128)
+
+# Loaded on first use, not at import (see MODEL_WARMUP in app.config)
+registry.register("rewriter", _load_rewriter, backend=REWRITER_BACKEND)
+
+def build_prompt(line: str) -> str:
+    return (
         "Rewrite this resume bullet using strong action verbs, "
         "quantifiable impact, and ATS-friendly language:\n\n"
         f"{line}"
     )
 
-    result = rewriter(prompt)[0]["generated_text"]
-    return result.strip()
+def _cache_key(line: str) -> str:
+    return content_key(line, MODEL_NAME, REWRITER_BACKEND, PROMPT_VERSION)
+
+def rewrite_lines_hf(lines: list) -> list:
+    """
+    Rewrite many resume bullets in one batched generation call.
+    Lines rewritten before are served from the cache.
+    """
+    rewritten = [rewrite_cache.get(_cache_key(line)) for line in lines]
+    missing = [i for i, result in enumerate(rewritten) if result is None]
+
+    if missing:
+        prompts = [build_prompt(lines[i]) for i in missing]
+        rewriter = registry.get("rewriter")
+        with inference("rewriter", len(prompts)):
+            results = rewriter(prompts, batch_size=len(prompts))
+
+        # The pipeline returns one dict per prompt (or a 1-item list of them)
+        for i, r in zip(missing, results):
+            rewritten[i] = (r[0] if isinstance(r, list) else r)["generated_text"].strip()
+            rewrite_cache.set(_cache_key(lines[i]), rewritten[i])
+
+    return rewritten
+
+def rewrite_line_hf(line: str) -> str:
+    """
+    Rewrite resume bullet using HuggingFace LLM
+    """
+    key = _cache_key(line)
+    cached = rewrite_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rewriter = registry.get("rewriter")
+    with inference("rewriter"):
+        result = rewriter(build_prompt(line))[0]["generated_text"]
+    result = result.strip()
+    rewrite_cache.set(key, result)
+    return result
+
+# Concurrent /ats/ai-rewrite calls are coalesced into batched generations,
+# run on the inference threads
+rewrite_batcher = MicroBatcher(
+    rewrite_lines_hf,
+    max_batch=REWRITE_MAX_BATCH,
+    max_wait=REWRITE_MAX_WAIT_MS / 1000,
+    name="rewriter",
+    lane=executors.inference,
+    max_pending=REWRITE_MAX_PENDING,
+)
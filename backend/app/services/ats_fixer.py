@@ -1,14 +1,161 @@
-def apply_fixes(original_text: str, feedback: list):
+import re
+
+
+def _replacement(item: dict) -> str:
+    # line_feedback items carry improved_example; /ai-rewrite/bulk
+    # results carry rewritten
+    return item.get("improved_example") or item.get("rewritten") or ""
+
+
+def _keep_padding(line: str, new: str) -> str:
+    # Keep the line's indentation / trailing "\r" around the new content
+    stripped = line.strip()
+    start = line.find(stripped) if stripped else 0
+    return line[:start] + new.strip() + line[start + len(stripped):]
+
+
+def plan_fixes(original_text: str, feedback: list):
     """
-    Replace weak lines with improved examples
+    Locate every feedback target in one pass over the original lines.
+
+    Returns (lines, hunks, unmatched): the original lines, one hunk per
+    changed line or run of lines ({"start", "end", "before", "after",
+    "item"}, line numbers 0-based with `end` exclusive) in line order,
+    and the indices of feedback items that were not applied (no match,
+    or every line they target was already claimed by an earlier item).
+
+    Items are matched against the original text only, so a replacement
+    can never create text that a later item then rewrites. A whole-line
+    match (by line_number when given, else by content) wins; a multi-line
+    `line` matches a run of whole lines; other items are found as
+    substrings of single lines by one combined regex. The first item to
+    claim a line wins.
     """
-    updated_text = original_text
+    lines = original_text.split("\n")
+
+    by_content = {}
+    for number, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped:
+            by_content.setdefault(stripped, []).append(number)
+
+    # start -> (item index, replacement, end)
+    changes = {}
+    claimed = set()
+    matched = set()
+    substrings = {}
+
+    def claim(start, end, index, after):
+        if claimed.intersection(range(start, end)):
+            return False
+        claimed.update(range(start, end))
+        changes[start] = (index, after, end)
+        matched.add(index)
+        return True
 
-    for item in feedback:
+    for index, item in enumerate(feedback):
         old = item.get("line", "")
-        new = item.get("improved_example", "")
+        new = _replacement(item)
+        if not old or not new:
+            continue
+
+        if "\n" in old.strip("\n"):
+            # Multi-line target: every run of whole lines with this content
+            wanted = [line.strip() for line in old.strip("\n").split("\n")]
+            for start in by_content.get(wanted[0], []):
+                end = start + len(wanted)
+                if [line.strip() for line in lines[start:end]] == wanted:
+                    claim(start, end, index, _keep_padding(lines[start], new))
+            continue
+
+        number = item.get("line_number")
+        if isinstance(number, int) and 0 <= number < len(lines) and lines[number].strip() == old.strip():
+            targets = [number]
+        else:
+            # Same as the old str.replace: every line with this content
+            targets = by_content.get(old.strip(), [])
+
+        if targets:
+            for number in targets:
+                claim(number, number + 1, index, _keep_padding(lines[number], new))
+        else:
+            substrings.setdefault(old, (index, new))
+
+    if substrings:
+        # Longest first, so an item never shadows a longer one it prefixes
+        pattern = re.compile("|".join(
+            re.escape(old) for old in sorted(substrings, key=len, reverse=True)
+        ))
 
-        if old and new and old in updated_text:
-            updated_text = updated_text.replace(old, new)
+        for number, line in enumerate(lines):
+            if number in claimed:
+                continue
+            hits = []
 
-    return updated_text
+            def substitute(match):
+                index, new = substrings[match.group(0)]
+                hits.append(index)
+                return new
+
+            updated = pattern.sub(substitute, line)
+            if hits:
+                claim(number, number + 1, hits[0], updated)
+                matched.update(hits)
+
+    hunks = [
+        {
+            "start": number,
+            "end": end,
+            "before": "\n".join(lines[number:end]),
+            "after": after,
+            "item": index,
+        }
+        for number, (index, after, end) in sorted(changes.items())
+        if after != "\n".join(lines[number:end])
+    ]
+    unmatched = [
+        index for index, item in enumerate(feedback)
+        if index not in matched and item.get("line") and _replacement(item)
+    ]
+    return lines, hunks, unmatched
+
+
+def apply_patch(original_text: str, hunks: list) -> str:
+    """
+    Rebuild the text once with every hunk applied (hunks as returned by
+    plan_fixes, against the same original text)
+    """
+    lines = original_text.split("\n")
+    out = []
+    position = 0
+    for hunk in sorted(hunks, key=lambda h: h["start"]):
+        if hunk["start"] < position:
+            continue  # overlaps a hunk already applied
+        out.extend(lines[position:hunk["start"]])
+        out.append(hunk["after"])
+        position = hunk["end"]
+    out.extend(lines[position:])
+    return "\n".join(out)
+
+
+def fix_resume(original_text: str, feedback: list) -> dict:
+    """
+    Apply feedback and describe the result as a patch, so callers can
+    render a diff without re-diffing the full text
+    """
+    lines, hunks, unmatched = plan_fixes(original_text, feedback)
+    return {
+        "improved_resume": apply_patch(original_text, hunks),
+        "patch": {
+            "hunks": hunks,
+            "lines_before": len(lines),
+            "unmatched": unmatched,
+        },
+    }
+
+
+def apply_fixes(original_text: str, feedback: list):
+    """
+    Replace weak lines with improved examples
+    """
+    return fix_resume(original_text, feedback)["improved_resume"]
@@ -0,0 +1,260 @@
+import re
+from collections import Counter
+
+# ==========================================================
+# RULES (DATA)
+# ==========================================================
+
+ACTION_VERBS = [
+    "developed", "built", "designed", "implemented",
+    "analyzed", "optimized", "deployed", "led",
+    "created", "improved", "managed"
+]
+
+# Word lists referenced by rules; all of them are compiled into one regex,
+# so adding a list doesn't add another scan of the text
+WORD_LISTS = {
+    "action_verbs": ACTION_VERBS,
+}
+
+# Characters counted per feature (one compiled character class)
+SPECIAL_CHARS = {
+    "table_chars": "|\t",
+}
+
+# Document rules: the first tier whose [min, max) range contains the
+# feature value awards its points (and suggestion, if any)
+DOCUMENT_RULES = [
+    {
+        "id": "skills_coverage",
+        "feature": "skill_count",
+        "tiers": [
+            (8, None, 35, None),
+            (6, 8, 30, "Add more relevant technical skills"),
+            (4, 6, 24, "Add 2–3 more relevant technical skills"),
+            (None, 4, 18, "Your resume lacks sufficient technical skills"),
+        ],
+    },
+    {
+        "id": "length",
+        "feature": "word_count",
+        "tiers": [
+            (450, 901, 20, None),
+            (300, 450, 16, "Increase resume length to ~500 words"),
+            (None, None, 12, "Your resume is too short for ATS systems"),
+        ],
+    },
+    {
+        "id": "action_verbs",
+        "feature": "action_verbs_hits",
+        "tiers": [
+            (5, None, 15, None),
+            (None, 5, 10, "Use more action verbs (developed, implemented, optimized)"),
+        ],
+    },
+    {
+        "id": "experience",
+        "feature": "experience",
+        "tiers": [
+            (3, None, 20, None),
+            (2, 3, 17, None),
+            (1, 2, 14, "Highlight internships or hands-on projects"),
+            (None, 1, 10, "Add projects or internship experience"),
+        ],
+    },
+    {
+        "id": "formatting",
+        "feature": "table_chars_count",
+        "tiers": [
+            (None, 1, 10, None),
+            (1, None, 7, "Avoid tables, columns, or special symbols"),
+        ],
+    },
+]
+
+# Line rules apply to every line of at least MIN_LINE_LENGTH characters
+LINE_RULES = [
+    {
+        "id": "action_verb",
+        "requires_any": "action_verbs",
+        "issue": "Line lacks strong action verbs",
+    },
+]
+
+MIN_LINE_LENGTH = 10
+SCORE_RANGE = (65, 95)
+
+# ==========================================================
+# COMPILED ENGINE
+# ==========================================================
+
+class DocumentStats:
+    """
+    Running aggregates over line features. Lines can be added and
+    removed, so an edited document only needs its changed lines redone.
+    """
+
+    def __init__(self, rules):
+        self.word_count = 0
+        self.char_counts = Counter()
+        # word list -> token -> number of lines containing it
+        self.token_lines = {name: Counter() for name in rules.word_lists}
+
+    def add(self, features: dict, sign: int = 1):
+        self.word_count += sign * features["words"]
+        for name, count in features["chars"].items():
+            self.char_counts[name] += sign * count
+        for name, tokens in features["hits"].items():
+            lines = self.token_lines[name]
+            for token in tokens:
+                lines[token] += sign
+                if lines[token] <= 0:
+                    del lines[token]
+
+    def remove(self, features: dict):
+        self.add(features, sign=-1)
+
+    def features(self) -> dict:
+        values = {"word_count": self.word_count}
+        for name, lines in self.token_lines.items():
+            values[f"{name}_hits"] = len(lines)
+        for name in self.char_counts:
+            values[f"{name}_count"] = self.char_counts[name]
+        return values
+
+
+class CompiledRules:
+    """
+    WORD_LISTS / SPECIAL_CHARS / LINE_RULES / DOCUMENT_RULES compiled
+    into one word-boundary regex over every listed word and one
+    character class, so each line is scanned once whatever the number
+    of rules.
+    """
+
+    def __init__(self, word_lists=WORD_LISTS, special_chars=SPECIAL_CHARS,
+                 line_rules=LINE_RULES, document_rules=DOCUMENT_RULES):
+        self.word_lists = list(word_lists)
+        self.special_chars = special_chars
+        self.line_rules = line_rules
+        self.document_rules = document_rules
+
+        lookup = {}
+        for name, words in word_lists.items():
+            for word in words:
+                lookup.setdefault(word.lower(), []).append(name)
+        self._lookup = {token: tuple(names) for token, names in lookup.items()}
+
+        # Longest first so overlapping words prefer the full match
+        alternation = "|".join(
+            re.escape(word) for word in sorted(self._lookup, key=len, reverse=True)
+        )
+        self._words_re = re.compile(rf"(?<![a-z0-9'])(?:{alternation})(?![a-z0-9'])")
+
+        self._char_names = {}
+        for name, chars in special_chars.items():
+            for char in chars:
+                self._char_names[char] = name
+        self._char_re = re.compile("[" + re.escape("".join(self._char_names)) + "]")
+
+    def new_stats(self) -> DocumentStats:
+        return DocumentStats(self)
+
+    def _line_issues(self, lists_hit) -> list:
+        return [
+            rule["issue"]
+            for rule in self.line_rules
+            if rule["requires_any"] not in lists_hit
+        ]
+
+    def line_features(self, line: str) -> dict:
+        """
+        Everything the rules need from one line, in a form DocumentStats
+        can add and remove (used for incremental re-scoring)
+        """
+        hits = {}
+        for token in self._words_re.findall(line.lower()):
+            for name in self._lookup[token]:
+                hits.setdefault(name, set()).add(token)
+
+        chars = dict.fromkeys(self.special_chars, 0)
+        for char in self._char_re.findall(line):
+            chars[self._char_names[char]] += 1
+
+        issues = []
+        if len(line.strip()) >= MIN_LINE_LENGTH:
+            issues = self._line_issues(hits)
+
+        return {
+            "words": len(line.split()),
+            "hits": hits,
+            "chars": chars,
+            "issues": issues,
+        }
+
+    def scan(self, text: str):
+        """
+        Whole-document pass: (feature values, [(line number, line, issues), ...]).
+        Document counts come from C-level scans of the full text; the
+        per-line loop only runs the combined word regex once per line.
+        """
+        lookup = self._lookup
+        findall = self._words_re.findall
+
+        distinct = {name: set() for name in self.word_lists}
+        flagged = []
+
+        # Lowercasing never adds or removes newlines, so lines stay aligned
+        for number, (line, lowered) in enumerate(zip(text.split("\n"), text.lower().split("\n"))):
+            lists_hit = ()
+            tokens = findall(lowered)
+            if tokens:
+                lists_hit = set()
+                for token in tokens:
+                    for name in lookup[token]:
+                        distinct[name].add(token)
+                        lists_hit.add(name)
+
+            if len(line.strip()) >= MIN_LINE_LENGTH:
+                issues = self._line_issues(lists_hit)
+                if issues:
+                    flagged.append((number, line, issues))
+
+        values = {"word_count": len(text.split())}
+        for name, tokens in distinct.items():
+            values[f"{name}_hits"] = len(tokens)
+        for name, chars in self.special_chars.items():
+            values[f"{name}_count"] = sum(text.count(char) for char in chars)
+
+        return values, flagged
+
+    def evaluate(self, values: dict, skill_count: int, experience: int):
+        """
+        (score, suggestions) from document feature values
+        """
+        values = dict(values, skill_count=skill_count, experience=experience)
+
+        score = 0
+        suggestions = []
+        for rule in self.document_rules:
+            value = values.get(rule["feature"], 0)
+            for low, high, points, suggestion in rule["tiers"]:
+                if (low is None or value >= low) and (high is None or value < high):
+                    score += points
+                    if suggestion:
+                        suggestions.append(suggestion)
+                    break
+
+        low, high = SCORE_RANGE
+        return min(max(score, low), high), list(dict.fromkeys(suggestions))
+
+
+RULES = CompiledRules()
+
+
+def line_feedback_item(line: str, issues: list, line_number: int = None) -> dict:
+    return {
+        "line": line,
+        "line_number": line_number,
+        "issues": issues,
+        "improved_example": f"Improved: {line.strip()} using measurable impact"
+    }
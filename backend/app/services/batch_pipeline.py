@@ -0,0 +1,185 @@
+"""
+Bulk resume screening: extraction -> parse_resume -> analyze_resume ->
+recommend_jobs for many files at once, one worker process per core.
+
+    python -m app.services.batch_pipeline resumes/ -o results.ndjson
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
+
+from app.config import CPU_POOL_SIZE, MAX_RESUME_PAGES, MAX_UPLOAD_MB
+from app.services.ats_scorer import analyze_resume
+from app.services.job_matcher import recommend_jobs
+from app.services.resume_parser import parse_resume
+from app.utils.text_extractor import SUPPORTED_EXTENSIONS, extract_text_from_bytes
+
+STAGES = ("extract", "parse", "score", "match")
+TOP_JOBS = 5
+
+MAX_FILE_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+
+
+# ---------------- INPUTS ----------------
+def iter_zip(data: bytes):
+    """
+    (filename, bytes) for every supported resume inside a zip archive
+    """
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                continue
+            if info.file_size > MAX_FILE_BYTES:
+                yield info.filename, None
+                continue
+            yield info.filename, archive.read(info)
+
+
+def iter_directory(path: str):
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                continue
+            full_path = os.path.join(root, name)
+            if os.path.getsize(full_path) > MAX_FILE_BYTES:
+                yield os.path.relpath(full_path, path), None
+                continue
+            with open(full_path, "rb") as f:
+                yield os.path.relpath(full_path, path), f.read()
+
+
+# ---------------- WORKER ----------------
+def process_resume(filename: str, data: bytes) -> dict:
+    """
+    Full pipeline for one resume. Runs in a worker process.
+    """
+    if data is None:
+        return {"filename": filename, "error": f"File larger than {MAX_UPLOAD_MB:g} MB"}
+
+    timings = {}
+    try:
+        start = time.perf_counter()
+        text = extract_text_from_bytes(data, filename, MAX_RESUME_PAGES)
+        timings["extract"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = parse_resume(text)
+        timings["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ats = analyze_resume(text, parsed["skills"], parsed["experience"])
+        timings["score"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        jobs = recommend_jobs(text, parsed["skills"], parsed["experience"], limit=TOP_JOBS)
+        timings["match"] = time.perf_counter() - start
+    except Exception as exc:
+        return {"filename": filename, "error": str(exc) or type(exc).__name__}
+
+    return {
+        "filename": filename,
+        "skills": parsed["skills"],
+        "experience": parsed["experience"],
+        "ats_score": ats["ats_score"],
+        "suggestions": ats["suggestions"],
+        "weak_lines": len(ats["line_feedback"]),
+        "top_jobs": [
+            {"title": job["title"], "job_type": job["job_type"], "final_score": job["final_score"]}
+            for job in jobs
+        ],
+        "timings_ms": {stage: round(t * 1000, 3) for stage, t in timings.items()},
+    }
+
+
+# ---------------- DRIVER ----------------
+def run_batch(files, pool, max_in_flight: int = None):
+    """
+    Stream result dicts as workers finish, keeping at most
+    `max_in_flight` files in memory, then yield a summary dict
+    """
+    max_in_flight = max_in_flight or CPU_POOL_SIZE * 4
+    started = time.perf_counter()
+    stage_seconds = dict.fromkeys(STAGES, 0.0)
+    ok = failed = 0
+
+    pending = set()
+    files = iter(files)
+    exhausted = False
+
+    while pending or not exhausted:
+        while not exhausted and len(pending) < max_in_flight:
+            try:
+                filename, data = next(files)
+            except StopIteration:
+                exhausted = True
+                break
+            pending.add(pool.submit(process_resume, filename, data))
+
+        if not pending:
+            break
+
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if "error" in result:
+                failed += 1
+            else:
+                ok += 1
+                for stage, ms in result["timings_ms"].items():
+                    stage_seconds[stage] += ms / 1000
+            yield result
+
+    elapsed = time.perf_counter() - started
+    yield {
+        "summary": {
+            "files": ok + failed,
+            "ok": ok,
+            "failed": failed,
+            "elapsed_s": round(elapsed, 2),
+            "files_per_sec": round((ok + failed) / elapsed, 2) if elapsed else None,
+            "stage_seconds": {stage: round(t, 2) for stage, t in stage_seconds.items()},
+            # Throughput of each stage on a single worker
+            "stage_files_per_sec": {
+                stage: round(ok / t, 1) if t else None
+                for stage, t in stage_seconds.items()
+            },
+        }
+    }
+
+
+def to_ndjson(results):
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="directory of resumes or a .zip archive")
+    parser.add_argument("-o", "--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=CPU_POOL_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.path.lower().endswith(".zip"):
+        with open(args.path, "rb") as f:
+            files = iter_zip(f.read())
+    else:
+        files = iter_directory(args.path)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for line in to_ndjson(run_batch(files, pool)):
+                out.write(line)
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
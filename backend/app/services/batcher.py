@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.executors import ExecutorSaturated
+
+
+class MicroBatcher:
+    """
+    Collects single-item async calls for up to `max_wait` seconds (or
+    until `max_batch` items are queued) and runs them as one call of
+    `batch_fn(items) -> results`, in `lane` (app.services.executors) if
+    given, otherwise on a dedicated worker thread. With `max_pending`,
+    submits beyond that many queued items raise ExecutorSaturated.
+    """
+
+    def __init__(self, batch_fn, max_batch: int = 16, max_wait: float = 0.01, name: str = "batcher",
+                 lane=None, max_pending: int = None):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self.lane = lane
+        self.max_pending = max_pending
+
+        self._queue = None
+        self._task = None
+        self._executor = None if lane is not None else ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, item):
+        self._ensure_started()
+        if self.max_pending is not None and self.pending() >= self.max_pending:
+            raise ExecutorSaturated(self.name)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def submit_many(self, items):
+        # All or nothing: don't start a bulk request that can't fit
+        self._ensure_started()
+        if self.max_pending is not None and self.pending() + len(items) > self.max_pending:
+            raise ExecutorSaturated(self.name)
+        return await asyncio.gather(*(self.submit(item) for item in items))
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            # Skip callers that gave up while waiting
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                if self.lane is not None:
+                    results = await self.lane.run(self.batch_fn, items)
+                else:
+                    results = await loop.run_in_executor(self._executor, self.batch_fn, items)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            results = list(results)
+            if len(results) != len(items):
+                error = RuntimeError(f"{self.name}: {len(results)} results for {len(items)} items")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
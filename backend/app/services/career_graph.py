@@ -0,0 +1,284 @@
+import heapq
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from app.utils.skill_matcher import normalize_skills
+
+# Longest progression searched, in transitions after the starting role
+MAX_HOPS = 3
+
+# Distinct skill sets whose results are kept
+RESULT_CACHE_SIZE = 1024
+
+
+def _as_list(value) -> list:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class CareerGraph:
+    """
+    Career paths compiled once into a graph: roles are nodes, "next"
+    transitions are edges and each role's required skills are a bitmask
+    over a shared skill vocabulary (plus the same sets as a sparse
+    role x skill matrix, so coverage of every role is one mat-vec).
+
+    Fit is weighted coverage: a skill counts 1 + log(roles / roles that
+    need it), so distinctive skills say more about a role than ones
+    every role asks for. Progressions are ranked by the learning cost of
+    the skills still missing along the way.
+    """
+
+    def __init__(self, career_paths: dict, learning_costs: dict = None,
+                 learning_links: dict = None, max_hops: int = MAX_HOPS,
+                 cache_size: int = RESULT_CACHE_SIZE):
+        self.learning_links = learning_links or {}
+        self.max_hops = max_hops
+
+        # Roles named only as a "next" step still become (leaf) nodes
+        definitions = dict(career_paths)
+        for data in career_paths.values():
+            for name in _as_list(data.get("next")):
+                definitions.setdefault(name, {"category": data.get("category", ""), "level": "senior"})
+
+        self.roles = list(definitions)
+        self.role_ids = {role: i for i, role in enumerate(self.roles)}
+        self.categories = [definitions[r].get("category", "") for r in self.roles]
+        self.levels = [definitions[r].get("level", "entry") for r in self.roles]
+        self._entry = np.array([level == "entry" for level in self.levels], dtype=bool)
+
+        self.skills = []
+        self.skill_ids = {}
+        role_skills = []
+        for role in self.roles:
+            ids = []
+            for skill in normalize_skills(definitions[role].get("required", [])):
+                if skill not in self.skill_ids:
+                    self.skill_ids[skill] = len(self.skills)
+                    self.skills.append(skill)
+                ids.append(self.skill_ids[skill])
+            role_skills.append(ids)
+
+        self.role_masks = [sum(1 << i for i in ids) for ids in role_skills]
+        self.next_roles = [
+            [self.role_ids[name] for name in _as_list(definitions[role].get("next"))]
+            for role in self.roles
+        ]
+
+        n_roles, n_skills = len(self.roles), len(self.skills)
+        rows = np.repeat(np.arange(n_roles), [len(ids) for ids in role_skills])
+        cols = np.fromiter((i for ids in role_skills for i in ids), dtype=np.int64, count=len(rows))
+        self.role_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(n_roles, n_skills)
+        )
+
+        roles_per_skill = np.bincount(cols, minlength=n_skills)
+        self.skill_weights = (1 + np.log(n_roles / np.maximum(roles_per_skill, 1))).astype(np.float32)
+        self.role_weight_totals = self.role_matrix @ self.skill_weights
+
+        costs = learning_costs or {}
+        self.skill_costs = [float(costs.get(skill, 1.0)) for skill in self.skills]
+        # Most skills cost 1, so a cost is a popcount plus the extra
+        # effort of the few skills that cost more
+        self._extra_cost_mask = sum(
+            1 << i for i, cost in enumerate(self.skill_costs) if cost != 1.0
+        )
+
+        self.prev_roles = [[] for _ in self.roles]
+        for role, next_ids in enumerate(self.next_roles):
+            for nxt in next_ids:
+                self.prev_roles[nxt].append(role)
+
+        self._cached = lru_cache(maxsize=cache_size)(self._recommend)
+        self._hops_to = lru_cache(maxsize=256)(self._reverse_hops)
+
+    def __len__(self):
+        return len(self.roles)
+
+    # ---------------- Skill sets ----------------
+    def skill_mask(self, skills) -> int:
+        """
+        Bitmask of the given skills that any role asks for; skills no
+        role needs don't change any result, so they're left out of the key
+        """
+        mask = 0
+        for skill in normalize_skills(skills):
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    def _bits(self, mask: int):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _indicator(self, mask: int) -> np.ndarray:
+        has = np.zeros(len(self.skills), dtype=np.float32)
+        has[list(self._bits(mask))] = 1
+        return has
+
+    def _cost(self, mask: int) -> float:
+        cost = mask.bit_count()
+        extra = mask & self._extra_cost_mask
+        if extra:
+            costs = self.skill_costs
+            cost += sum(costs[i] - 1.0 for i in self._bits(extra))
+        return cost
+
+    def _names(self, mask: int) -> list:
+        return [self.skills[i] for i in self._bits(mask)]
+
+    # ---------------- Ranking ----------------
+    def coverage(self, mask: int):
+        """
+        (weighted coverage 0-1, matched skill count) for every role
+        """
+        has = self._indicator(mask)
+        matched_weight = self.role_matrix @ (has * self.skill_weights)
+        matched = self.role_matrix @ has
+        coverage = np.divide(
+            matched_weight, self.role_weight_totals,
+            out=np.zeros_like(matched_weight), where=self.role_weight_totals > 0,
+        )
+        return coverage, matched.astype(np.int32)
+
+    def _reverse_hops(self, target: int) -> dict:
+        """
+        Fewest transitions from each role that can reach `target`
+        (reverse BFS), used to prune searches that can't get there
+        """
+        hops = {target: 0}
+        queue = deque([target])
+        while queue:
+            role = queue.popleft()
+            if hops[role] >= self.max_hops:
+                continue
+            for prev in self.prev_roles[role]:
+                if prev not in hops:
+                    hops[prev] = hops[role] + 1
+                    queue.append(prev)
+        return hops
+
+    def progressions(self, mask: int, starts, k: int = 3, target: int = None) -> list:
+        """
+        The k cheapest multi-hop progressions from any of `starts`.
+        Best-first search over partial paths: a path's cost is the exact
+        learning cost of every skill missing along it (each skill paid
+        once), which only grows as the path is extended, so paths come
+        off the heap cheapest first.
+        """
+        hops = self._hops_to(target) if target is not None else None
+        if hops is not None:
+            starts = [role for role in starts if 0 < hops.get(role, self.max_hops + 1) <= self.max_hops]
+
+        heap = []
+        for role in starts:
+            missing = self.role_masks[role] & ~mask
+            heapq.heappush(heap, (self._cost(missing), (role,), mask | self.role_masks[role]))
+
+        found = []
+        while heap and len(found) < k:
+            cost, path, acquired = heapq.heappop(heap)
+            if len(path) > 1 and (target is None or path[-1] == target):
+                found.append((cost, path))
+                if target is not None:
+                    continue
+
+            if len(path) > self.max_hops:
+                continue
+            remaining = self.max_hops - len(path)
+            for nxt in self.next_roles[path[-1]]:
+                if nxt in path:
+                    continue
+                if hops is not None and hops.get(nxt, remaining + 1) > remaining:
+                    continue
+                missing = self.role_masks[nxt] & ~acquired
+                heapq.heappush(heap, (
+                    cost + self._cost(missing),
+                    path + (nxt,),
+                    acquired | self.role_masks[nxt],
+                ))
+
+        return found
+
+    # ---------------- Results ----------------
+    def recommend(self, skills, k: int = 3, target_role: str = None) -> dict:
+        """
+        Ranked paths and progressions for a skill list. Results are
+        cached per distinct skill set and shared, so treat them as
+        read-only.
+        """
+        return self._cached(self.skill_mask(skills), k, target_role)
+
+    def _path_entry(self, role: int, mask: int, coverage, matched) -> dict:
+        missing = self._names(self.role_masks[role] & ~mask)
+        next_roles = [self.roles[i] for i in self.next_roles[role]]
+        return {
+            "current_role": self.roles[role],
+            "category": self.categories[role],
+            "next_role": next_roles[0] if next_roles else None,
+            "next_roles": next_roles,
+            "match_score": matched[role],
+            "coverage": round(coverage[role], 3),
+            "missing_skills": missing,
+            "learning_resources": {
+                skill: self.learning_links.get(skill, {})
+                for skill in missing
+            }
+        }
+
+    def _progression_entry(self, cost: float, path: tuple, mask: int) -> dict:
+        steps = []
+        acquired = mask
+        for role in path:
+            steps.append({
+                "role": self.roles[role],
+                "learn": self._names(self.role_masks[role] & ~acquired),
+            })
+            acquired |= self.role_masks[role]
+        return {
+            "roles": [self.roles[role] for role in path],
+            "cost": float(round(cost, 2)),
+            "steps": steps,
+        }
+
+    def _recommend(self, mask: int, k: int, target_role: str) -> dict:
+        coverage, matched = self.coverage(mask)
+
+        # Best weighted coverage first, then more matched skills
+        order = np.lexsort((-matched, -coverage))
+        candidates = order[self._entry[order] & (matched[order] > 0)].tolist()
+        coverage, matched = coverage.tolist(), matched.tolist()
+
+        tech_paths, non_tech_paths = [], []
+        for role in candidates:
+            entry = self._path_entry(role, mask, coverage, matched)
+            if self.categories[role] == "Tech":
+                tech_paths.append(entry)
+            else:
+                non_tech_paths.append(entry)
+
+        target = self.role_ids.get(target_role) if target_role else None
+        if target_role and target is None:
+            progressions = []
+        else:
+            starts = candidates or np.flatnonzero(self._entry).tolist()
+            found = self.progressions(mask, starts, k, target)
+            progressions = [self._progression_entry(cost, path, mask) for cost, path in found]
+
+        return {
+            "tech_paths": tech_paths,
+            "non_tech_paths": non_tech_paths,
+            "progressions": progressions,
+        }
+
+    def cache_info(self):
+        return self._cached.cache_info()
@@ -1,3 +1,5 @@
+from app.services.career_graph import CareerGraph
+
 # ==========================================================
 # LEARNING RESOURCES (MULTI-PLATFORM)
 # ==========================================================
@@ -70,7 +72,7 @@ CAREER_PATHS = {
     "Software Engineer": {
         "category": "Tech",
         "required": ["python", "sql", "git"],
-        "next": "Senior Software Engineer"
+        "next": ["Senior Software Engineer", "DevOps Engineer"]
     },
     "Backend Developer": {
         "category": "Tech",
@@ -95,12 +97,12 @@ CAREER_PATHS = {
     "Data Analyst": {
         "category": "Non-Tech",
         "required": ["python", "sql", "excel"],
-        "next": "Senior Data Analyst"
+        "next": ["Senior Data Analyst", "Machine Learning Engineer"]
     },
     "Business Analyst": {
         "category": "Non-Tech",
         "required": ["sql", "excel", "communication"],
-        "next": "Business Consultant"
+        "next": ["Business Consultant", "Product Analyst"]
     },
     "Product Analyst": {
         "category": "Non-Tech",
@@ -116,62 +118,123 @@ CAREER_PATHS = {
         "category": "Non-Tech",
         "required": ["communication", "recruitment"],
         "next": "HR Manager"
+    },
+
+    # ---------------- Next steps ----------------
+    "Senior Software Engineer": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["python", "sql", "git", "system design", "docker"],
+        "next": "Engineering Manager"
+    },
+    "Senior Backend Engineer": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["python", "sql", "flask", "system design", "redis", "microservices"],
+        "next": "Engineering Manager"
+    },
+    "Senior ML Engineer": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["python", "machine learning", "deep learning", "mlops"]
+    },
+    "UI Architect": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["react", "javascript", "typescript", "system design"]
+    },
+    "DevOps Lead": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["docker", "aws", "kubernetes", "terraform", "ci/cd"],
+        "next": "Engineering Manager"
+    },
+    "Engineering Manager": {
+        "category": "Tech",
+        "level": "senior",
+        "required": ["system design", "leadership", "communication", "project management"]
+    },
+    "Senior Data Analyst": {
+        "category": "Non-Tech",
+        "level": "senior",
+        "required": ["python", "sql", "excel", "statistics", "tableau"],
+        "next": "Product Manager"
+    },
+    "Business Consultant": {
+        "category": "Non-Tech",
+        "level": "senior",
+        "required": ["communication", "stakeholder management", "requirements gathering", "presentation"]
+    },
+    "Product Manager": {
+        "category": "Non-Tech",
+        "level": "senior",
+        "required": ["product management", "analytics", "communication", "stakeholder management"]
+    },
+    "Operations Manager": {
+        "category": "Non-Tech",
+        "level": "senior",
+        "required": ["operations", "leadership", "communication", "project management"]
+    },
+    "HR Manager": {
+        "category": "Non-Tech",
+        "level": "senior",
+        "required": ["recruitment", "onboarding", "hr operations", "leadership"]
     }
 }
 
+# Relative effort of learning a skill (default 1); progressions are
+# ranked by the total effort of the skills they still require
+LEARNING_COSTS = {
+    "machine learning": 3,
+    "deep learning": 3,
+    "system design": 3,
+    "mlops": 2,
+    "kubernetes": 2,
+    "microservices": 2,
+    "statistics": 2,
+    "leadership": 2,
+    "product management": 2,
+}
+
 
 # ==========================================================
 # MAIN CAREER RECOMMENDER
 # ==========================================================
 
-def recommend_career(resume_skills: list):
-    resume_skills = set(map(str.lower, resume_skills))
-
-    tech_paths = []
-    non_tech_paths = []
-
-    # Rank all paths
-    for role, data in CAREER_PATHS.items():
-        required = set(data["required"])
-        matched = len(resume_skills & required)
-
-        if matched > 0:
-            missing = list(required - resume_skills)
-
-            path_data = {
-                "current_role": role,
-                "category": data["category"],
-                "next_role": data["next"],
-                "match_score": matched,
-                "missing_skills": missing,
-                "learning_resources": {
-                    skill: LEARNING_LINKS.get(skill, {})
-                    for skill in missing
-                }
-            }
-
-            if data["category"] == "Tech":
-                tech_paths.append(path_data)
-            else:
-                non_tech_paths.append(path_data)
-
-    # Sort by best match
-    tech_paths.sort(key=lambda x: x["match_score"], reverse=True)
-    non_tech_paths.sort(key=lambda x: x["match_score"], reverse=True)
+_graph = None
+
+
+def get_career_graph() -> CareerGraph:
+    """
+    Career graph compiled from CAREER_PATHS on first use
+    """
+    global _graph
+    if _graph is None:
+        _graph = CareerGraph(CAREER_PATHS, LEARNING_COSTS, LEARNING_LINKS)
+    return _graph
+
+
+def recommend_career(resume_skills: list, k: int = 3, target_role: str = None):
+    result = get_career_graph().recommend(resume_skills, k, target_role)
+    tech_paths = result["tech_paths"]
+    non_tech_paths = result["non_tech_paths"]
 
     # Default fallback for freshers
     if not tech_paths and not non_tech_paths:
-        tech_paths.append({
+        tech_paths = [{
             "current_role": "Software Engineer",
             "category": "Tech",
             "next_role": "Specialist Engineer",
+            "next_roles": ["Specialist Engineer"],
             "match_score": 0,
+            "coverage": 0.0,
             "missing_skills": ["system design", "cloud", "data structures"],
             "learning_resources": {}
-        })
+        }]
 
     return {
         "primary_path": tech_paths[0] if tech_paths else non_tech_paths[0],
         "tech_paths": tech_paths,
-        "non_tech_paths": non_tech_paths
+        "non_tech_paths": non_tech_paths,
+        "progressions": result["progressions"]
     }
@@ -0,0 +1,216 @@
+"""
+Job catalog snapshots as plain .npy files, one directory per catalog
+version, so every worker process maps the same pages read-only instead
+of each building (and holding) its own copy.
+
+    <CACHE_DIR>/catalog/<version>/
+        meta.json          written last: a directory without it is incomplete
+        <column>.npy       strings as a utf-8 blob + offsets, ints as is
+
+Directories are written under a temporary name and renamed into place,
+so a reader sees a whole version or none of it.
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from app.config import CACHE_DIR
+from app.services.job_columns import JobColumns
+from app.services.skill_index import SkillIndex
+
+CATALOG_DIR = Path(CACHE_DIR) / "catalog"
+
+# Bumped whenever the file layout changes; older directories are ignored
+FORMAT = 1
+
+STRING_FIELDS = ("title", "description", "clean_description", "market_demand", "date_posted", "job_type")
+
+# Versions kept on disk: the current one and the one workers may still be on
+KEEP_VERSIONS = 2
+
+
+# ---------------- Columns ----------------
+def _pack_strings(values):
+    encoded = [str(value).encode("utf-8") for value in values]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+class StringColumn:
+    """
+    Variable-length strings over a (memory-mapped) utf-8 blob
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def to_list(self):
+        # One copy of the blob, then plain slicing
+        data = self.blob.tobytes()
+        bounds = self.offsets.tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+class JobRows:
+    """
+    Read-only sequence of job dicts, built on access from the shared
+    columns. Only the rows a request actually returns are materialized.
+    """
+
+    def __init__(self, strings: dict, skill_offsets, skill_ids, skill_names):
+        self.strings = strings
+        self.skill_offsets = skill_offsets
+        self.skill_ids = skill_ids
+        self.skill_names = skill_names
+
+    def __len__(self):
+        return len(self.skill_offsets) - 1
+
+    def __getitem__(self, i: int) -> dict:
+        i = int(i)  # callers index with numpy ints from the skill index
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+
+        ids = self.skill_ids[self.skill_offsets[i]:self.skill_offsets[i + 1]].tolist()
+        skills = tuple(self.skill_names[s] for s in ids)
+        job = {"id": i}
+        for name in ("title", "description", "clean_description"):
+            job[name] = self.strings[name][i]
+        job["skills"] = skills
+        job["skill_set"] = frozenset(skills)
+        for name in ("market_demand", "date_posted", "job_type"):
+            job[name] = self.strings[name][i]
+        return job
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name: str) -> list:
+        """
+        One field for every job, without building the row dicts
+        """
+        return self.strings[name].to_list()
+
+
+# ---------------- Export ----------------
+def _version_dir(version: str, root=CATALOG_DIR) -> Path:
+    return Path(root) / str(version)
+
+
+def export_catalog(snapshot, root=CATALOG_DIR) -> Path:
+    """
+    Write a snapshot's rows, skill index and columns as .npy files.
+    Callers serialize exports with a file lock; the rename makes the
+    result visible to other processes all at once.
+    """
+    target = _version_dir(snapshot.version, root)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    jobs = snapshot.jobs
+    skill_names = list(snapshot.skill_index.skill_ids)
+    skill_ids = snapshot.skill_index.skill_ids
+
+    arrays = {}
+    for name in STRING_FIELDS:
+        arrays[f"str_{name}_blob"], arrays[f"str_{name}_offsets"] = _pack_strings(job[name] for job in jobs)
+
+    lengths = np.fromiter((len(job["skills"]) for job in jobs), dtype=np.int64, count=len(jobs))
+    arrays["job_skill_offsets"] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    arrays["job_skill_ids"] = np.fromiter(
+        (skill_ids[s] for job in jobs for s in job["skills"]), dtype=np.int32, count=int(lengths.sum())
+    )
+
+    arrays.update(snapshot.skill_index.to_arrays())
+    column_arrays, column_meta = snapshot.columns.to_arrays()
+    arrays.update({f"col_{name}": value for name, value in column_arrays.items()})
+
+    for name, value in arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(value))
+
+    meta = {
+        "format": FORMAT,
+        "version": snapshot.version,
+        "n_jobs": len(jobs),
+        "skill_names": skill_names,
+        "columns": column_meta,
+    }
+    with open(tmp / "meta.json", "w") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return target
+
+
+# ---------------- Open ----------------
+def open_catalog(version: str, root=CATALOG_DIR):
+    """
+    (rows, skill_index, columns) over memory-mapped files for this
+    version, or None if it has not been exported (in this format)
+    """
+    directory = _version_dir(version, root)
+    try:
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("format") != FORMAT or meta.get("version") != version:
+        return None
+
+    def load(name):
+        return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+    skill_names = meta["skill_names"]
+    skill_index = SkillIndex.from_arrays(
+        skill_names, meta["n_jobs"], load("posting_offsets"), load("posting_jobs")
+    )
+
+    column_arrays = {
+        path.stem[len("col_"):]: np.load(path, mmap_mode="r")
+        for path in directory.glob("col_*.npy")
+    }
+    columns = JobColumns.from_arrays(column_arrays, meta["columns"], skill_index)
+
+    strings = {
+        name: StringColumn(load(f"str_{name}_blob"), load(f"str_{name}_offsets"))
+        for name in STRING_FIELDS
+    }
+    rows = JobRows(strings, load("job_skill_offsets"), load("job_skill_ids"), skill_names)
+    return rows, skill_index, columns
+
+
+def prune_catalogs(keep: str, root=CATALOG_DIR):
+    """
+    Remove all but the newest exported versions (always keeping `keep`).
+    Workers that still map a removed version keep their pages until they
+    move on; unlinking does not invalidate a mapping.
+    """
+    root = Path(root)
+    if not root.exists():
+        return
+
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for path in versions[KEEP_VERSIONS:]:
+        if path.name != str(keep):
+            shutil.rmtree(path, ignore_errors=True)
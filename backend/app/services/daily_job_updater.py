@@ -1,23 +1,26 @@
-import pandas as pd
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime
 
-# ✅ CORRECT PATH
-JOBS_FILE = Path("datasets/jobs.csv")
+from app.config import ANN_MIN_JOBS
+from app.database.job_store import refresh_job_dates
+from app.ml_models.ann_index import sync_ann_index
+from app.ml_models.tfidf_model import sync_tfidf_index
+from app.services.job_catalog import reload_catalog
+from app.utils.metrics import span
 
+@span("job_date_update")
 def update_job_dates():
-    if not JOBS_FILE.exists():
-        print("❌ jobs.csv not found at:", JOBS_FILE.resolve())
-        return
+    # 🔁 Spread dates over the last 7 days (one UPDATE transaction in the store)
+    updated = refresh_job_dates(datetime.now().date())
+    print(f"✅ Job dates refreshed for {updated} jobs:", datetime.now())
 
-    df = pd.read_csv(JOBS_FILE)
+    # Swap in the refreshed catalog right away instead of waiting for the next check
+    catalog = reload_catalog()
 
-    # 🔁 Randomize dates in last 7 days
-    today = datetime.now().date()
-    df["date_posted"] = [
-        (today - timedelta(days=i % 7)).isoformat()
-        for i in range(len(df))
-    ]
+    # Index only the new postings; unchanged descriptions are kept as is
+    if catalog is not None:
+        sync_tfidf_index(catalog)
 
-    df.to_csv(JOBS_FILE, index=False)
-    print("✅ Job dates refreshed:", datetime.now())
+        # Large catalogs: embed the new postings and apply inserts /
+        # deletes to the ANN index here, off the request path
+        if len(catalog) >= ANN_MIN_JOBS:
+            sync_ann_index(catalog)
@@ -0,0 +1,188 @@
+"""
+Where request work runs. Route handlers are all `async def` and only
+coordinate; anything that takes real CPU time goes to one of three
+bounded executors ("lanes"):
+
+    cpu        worker processes for CPU-bound, picklable work that would
+               otherwise hold the GIL (extraction, PDF render, scoring
+               batches)
+    compute    a few threads for work that needs in-process state such
+               as the job catalog (matching, search, single ATS scores)
+    inference  dedicated threads for model calls (the rewriter batcher,
+               query embeddings), so slow generations never starve the
+               other lanes
+
+Each lane runs at most `concurrency` calls at once and lets up to
+`max_queue` more wait (at most `queue_timeout` seconds). Past that it
+raises ExecutorSaturated, which the app answers with 503 + Retry-After
+instead of letting latency grow without bound.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from app.config import (
+    CPU_POOL_SIZE,
+    CPU_QUEUE_LIMIT,
+    EXECUTOR_QUEUE_TIMEOUT,
+    INFERENCE_QUEUE_LIMIT,
+    INFERENCE_THREADS,
+    THREAD_POOL_SIZE,
+    THREAD_QUEUE_LIMIT,
+)
+
+
+class ExecutorSaturated(Exception):
+    """
+    Raised when a lane's queue is full (or waiting took too long)
+    """
+
+    def __init__(self, lane: str, retry_after: int = 1):
+        super().__init__(f"Server busy ({lane} executor saturated), retry shortly")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+    def __init__(self, name: str, make_executor, concurrency: int, max_queue: int,
+                 queue_timeout: float = EXECUTOR_QUEUE_TIMEOUT):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._make_executor = make_executor
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._semaphore = None
+        self._loop = None
+
+        self.active = 0
+        self.waiting = 0
+        self.counters = {"completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = self._make_executor(self.concurrency)
+        return self._executor
+
+    def _get_semaphore(self):
+        # One semaphore per event loop (tests and tools may run several)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def saturated(self) -> bool:
+        return self.active >= self.concurrency and self.waiting >= self.max_queue
+
+    def admit(self):
+        """
+        Fail fast if the lane is full, for work that then uses the
+        executor directly (streamed batches that bound themselves)
+        """
+        if self.saturated():
+            self.counters["rejected"] += 1
+            raise ExecutorSaturated(self.name)
+
+    @asynccontextmanager
+    async def slot(self):
+        self.admit()
+        semaphore = self._get_semaphore()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            raise ExecutorSaturated(self.name)
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) in this lane's executor, waiting for a
+        free slot first. Process lanes need a picklable top-level fn.
+        """
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+            except Exception:
+                self.counters["failed"] += 1
+                raise
+            self.counters["completed"] += 1
+            return result
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            **self.counters,
+        }
+
+
+cpu = Lane(
+    "cpu", lambda n: ProcessPoolExecutor(max_workers=n),
+    CPU_POOL_SIZE, CPU_QUEUE_LIMIT,
+)
+compute = Lane(
+    "compute", lambda n: ThreadPoolExecutor(max_workers=n, thread_name_prefix="compute"),
+    THREAD_POOL_SIZE, THREAD_QUEUE_LIMIT,
+)
+inference = Lane(
+    "inference", lambda n: ThreadPoolExecutor(max_workers=n, thread_name_prefix="inference"),
+    INFERENCE_THREADS, INFERENCE_QUEUE_LIMIT,
+)
+
+LANES = (cpu, compute, inference)
+
+
+def get_process_pool():
+    """
+    The cpu lane's worker processes, for callers that schedule their own
+    bounded batches (see run_batch / stream_pdf_zip)
+    """
+    return cpu.executor
+
+
+async def run_in_process(fn, *args, **kwargs):
+    return await cpu.run(fn, *args, **kwargs)
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    return await compute.run(fn, *args, **kwargs)
+
+
+async def run_inference(fn, *args, **kwargs):
+    return await inference.run(fn, *args, **kwargs)
+
+
+def executor_stats():
+    return {lane.name: lane.stats() for lane in LANES}
+
+
+def shutdown_executors():
+    for lane in LANES:
+        lane.shutdown()
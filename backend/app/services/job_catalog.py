@@ -0,0 +1,201 @@
+import threading
+import time
+
+from app.config import SHARED_CATALOG
+from app.database.job_store import catalog_version, read_jobs
+from app.database.jobs_data import preprocess_jobs
+from app.services.catalog_files import CATALOG_DIR, export_catalog, open_catalog, prune_catalogs
+from app.services.job_columns import JobColumns
+from app.services.skill_index import SkillIndex
+from app.utils.file_lock import file_lock
+from app.utils.metrics import span
+from app.utils.response_cache import response_cache
+from app.utils.skill_matcher import normalize_skills
+
+# Seconds between cheap version checks of the job store
+CHECK_INTERVAL = 5.0
+
+
+class CatalogSnapshot:
+    """
+    Immutable, fully preprocessed view of the job catalog.
+    A new snapshot is built off to the side and swapped in whole,
+    so readers never see a partially loaded catalog.
+    """
+
+    __slots__ = ("version", "jobs", "skill_index", "columns", "loaded_at", "fingerprint")
+
+    def __init__(self, version: str, jobs: tuple, fingerprint=None):
+        self.version = version
+        self.jobs = jobs
+        self.skill_index = SkillIndex(job["skills"] for job in jobs)
+        self.columns = JobColumns(jobs, self.skill_index)
+        self.loaded_at = time.time()
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_parts(cls, version: str, jobs, skill_index, columns, fingerprint=None):
+        """
+        Snapshot over already built parts, e.g. memory-mapped catalog files
+        """
+        snapshot = cls.__new__(cls)
+        snapshot.version = version
+        snapshot.jobs = jobs
+        snapshot.skill_index = skill_index
+        snapshot.columns = columns
+        snapshot.loaded_at = time.time()
+        snapshot.fingerprint = fingerprint
+        return snapshot
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def column(self, name: str) -> list:
+        """
+        One field of every job, in job id order
+        """
+        if hasattr(self.jobs, "column"):
+            return self.jobs.column(name)
+        return [job[name] for job in self.jobs]
+
+
+_snapshot = None
+_last_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def _build_jobs(df) -> tuple:
+    jobs = []
+    for job_id, row in enumerate(df.to_dict("records")):
+        title = str(row.get("title", ""))
+        skills = tuple(normalize_skills(row["skills"]))
+
+        jobs.append({
+            "id": job_id,
+            "title": title,
+            "description": str(row.get("description", "")),
+            "clean_description": row["clean_description"],
+            "skills": skills,
+            "skill_set": frozenset(skills),
+            "market_demand": str(row.get("market_demand", "")),
+            "date_posted": str(row.get("date_posted", "")),
+            "job_type": "INTERNSHIP" if "intern" in title.lower() else "FRESHER",
+        })
+
+    return tuple(jobs)
+
+
+def snapshot_from_frame(df, version: str, fingerprint=None) -> CatalogSnapshot:
+    """
+    Snapshot from a raw jobs DataFrame (e.g. pd.read_csv of a jobs
+    file), for benchmarks and offline tools
+    """
+    with span("catalog_build"):
+        return CatalogSnapshot(version, _build_jobs(preprocess_jobs(df)), fingerprint)
+
+
+def _build_snapshot(path=None):
+    # Version and rows come from the same read transaction, so the
+    # version always matches the data
+    version, df = read_jobs(path)
+    return snapshot_from_frame(df, version, fingerprint=version)
+
+
+def _open_shared(version: str):
+    parts = open_catalog(version)
+    if parts is None:
+        return None
+    return CatalogSnapshot.from_parts(version, *parts, fingerprint=version)
+
+
+def _load_shared_snapshot(path=None):
+    """
+    Map the files for the current store version, building them first if
+    no worker has yet. The build lock means one process preprocesses a
+    new version while the others wait and then map its result.
+    """
+    snapshot = _open_shared(catalog_version(path))
+    if snapshot is not None:
+        return snapshot
+
+    CATALOG_DIR.mkdir(parents=True, exist_ok=True)
+    with file_lock(CATALOG_DIR / ".build.lock"):
+        # Someone else may have built it while we waited
+        snapshot = _open_shared(catalog_version(path))
+        if snapshot is not None:
+            return snapshot
+
+        built = _build_snapshot(path)
+        export_catalog(built)
+        prune_catalogs(keep=built.version)
+        print(f"💾 Job catalog v{built.version} exported for shared use")
+
+    # Serve from the mapping too, so this process does not keep a
+    # private copy of what every other worker shares
+    return _open_shared(built.version) or built
+
+
+def _load_snapshot(path=None):
+    if SHARED_CATALOG:
+        return _load_shared_snapshot(path)
+    return _build_snapshot(path)
+
+
+def reload_catalog(path=None):
+    """
+    Rebuild the catalog from the job store and swap it in atomically.
+    Keeps serving the previous snapshot if the store cannot be read.
+    """
+    global _snapshot, _last_check
+
+    with _reload_lock:
+        _last_check = time.monotonic()
+        try:
+            snapshot = _load_snapshot(path)
+        except Exception as exc:
+            print("⚠️ Job catalog reload failed, keeping current version:", exc)
+            return _snapshot
+
+        if snapshot is not None:
+            if _snapshot is None or snapshot.version != _snapshot.version:
+                print(f"📚 Job catalog loaded: {len(snapshot)} jobs (v{snapshot.version})")
+                # Cached job responses are keyed by version; free the old ones
+                response_cache.invalidate("catalog")
+            _snapshot = snapshot
+
+        return _snapshot
+
+
+def _reload_in_background(path):
+    # Another thread is already reloading; let it finish
+    if _reload_lock.locked():
+        return
+
+    threading.Thread(
+        target=reload_catalog,
+        args=(path,),
+        name="job-catalog-reload",
+        daemon=True,
+    ).start()
+
+
+def get_catalog(path=None):
+    """
+    Return the current catalog snapshot.
+    Only the very first call loads synchronously; afterwards a new store
+    version is picked up by a background reload while requests keep using
+    the snapshot they already have.
+    """
+    global _last_check
+
+    snapshot = _snapshot
+    if snapshot is None:
+        return reload_catalog(path)
+
+    now = time.monotonic()
+    if now - _last_check >= CHECK_INTERVAL:
+        _last_check = now
+        if catalog_version(path) != snapshot.fingerprint:
+            _reload_in_background(path)
+
+    return snapshot
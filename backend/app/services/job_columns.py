@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.skill_matcher import tokenize
+
+# Jobs scanned per step while collecting a page in date order
+SCAN_CHUNK = 65536
+
+# Up to this many matching titles are OR-ed by comparison instead of a gather
+TITLE_COMPARE_MAX = 8
+
+# Skill columns per job in the facet matrix (the rest go to an overflow list)
+SKILL_SLOTS = 12
+
+# date_posted values that don't parse sort after every real date
+NO_DATE = np.iinfo(np.int32).min
+
+
+class CategoricalColumn:
+    """
+    Low-cardinality string column stored as small integer codes, plus
+    one boolean bitmap per value so filters are a single lookup and
+    facet counts are count_nonzero over an AND.
+    """
+
+    def __init__(self, values):
+        labels, codes = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+        self.labels = [str(label) for label in labels]
+        self.codes = codes.astype(np.int32)
+        self.bitmaps = {label: self.codes == i for i, label in enumerate(self.labels)}
+
+    def mask(self, wanted):
+        """
+        Jobs whose value is any of `wanted`, or None if nothing can match
+        """
+        bitmaps = [self.bitmaps[value] for value in wanted if value in self.bitmaps]
+        if not bitmaps:
+            return None
+        if len(bitmaps) == 1:
+            return bitmaps[0]
+        return np.logical_or.reduce(bitmaps)
+
+    def to_arrays(self, prefix: str) -> dict:
+        bitmaps = [self.bitmaps[label] for label in self.labels]
+        return {
+            f"{prefix}_codes": self.codes,
+            f"{prefix}_bitmaps": np.stack(bitmaps) if bitmaps else np.zeros((0, len(self.codes)), dtype=bool),
+        }
+
+    @classmethod
+    def from_arrays(cls, labels, codes, bitmaps):
+        column = cls.__new__(cls)
+        column.labels = list(labels)
+        column.codes = codes
+        column.bitmaps = {label: bitmaps[i] for i, label in enumerate(column.labels)}
+        return column
+
+    def counts(self, mask=None) -> dict:
+        if mask is None:
+            return {label: int(np.count_nonzero(bm)) for label, bm in self.bitmaps.items()}
+        return {
+            label: int(np.count_nonzero(np.logical_and(bm, mask)))
+            for label, bm in self.bitmaps.items()
+        }
+
+
+class JobColumns:
+    """
+    Columnar view of a catalog snapshot for filtering and faceting:
+    categorical codes/bitmaps for job_type and market_demand, posting
+    dates as int32 days, a title-token index over distinct titles and a
+    padded job -> skill matrix built from the skill index postings. Every filter
+    is a vectorized boolean mask; no per-row Python at query time.
+    """
+
+    def __init__(self, jobs, skill_index):
+        n = self.n_jobs = len(jobs)
+
+        self.job_type = CategoricalColumn([job["job_type"] for job in jobs])
+        self.market_demand = CategoricalColumn([job["market_demand"].lower() for job in jobs])
+
+        parsed = pd.to_datetime(
+            pd.Series([job["date_posted"] for job in jobs], dtype=object),
+            errors="coerce", format="%Y-%m-%d",
+        )
+        days = np.full(n, NO_DATE, dtype=np.int32)
+        valid = parsed.notna().to_numpy()
+        days[valid] = parsed[valid].to_numpy().astype("datetime64[D]").astype(np.int32)
+        self.date_days = days
+        # Newest first, ties by job id, computed once per snapshot
+        self.date_order = np.lexsort((np.arange(n), -days.astype(np.int64))).astype(np.int32)
+
+        # Titles repeat a lot: index tokens of the distinct titles only
+        titles, title_codes = np.unique(
+            np.array([job["title"].lower() for job in jobs], dtype=object).astype(str),
+            return_inverse=True,
+        )
+        self.title_codes = title_codes.astype(np.int32)
+        self.n_titles = len(titles)
+        token_titles = {}
+        for code, title in enumerate(titles):
+            for token in set(tokenize(title)):
+                token_titles.setdefault(token, []).append(code)
+        self.title_tokens = {
+            token: np.asarray(codes, dtype=np.int32) for token, codes in token_titles.items()
+        }
+
+        # Skills: reuse the inverted index, and derive the job -> skill CSR
+        self.skill_index = skill_index
+        self.skill_names = [None] * len(skill_index.skill_ids)
+        for skill, skill_id in skill_index.skill_ids.items():
+            self.skill_names[skill_id] = skill
+
+        postings = skill_index.postings
+        n_skills = len(postings)
+        lengths = np.array([len(p) for p in postings], dtype=np.int64)
+        entry_jobs = np.concatenate(postings) if postings else np.empty(0, dtype=np.int32)
+        entry_skills = np.repeat(np.arange(n_skills, dtype=np.int32), lengths)
+        self.skill_totals = np.bincount(entry_skills, minlength=n_skills)
+
+        # Job -> skills as a fixed-width matrix padded with n_skills, so a
+        # boolean row selection plus one bincount gives facet counts.
+        # Jobs with more than SKILL_SLOTS skills keep the rest in a small
+        # overflow list.
+        order = np.argsort(entry_jobs, kind="stable")
+        entry_jobs, entry_skills = entry_jobs[order], entry_skills[order]
+        per_job = np.bincount(entry_jobs, minlength=n)
+        starts = np.cumsum(per_job) - per_job
+        slot = np.arange(len(entry_jobs)) - np.repeat(starts, per_job)
+
+        dtype = np.int16 if n_skills < np.iinfo(np.int16).max else np.int32
+        width = int(min(SKILL_SLOTS, per_job.max(initial=0)))
+        self.skill_slots = np.full((n, width), n_skills, dtype=dtype)
+        fits = slot < width
+        self.skill_slots[entry_jobs[fits], slot[fits]] = entry_skills[fits]
+        self.overflow_jobs = entry_jobs[~fits]
+        self.overflow_skills = entry_skills[~fits]
+
+    # ---------------- Shared files ----------------
+    def to_arrays(self):
+        """
+        (arrays, meta): every array this view needs, plus the small
+        JSON-able rest, so another process can map it from disk
+        """
+        tokens = list(self.title_tokens)
+        lengths = np.array([len(self.title_tokens[t]) for t in tokens], dtype=np.int64)
+        arrays = {
+            "date_days": self.date_days,
+            "date_order": self.date_order,
+            "title_codes": self.title_codes,
+            "title_token_offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            "title_token_codes": (
+                np.concatenate([self.title_tokens[t] for t in tokens]) if tokens else np.empty(0, dtype=np.int32)
+            ).astype(np.int32),
+            "skill_slots": self.skill_slots,
+            "overflow_jobs": self.overflow_jobs,
+            "overflow_skills": self.overflow_skills,
+            "skill_totals": self.skill_totals,
+            **self.job_type.to_arrays("job_type"),
+            **self.market_demand.to_arrays("market_demand"),
+        }
+        meta = {
+            "n_jobs": self.n_jobs,
+            "n_titles": self.n_titles,
+            "title_tokens": tokens,
+            "job_type_labels": self.job_type.labels,
+            "market_demand_labels": self.market_demand.labels,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, meta: dict, skill_index):
+        columns = cls.__new__(cls)
+        columns.n_jobs = meta["n_jobs"]
+        columns.n_titles = meta["n_titles"]
+        columns.job_type = CategoricalColumn.from_arrays(
+            meta["job_type_labels"], arrays["job_type_codes"], arrays["job_type_bitmaps"]
+        )
+        columns.market_demand = CategoricalColumn.from_arrays(
+            meta["market_demand_labels"], arrays["market_demand_codes"], arrays["market_demand_bitmaps"]
+        )
+
+        columns.date_days = arrays["date_days"]
+        columns.date_order = arrays["date_order"]
+        columns.title_codes = arrays["title_codes"]
+        bounds = arrays["title_token_offsets"].tolist()
+        codes = arrays["title_token_codes"]
+        columns.title_tokens = {
+            token: codes[bounds[i]:bounds[i + 1]] for i, token in enumerate(meta["title_tokens"])
+        }
+
+        columns.skill_index = skill_index
+        columns.skill_names = list(skill_index.skill_ids)
+        for name in ("skill_slots", "overflow_jobs", "overflow_skills", "skill_totals"):
+            setattr(columns, name, arrays[name])
+        return columns
+
+    # ---------------- Filters ----------------
+    def title_mask(self, query: str):
+        """
+        Jobs whose title contains every token of `query`
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return None
+
+        hit = np.ones(self.n_titles, dtype=bool)
+        for token in tokens:
+            codes = self.title_tokens.get(token)
+            if codes is None:
+                return np.zeros(self.n_jobs, dtype=bool)
+            has = np.zeros(self.n_titles, dtype=bool)
+            has[codes] = True
+            hit &= has
+
+        matched = np.flatnonzero(hit)
+        # A few distinct titles: comparing codes beats a random-access gather
+        if len(matched) <= TITLE_COMPARE_MAX:
+            mask = np.zeros(self.n_jobs, dtype=bool)
+            for code in matched:
+                mask |= self.title_codes == code
+            return mask
+        return hit[self.title_codes]
+
+    def skills_mask(self, skills):
+        """
+        Jobs listing every one of `skills`
+        """
+        mask = None
+        for skill in skills:
+            skill_id = self.skill_index.skill_ids.get(skill)
+            if skill_id is None:
+                return np.zeros(self.n_jobs, dtype=bool)
+            has = np.zeros(self.n_jobs, dtype=bool)
+            has[self.skill_index.postings[skill_id]] = True
+            mask = has if mask is None else np.logical_and(mask, has, out=mask)
+        return mask
+
+    def date_mask(self, date_from=None, date_to=None):
+        if date_from is None and date_to is None:
+            return None
+
+        low = NO_DATE + 1 if date_from is None else int(np.datetime64(date_from, "D").astype(np.int64))
+        high = np.iinfo(np.int32).max if date_to is None else int(np.datetime64(date_to, "D").astype(np.int64))
+        if high < low:
+            return np.zeros(self.n_jobs, dtype=bool)
+
+        # One unsigned (wrapping) comparison checks both bounds
+        shifted = self.date_days.view(np.uint32) - np.uint32(low % 2**32)
+        return shifted <= np.uint32(high - low)
+
+    # ---------------- Results ----------------
+    def newest(self, mask, limit: int, offset: int = 0):
+        """
+        Ids of the matching jobs on the requested page, newest first.
+        Walks the precomputed date order in chunks and stops as soon as
+        the page is full.
+        """
+        end = offset + limit
+        if mask is None:
+            return self.date_order[offset:end]
+
+        found = []
+        n_found = 0
+        for start in range(0, self.n_jobs, SCAN_CHUNK):
+            chunk = self.date_order[start:start + SCAN_CHUNK]
+            hits = chunk[mask[chunk]]
+            found.append(hits)
+            n_found += len(hits)
+            if n_found >= end:
+                break
+
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate(found)[offset:end]
+
+    def top_skills(self, mask, n: int):
+        """
+        [(skill, count)] of the `n` most frequent skills among matches.
+        Counts the smaller side: the matched jobs, or the rest
+        subtracted from the precomputed totals.
+        """
+        if n <= 0 or not len(self.skill_totals):
+            return []
+
+        if mask is None:
+            counts = self.skill_totals
+        elif np.count_nonzero(mask) * 2 <= self.n_jobs:
+            counts = self._skill_counts(mask)
+        else:
+            counts = self.skill_totals - self._skill_counts(~mask)
+
+        n = min(n, int(np.count_nonzero(counts)))
+        if n == 0:
+            return []
+        best = np.argpartition(-counts, n - 1)[:n]
+        best = best[np.lexsort((best, -counts[best]))]
+        return [(self.skill_names[i], int(counts[i])) for i in best]
+
+    def _skill_counts(self, mask):
+        n_skills = len(self.skill_totals)
+        rows = np.compress(mask, self.skill_slots, axis=0)
+        counts = np.bincount(rows.ravel(), minlength=n_skills + 1)[:n_skills]
+        if len(self.overflow_jobs):
+            counts += np.bincount(
+                self.overflow_skills[mask[self.overflow_jobs]], minlength=n_skills
+            )
+        return counts
@@ -1,8 +1,25 @@
-import pandas as pd
-from pathlib import Path
 from urllib.parse import quote_plus
 
-JOBS_FILE = Path("datasets/jobs.csv")
+import numpy as np
+
+from app.config import ANN_CANDIDATES
+from app.ml_models.ann_index import get_ann_index
+from app.ml_models.embeddings import encode_texts
+from app.ml_models.job_embeddings import get_job_matrix
+from app.ml_models.similarity import cosine_scores, normalize_rows
+from app.ml_models.tfidf_model import get_tfidf_index
+from app.services.job_catalog import get_catalog
+from app.utils.preprocessing import clean_text
+from app.utils.skill_matcher import normalize_skills
+from app.services.skill_index import top_k
+from app.utils.metrics import span
+
+# Signal weights per ranking mode (every signal is on a 0-100 scale)
+RANKING_WEIGHTS = {
+    "skills": {"skill": 1.0},
+    "lexical": {"skill": 0.7, "lexical": 0.3},
+    "hybrid": {"skill": 0.5, "semantic": 0.3, "lexical": 0.2},
+}
 
 # 🔗 Role → Search keyword mapping
 ROLE_KEYWORDS = {
@@ -48,31 +65,46 @@ def build_links(title: str, job_type: str):
     return linkedin, naukri
 
 
-def recommend_jobs(resume_text: str, resume_skills: list, experience: int):
-    if not JOBS_FILE.exists():
-        print("❌ jobs.csv not found:", JOBS_FILE.resolve())
+@span("job_matching")
+def recommend_jobs(
+    resume_text: str,
+    resume_skills: list,
+    experience: int,
+    limit: int = 20,
+    offset: int = 0,
+    ranking: str = "skills",
+    catalog=None,
+):
+    if catalog is None:
+        catalog = get_catalog()
+    if catalog is None:
         return []
 
-    df = pd.read_csv(JOBS_FILE)
+    resume_skills = set(normalize_skills(resume_skills))
 
-    resume_skills = set(s.lower() for s in resume_skills)
-    recommendations = []
+    # Only jobs sharing at least one skill are ever scored
+    job_ids, matched = catalog.skill_index.match_counts(resume_skills)
+    scores = np.minimum(100, matched * 20)
 
-    for _, row in df.iterrows():
-        job_skills = set(
-            skill.strip().lower()
-            for skill in str(row["skills"]).split(",")
-        )
+    weights = RANKING_WEIGHTS.get(ranking, RANKING_WEIGHTS["skills"])
+    if len(weights) > 1 and resume_text.strip():
+        signals = {"skill": (job_ids, scores)}
 
-        matched_skills = resume_skills & job_skills
-        if not matched_skills:
-            continue
+        if "lexical" in weights:
+            signals["lexical"] = lexical_scores(catalog, resume_text)
 
-        title = row["title"]
-        is_intern = "intern" in title.lower()
-        job_type = "INTERNSHIP" if is_intern else "FRESHER"
+        if "semantic" in weights:
+            semantic = semantic_scores(catalog, resume_text)
+            if semantic is not None:
+                signals["semantic"] = semantic
 
-        score = min(100, len(matched_skills) * 20)
+        job_ids, scores = blend_scores(len(catalog), signals, weights)
+
+    recommendations = []
+    for pos in top_k(scores, limit, offset):
+        job = catalog.jobs[job_ids[pos]]
+        title = job["title"]
+        job_type = job["job_type"]
 
         linkedin, naukri = build_links(title, job_type)
 
@@ -80,14 +112,71 @@ def recommend_jobs(resume_text: str, resume_skills: list, experience: int):
             "title": title,
             "job_type": job_type,
             "experience_level": "0-2 years",
-            "skills": list(job_skills),
-            "final_score": score,
+            "skills": list(job["skills"]),
+            "final_score": round(float(scores[pos]), 1),
             "linkedin_link": linkedin,
             "naukri_link": naukri,
         })
 
-    return sorted(
-        recommendations,
-        key=lambda x: x["final_score"],
-        reverse=True
-    )
+    return recommendations
+
+
+@span("semantic_scores")
+def semantic_scores(catalog, resume_text: str):
+    """
+    Cosine similarity (0-100) of the resume against the job descriptions
+    as a (job_ids, scores) signal, or None while the job embedding matrix
+    is still being built. Large catalogs only score the ANN_CANDIDATES
+    nearest jobs from the ANN index; the rest score every job.
+    """
+    matrix = get_job_matrix(catalog)
+    if matrix is None:
+        return None
+
+    query = encode_texts([resume_text])
+    ann = get_ann_index(catalog)
+    if ann is not None:
+        job_ids, scores = ann.search(normalize_rows(query)[0], ANN_CANDIDATES)
+        return job_ids, np.clip(scores, 0, 1) * 100
+
+    return None, np.clip(cosine_scores(query, matrix), 0, 1) * 100
+
+
+def semantic_mode(catalog) -> str:
+    """
+    How semantic scores are computed right now ("pending", "exact" or
+    "ann"); hybrid results differ between them
+    """
+    if get_job_matrix(catalog) is None:
+        return "pending"
+    return "ann" if get_ann_index(catalog) is not None else "exact"
+
+
+@span("lexical_scores")
+def lexical_scores(catalog, resume_text: str):
+    """
+    Sparse TF-IDF cosine (0-100) for jobs sharing terms with the resume
+    """
+    job_ids, scores = get_tfidf_index(catalog).query(clean_text(resume_text))
+    return job_ids, scores * 100
+
+
+def blend_scores(n_jobs: int, signals: dict, weights: dict):
+    """
+    Weighted sum of the available signals over all jobs, keeping only
+    jobs with a positive score. Each signal is (job_ids, scores), with
+    job_ids None for a dense signal. Weights of missing signals are
+    spread over the others so scores stay on the same scale.
+    """
+    total = sum(weights[name] for name in signals)
+    final = np.zeros(n_jobs, dtype=np.float32)
+
+    for name, (ids, values) in signals.items():
+        weight = weights[name] / total
+        if ids is None:
+            final += weight * np.clip(values, 0, 100)
+        else:
+            final[ids] += weight * values
+
+    job_ids = np.flatnonzero(final > 0)
+    return job_ids, final[job_ids]
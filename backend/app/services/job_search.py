@@ -0,0 +1,95 @@
+import numpy as np
+
+from app.services.job_catalog import get_catalog
+from app.services.job_matcher import build_links
+from app.utils.metrics import span
+from app.utils.skill_matcher import normalize_skills
+
+
+def _combine(masks):
+    """
+    AND of the given masks (None means "no filter")
+    """
+    masks = [m for m in masks if m is not None]
+    if not masks:
+        return None
+    if len(masks) == 1:
+        return masks[0]
+    return np.logical_and.reduce(masks)
+
+
+@span("job_search")
+def search_jobs(
+    query: str = "",
+    job_type: list = None,
+    market_demand: list = None,
+    skills: list = None,
+    date_from=None,
+    date_to=None,
+    limit: int = 20,
+    offset: int = 0,
+    top_skills: int = 10,
+    catalog=None,
+):
+    """
+    Filtered job listing (newest first) with facet counts.
+    job_type / market_demand facets are counted with every filter except
+    their own, so the UI can show how many jobs each other choice has.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    if catalog is None:
+        return {"total": 0, "jobs": [], "facets": {}}
+
+    columns = catalog.columns
+    empty = np.zeros(columns.n_jobs, dtype=bool)
+
+    filters = {
+        "query": columns.title_mask(query or ""),
+        "skills": columns.skills_mask(normalize_skills(skills or [])),
+        "date": columns.date_mask(date_from, date_to),
+        "job_type": None,
+        "market_demand": None,
+    }
+    if job_type:
+        filters["job_type"] = columns.job_type.mask(job_type)
+        if filters["job_type"] is None:
+            filters["job_type"] = empty
+    if market_demand:
+        filters["market_demand"] = columns.market_demand.mask([d.lower() for d in market_demand])
+        if filters["market_demand"] is None:
+            filters["market_demand"] = empty
+
+    mask = _combine(filters.values())
+    total = columns.n_jobs if mask is None else int(np.count_nonzero(mask))
+
+    def others(name):
+        return _combine(m for key, m in filters.items() if key != name)
+
+    jobs = []
+    for job_id in columns.newest(mask, limit, offset):
+        job = catalog.jobs[job_id]
+        linkedin, naukri = build_links(job["title"], job["job_type"])
+        jobs.append({
+            "id": job["id"],
+            "title": job["title"],
+            "job_type": job["job_type"],
+            "market_demand": job["market_demand"],
+            "date_posted": job["date_posted"],
+            "skills": list(job["skills"]),
+            "linkedin_link": linkedin,
+            "naukri_link": naukri,
+        })
+
+    return {
+        "total": total,
+        "jobs": jobs,
+        "facets": {
+            "job_type": columns.job_type.counts(others("job_type")),
+            "market_demand": columns.market_demand.counts(others("market_demand")),
+            "skills": [
+                {"skill": skill, "count": count}
+                for skill, count in columns.top_skills(mask, top_skills)
+            ],
+        },
+    }
@@ -1,21 +1,302 @@
+"""
+Resume PDF rendering: a cached page template, section headings,
+word-wrapped paragraphs and bullets. render_resume_pdf is a plain
+top-level function so it can run in the process pool.
+"""
+import asyncio
+import io
+import json
+import os
+import time
+import zipfile
+from functools import lru_cache
+
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
-from io import BytesIO
 
-def generate_resume_pdf(text: str):
-    buffer = BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=A4)
+SECTION_NAMES = {
+    "summary", "profile", "objective", "education", "experience",
+    "work experience", "professional experience", "internships", "projects",
+    "skills", "technical skills", "certifications", "achievements",
+    "awards", "publications", "languages", "interests", "activities",
+}
+
+BULLET_PREFIXES = ("-", "•", "*", "·", "–", "▪")
+
+# Bytes per chunk when streaming a rendered PDF
+CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=None)
+def _template() -> dict:
+    """
+    Page geometry, fonts and derived metrics, computed once per process
+    """
+    # Compressed page streams are written as raw bytes instead of
+    # ASCII85 text (smaller files, no pure-Python encode pass)
+    rl_config.useA85 = 0
 
     width, height = A4
-    y = height - 40
+    margin = 50
+    body_size = 10
+    bullet = "•"
+    bullet_indent = stringWidth(bullet + " ", "Helvetica", body_size) + 4
+
+    return {
+        "width": width,
+        "height": height,
+        "margin": margin,
+        "text_width": width - 2 * margin,
+        "title": ("Helvetica-Bold", 16, 22),  # font, size, leading
+        "heading": ("Helvetica-Bold", 12, 18),
+        "body": ("Helvetica", body_size, 13),
+        "bullet": bullet,
+        "bullet_indent": bullet_indent,
+        "gap": 6,
+    }
+
+
+# ---------------- LAYOUT ----------------
+@lru_cache(maxsize=65536)
+def _word_width(word: str, font: str, size: float) -> float:
+    # Resume vocabulary repeats a lot; measure each word once per process
+    return stringWidth(word, font, size)
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float) -> list:
+    """
+    Greedy word wrap using cached word widths. A word wider than the
+    line is broken across lines by character.
+    """
+    space = _word_width(" ", font, size)
+    lines, current, width = [], [], 0.0
+
+    for word in text.split():
+        w = _word_width(word, font, size)
+        if w > max_width:
+            if current:
+                lines.append(" ".join(current))
+                current, width = [], 0.0
+            piece = ""
+            for char in word:
+                if stringWidth(piece + char, font, size) > max_width and piece:
+                    lines.append(piece)
+                    piece = ""
+                piece += char
+            current, width = [piece], stringWidth(piece, font, size)
+            continue
+
+        if current and width + space + w > max_width:
+            lines.append(" ".join(current))
+            current, width = [word], w
+        else:
+            width += (space if current else 0) + w
+            current.append(word)
+
+    if current:
+        lines.append(" ".join(current))
+    return lines or [""]
+
+
+def _is_heading(line: str) -> bool:
+    if len(line) > 40:
+        return False
+    name = line.rstrip(":").strip()
+    letters = [c for c in name if c.isalpha()]
+    return name.lower() in SECTION_NAMES or (len(letters) >= 3 and name.isupper())
+
+
+def _blocks(text: str):
+    """
+    (kind, text) per source line: title, heading, bullet, body or gap
+    """
+    title_seen = False
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line:
+            yield "gap", ""
+        elif not title_seen:
+            title_seen = True
+            yield "title", line
+        elif _is_heading(line):
+            yield "heading", line.rstrip(":")
+        elif line.startswith(BULLET_PREFIXES) and len(line) > 1:
+            yield "bullet", line.lstrip("".join(BULLET_PREFIXES)).strip()
+        else:
+            yield "body", line
+
+
+def layout_pages(text: str) -> list:
+    """
+    Wrap and paginate: a list of pages, each a list of
+    (font, size, x, y, text) draw operations
+    """
+    t = _template()
+    top, bottom = t["height"] - t["margin"], t["margin"]
+    pages, ops = [], []
+    y = top
+
+    def place(font, size, leading, x, lines, marker=None):
+        nonlocal y, ops
+        for i, line in enumerate(lines):
+            if y - leading < bottom:
+                pages.append(ops)
+                ops, y = [], top
+            y -= leading
+            if marker and i == 0:
+                ops.append((font, size, t["margin"], y, marker))
+            ops.append((font, size, x, y, line))
+
+    for kind, line in _blocks(text):
+        if kind == "gap":
+            y -= t["gap"]
+            continue
+
+        if kind == "bullet":
+            font, size, leading = t["body"]
+            x = t["margin"] + t["bullet_indent"]
+            wrapped = wrap_text(line, font, size, t["text_width"] - t["bullet_indent"])
+            # Hanging indent: the glyph sits in the margin of the first line
+            place(font, size, leading, x, wrapped, marker=t["bullet"])
+            continue
+
+        font, size, leading = t[kind] if kind in ("title", "heading") else t["body"]
+        if kind == "heading" and ops:
+            y -= t["gap"]
+        place(font, size, leading, t["margin"], wrap_text(line, font, size, t["text_width"]))
 
-    for line in text.split("\n"):
-        pdf.drawString(40, y, line[:100])
-        y -= 15
-        if y < 40:
-            pdf.showPage()
-            y = height - 40
+    if ops or not pages:
+        pages.append(ops)
+    return pages
+
+
+# ---------------- RENDERING ----------------
+def render_resume_pdf(text: str):
+    """
+    (pdf bytes, page count)
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+
+    pages = layout_pages(text)
+    for ops in pages:
+        # One text object per page; only font changes are re-emitted
+        text_obj = pdf.beginText()
+        current = None
+        for font, size, x, y, line in ops:
+            if (font, size) != current:
+                text_obj.setFont(font, size)
+                current = (font, size)
+            text_obj.setTextOrigin(x, y)
+            text_obj.textOut(line)
+        pdf.drawText(text_obj)
+        pdf.showPage()
 
     pdf.save()
+    return buffer.getvalue(), len(pages)
+
+
+def generate_resume_pdf(text: str):
+    buffer = io.BytesIO(render_resume_pdf(text)[0])
     buffer.seek(0)
     return buffer
+
+
+def iter_chunks(data: bytes, size: int = CHUNK_SIZE):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+# ---------------- BATCH (ZIP) ----------------
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only, unseekable sink that hands written bytes back in chunks,
+    so a zip can be streamed while it's being built
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def pdf_filename(name: str, index: int, used: set) -> str:
+    base = os.path.splitext(os.path.basename(name or ""))[0].strip() or f"resume_{index + 1}"
+    filename = f"{base}.pdf"
+    n = 2
+    while filename in used:
+        filename = f"{base}_{n}.pdf"
+        n += 1
+    used.add(filename)
+    return filename
+
+
+async def stream_pdf_zip(documents, pool, max_in_flight: int):
+    """
+    Render (name, text) documents in `pool` and yield a zip archive as
+    each PDF completes, ending with a summary.json of measured throughput
+    and any documents that failed to render. Renders not yet started are
+    cancelled if the client goes away mid-stream.
+    """
+    loop = asyncio.get_running_loop()
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)
+
+    started = time.perf_counter()
+    used, pending = set(), {}
+    documents = iter(enumerate(documents))
+    total_pages = files = 0
+    errors = []
+
+    def submit_next():
+        for index, (name, text) in documents:
+            future = loop.run_in_executor(pool, render_resume_pdf, text)
+            pending[future] = pdf_filename(name, index, used)
+            return True
+        return False
+
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                filename = pending.pop(future)
+                try:
+                    data, pages = future.result()
+                except Exception as e:
+                    print(f"❌ PDF render failed for {filename}: {e}")
+                    errors.append({"file": filename, "error": str(e)})
+                else:
+                    archive.writestr(filename, data)
+                    total_pages += pages
+                    files += 1
+                submit_next()
+            yield sink.take()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    elapsed = time.perf_counter() - started
+    archive.writestr("summary.json", json.dumps({
+        "files": files,
+        "pages": total_pages,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_sec": round(total_pages / elapsed, 1) if elapsed else None,
+        "errors": errors,
+    }, indent=2))
+    archive.close()
+    yield sink.take()
@@ -1,10 +1,7 @@
 import re
 
-SKILLS_DB = [
-    "python", "java", "sql", "machine learning", "deep learning",
-    "flask", "fastapi", "react", "node", "docker", "aws", "git",
-    "linux", "devops", "cloud"
-]
+from app.utils.metrics import span
+from app.utils.skill_matcher import get_skill_matcher
 
 def extract_experience(text: str) -> int:
     """
@@ -15,14 +12,14 @@ def extract_experience(text: str) -> int:
         return max(int(m[0]) for m in matches)
     return 0
 
+@span("resume_parse")
 def parse_resume(text: str):
-    text_lower = text.lower()
-
-    skills = [skill for skill in SKILLS_DB if skill in text_lower]
+    # One pass over the text against the whole skills taxonomy
+    skills = get_skill_matcher().extract(text)
     experience_years = extract_experience(text)
 
     return {
-        "skills": list(set(skills)),
+        "skills": skills,
         "experience": experience_years,
         "resume_text": text
     }
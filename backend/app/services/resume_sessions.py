@@ -0,0 +1,216 @@
+"""
+Server-side resume documents for editors that save line by line.
+
+A session keeps the resume as a list of lines, each with its cached rule
+features (app.services.ats_rules.CompiledRules.line_features), and the
+running DocumentStats over all of them. An edit replaces a range of
+lines: the old lines' features are subtracted, the new lines' added, and
+the score is re-evaluated from the aggregates, so the cost follows the
+size of the edit rather than the size of the resume.
+
+Sessions live in process memory (LRU + idle TTL). With several workers
+a PATCH may reach a worker that does not have the session; it gets a
+404 and the client starts a new session from its text.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.config import RESUME_SESSION_ITEMS, RESUME_SESSION_TTL
+from app.services.ats_rules import RULES, line_feedback_item
+
+# Recently seen line texts -> features, per session; undo/redo and
+# repeated lines skip the regex
+FEATURE_MEMO_ITEMS = 512
+
+
+class SessionNotFound(KeyError):
+    pass
+
+
+class VersionConflict(Exception):
+    def __init__(self, current: int):
+        super().__init__(f"Session is at version {current}")
+        self.current = current
+
+
+class EditError(ValueError):
+    pass
+
+
+class ResumeSession:
+    def __init__(self, text: str, skills: list, experience: int, rules=RULES):
+        self.id = uuid.uuid4().hex
+        self.rules = rules
+        self.skills = list(skills)
+        self.experience = experience
+        self.version = 0
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+        self._memo = OrderedDict()
+        self.stats = rules.new_stats()
+        self.lines = text.split("\n")
+        self.features = [self._line_features(line) for line in self.lines]
+        for features in self.features:
+            self.stats.add(features)
+        self.flagged = sum(1 for features in self.features if features["issues"])
+
+    def _line_features(self, line: str) -> dict:
+        features = self._memo.get(line)
+        if features is None:
+            features = self.rules.line_features(line)
+            self._memo[line] = features
+            if len(self._memo) > FEATURE_MEMO_ITEMS:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(line)
+        return features
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    # ---------------- Edits ----------------
+    def apply(self, edits: list) -> list:
+        """
+        Replace line ranges. Each edit is {"start", "end", "lines": [...]}
+        or {"start", "end", "after": "text"} (the hunks of an
+        /ats/apply-fixes patch), with `end` exclusive; start == end
+        inserts. All ranges refer to the document before this call and
+        must not overlap; an insert at the start of a replaced range goes
+        before the replacement, and inserts at the same line keep their
+        order. Returns the changed line numbers afterwards.
+        """
+        ranges = []
+        for edit in edits:
+            if not isinstance(edit, dict):
+                raise EditError("Each edit must be an object")
+            start, end = edit.get("start"), edit.get("end", edit.get("start"))
+            if not isinstance(start, int) or not isinstance(end, int) or not 0 <= start <= end <= len(self.lines):
+                raise EditError(f"Invalid line range {start}..{end} for {len(self.lines)} lines")
+            new = edit.get("lines")
+            if new is None:
+                new = str(edit.get("after", "")).split("\n")
+            elif not isinstance(new, list) or not all(isinstance(line, str) for line in new):
+                raise EditError("'lines' must be a list of strings")
+            ranges.append((start, end, new))
+
+        # Inserts sort before a range starting at the same line
+        ranges.sort(key=lambda r: (r[0], r[1]))
+        for (_, end, _), (start, _, _) in zip(ranges, ranges[1:]):
+            if start < end:
+                raise EditError("Edits overlap")
+
+        # Back to front, so earlier ranges keep their line numbers
+        for start, end, new in reversed(ranges):
+            for features in self.features[start:end]:
+                self.stats.remove(features)
+                self.flagged -= bool(features["issues"])
+
+            new_features = [self._line_features(line) for line in new]
+            for features in new_features:
+                self.stats.add(features)
+                self.flagged += bool(features["issues"])
+
+            self.lines[start:end] = new
+            self.features[start:end] = new_features
+
+        changed = []
+        shift = 0
+        for start, end, new in ranges:
+            changed.extend(range(start + shift, start + shift + len(new)))
+            shift += len(new) - (end - start)
+
+        self.version += 1
+        return changed
+
+    # ---------------- Results ----------------
+    def score(self):
+        return self.rules.evaluate(self.stats.features(), len(self.skills), self.experience)
+
+    def feedback(self, numbers=None) -> list:
+        numbers = range(len(self.lines)) if numbers is None else numbers
+        return [
+            line_feedback_item(self.lines[n], self.features[n]["issues"], n)
+            for n in numbers
+            if self.features[n]["issues"]
+        ]
+
+    def result(self, changed=None) -> dict:
+        """
+        Score, suggestions and line feedback. With `changed`, feedback
+        only covers those lines (what an edit needs to re-render)
+        """
+        score, suggestions = self.score()
+        result = {
+            "session_id": self.id,
+            "version": self.version,
+            "ats_score": score,
+            "suggestions": suggestions,
+            "line_count": len(self.lines),
+            "flagged_lines": self.flagged,
+        }
+        if changed is None:
+            result["line_feedback"] = self.feedback()
+        else:
+            result["changed_lines"] = changed
+            result["line_feedback"] = self.feedback(changed)
+        return result
+
+
+class SessionStore:
+    def __init__(self, max_items: int = RESUME_SESSION_ITEMS, ttl: float = RESUME_SESSION_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, text: str, skills: list, experience: int) -> dict:
+        session = ResumeSession(text, skills, experience)
+        with self._lock:
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_items:
+                self._sessions.popitem(last=False)
+        return session.result()
+
+    def get(self, session_id: str) -> ResumeSession:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or now - session.touched > self.ttl:
+                self._sessions.pop(session_id, None)
+                raise SessionNotFound(session_id)
+            self._sessions.move_to_end(session_id)
+            session.touched = now
+            return session
+
+    def edit(self, session_id: str, edits: list, base_version=None,
+             skills=None, experience=None) -> dict:
+        session = self.get(session_id)
+        with session.lock:
+            if base_version is not None and base_version != session.version:
+                raise VersionConflict(session.version)
+            if skills is not None:
+                session.skills = list(skills)
+            if experience is not None:
+                session.experience = experience
+            changed = session.apply(edits)
+            return session.result(changed)
+
+    def read(self, session_id: str) -> dict:
+        session = self.get(session_id)
+        with session.lock:
+            return {**session.result(), "resume_text": session.text}
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._sessions)}
+
+
+resume_sessions = SessionStore()
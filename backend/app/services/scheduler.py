@@ -1,5 +1,19 @@
+import os
+import threading
+import time
+from pathlib import Path
+
 from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.config import CACHE_DIR, LEADER_RETRY_SECONDS
 from app.services.daily_job_updater import update_job_dates
+from app.utils.file_lock import FileLock
+
+# Held for the life of the process that runs the scheduler
+LEADER_LOCK = Path(CACHE_DIR) / "scheduler.lock"
+
+_leader = FileLock(LEADER_LOCK)
+
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
@@ -18,3 +32,29 @@ def start_scheduler():
 
     scheduler.start()
     print("🕒 Job update scheduler started")
+
+
+def is_leader() -> bool:
+    return _leader.held
+
+
+def start_scheduler_when_leader():
+    """
+    With several worker processes only one may run scheduled refreshes.
+    Whoever takes the lock first becomes the leader; the others keep
+    retrying in the background and take over if the leader exits.
+    """
+    if _leader.acquire(blocking=False):
+        print(f"👑 Process {os.getpid()} is the scheduler leader")
+        start_scheduler()
+        return
+
+    def wait_for_leadership():
+        while True:
+            time.sleep(LEADER_RETRY_SECONDS)
+            if _leader.acquire(blocking=False):
+                print(f"👑 Process {os.getpid()} took over as scheduler leader")
+                start_scheduler()
+                return
+
+    threading.Thread(target=wait_for_leadership, name="scheduler-leader", daemon=True).start()
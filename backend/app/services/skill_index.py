@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class SkillIndex:
+    """
+    Inverted index from normalized skill -> ids of the jobs that list it.
+    Skills are interned to small integers and each posting list is a
+    sorted int32 array, so a query only touches jobs sharing a skill.
+    """
+
+    def __init__(self, job_skills):
+        self.skill_ids = {}
+        postings = []
+        n_jobs = 0
+
+        for job_id, skills in enumerate(job_skills):
+            n_jobs += 1
+            for skill in skills:
+                skill_id = self.skill_ids.get(skill)
+                if skill_id is None:
+                    skill_id = self.skill_ids[skill] = len(postings)
+                    postings.append([])
+                postings[skill_id].append(job_id)
+
+        self.n_jobs = n_jobs
+        self.postings = [np.asarray(p, dtype=np.int32) for p in postings]
+
+    def __len__(self):
+        return len(self.skill_ids)
+
+    def match_counts(self, skills):
+        """
+        Return (job_ids, matched_skill_counts) for every job that shares
+        at least one of the given skills
+        """
+        lists = [
+            self.postings[self.skill_ids[skill]]
+            for skill in set(skills)
+            if skill in self.skill_ids
+        ]
+
+        if not lists:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty
+
+        if len(lists) == 1:
+            return lists[0], np.ones(len(lists[0]), dtype=np.int32)
+
+        job_ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        return job_ids, counts.astype(np.int32)
+
+    # ---------------- Shared files ----------------
+    def to_arrays(self) -> dict:
+        lengths = np.array([len(p) for p in self.postings], dtype=np.int64)
+        return {
+            "posting_offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            "posting_jobs": (
+                np.concatenate(self.postings) if self.postings else np.empty(0, dtype=np.int32)
+            ).astype(np.int32),
+        }
+
+    @classmethod
+    def from_arrays(cls, skill_names, n_jobs: int, posting_offsets, posting_jobs):
+        """
+        Index over existing (e.g. memory-mapped) posting arrays; each
+        posting list is a view, nothing is copied
+        """
+        index = cls.__new__(cls)
+        index.skill_ids = {skill: i for i, skill in enumerate(skill_names)}
+        index.n_jobs = n_jobs
+        bounds = posting_offsets.tolist()
+        index.postings = [posting_jobs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        return index
+
+
+def top_k(scores, k: int, offset: int = 0):
+    """
+    Positions of the best `k` entries after skipping `offset`, ordered by
+    score (high first) then position, i.e. the same page a stable sort
+    would return. `scores` must be aligned with ascending job ids.
+    Uses a partial selection so only the requested page is ever sorted.
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    end = min(offset + k, n)
+    if end <= offset:
+        return np.empty(0, dtype=np.intp)
+
+    if end < n:
+        threshold = np.partition(scores, n - end)[n - end]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[: end - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(n)
+
+    ordered = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return ordered[offset:end]
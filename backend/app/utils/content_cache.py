@@ -0,0 +1,272 @@
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.config import CACHE_DIR, CONTENT_CACHE_DISK_MB, CONTENT_CACHE_ITEMS
+
+# Every cache created in this process, for stats reporting
+_caches = []
+
+# Disk hits are recorded in memory and written back in one UPDATE per
+# this many hits (or with the next write), not one transaction per read
+TOUCH_BATCH = 64
+
+# Other workers write the same file, so the local size estimate is
+# re-read from the database this often (in writes) and before evicting
+SIZE_SYNC_EVERY = 32
+
+# Disk values are tagged text or np.save bytes; nothing is unpickled
+# from a file other processes write
+_TEXT, _ARRAY = b"s", b"n"
+
+
+def _encode(value):
+    """
+    Disk form of a cached value, or None for types kept in memory only
+    """
+    if isinstance(value, str):
+        return _TEXT + value.encode("utf-8")
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return _ARRAY + buffer.getvalue()
+    return None
+
+
+def _decode(blob: bytes):
+    # Rows in any other format (e.g. written by an older version) are misses
+    blob = bytes(blob)
+    if blob[:1] == _TEXT:
+        return blob[1:].decode("utf-8")
+    if blob[:1] == _ARRAY:
+        return np.load(io.BytesIO(blob[1:]), allow_pickle=False)
+    return None
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def content_key(text: str, *parts) -> str:
+    """
+    Hash of the normalized text plus whatever else determines the
+    output (model name, prompt version, ...)
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode())
+        h.update(b"\0")
+    h.update(normalize_text(text).encode())
+    return h.hexdigest()
+
+
+class ContentCache:
+    """
+    Two-tier content-addressed cache: an in-process LRU in front of an
+    optional SQLite file (str and ndarray values only) whose total payload
+    size is bounded by evicting the least recently used rows. The file is
+    shared by every worker; when it is busy or broken the cache keeps
+    working from memory.
+    """
+
+    def __init__(self, namespace: str, max_items: int = CONTENT_CACHE_ITEMS,
+                 max_disk_bytes: int = CONTENT_CACHE_DISK_MB * 1024 * 1024,
+                 directory: str = CACHE_DIR):
+        self.namespace = namespace
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self._directory = directory
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_bytes = 0
+        self._touched = {}
+        self._writes = 0
+
+        self.counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+
+        _caches.append(self)
+
+    def _disk(self):
+        """
+        SQLite tier, opened on first use so importing a module that
+        declares a cache doesn't touch the filesystem
+        """
+        if self._db is None and self.max_disk_bytes > 0:
+            os.makedirs(self._directory, exist_ok=True)
+            db = sqlite3.connect(
+                os.path.join(self._directory, f"{self.namespace}.sqlite"),
+                check_same_thread=False,
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries(accessed)")
+            db.commit()
+            self._db = db
+            self._sync_size()
+        return self._db
+
+    def _sync_size(self):
+        self._disk_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _disk_error(self, action: str, exc: Exception):
+        # A locked or damaged file only costs the disk tier, never the caller
+        self.counters["disk_errors"] += 1
+        print(f"⚠️ {self.namespace} cache: disk {action} failed: {exc}")
+        if self._db is not None and self._db.in_transaction:
+            try:
+                self._db.rollback()
+            except sqlite3.Error:
+                pass
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["hits"] += 1
+                return self._memory[key]
+
+            try:
+                value = self._disk_get(key)
+            except (sqlite3.Error, OSError, ValueError) as e:
+                self._disk_error("read", e)
+                value = None
+
+            if value is not None:
+                self.counters["disk_hits"] += 1
+                self._remember(key, value)
+                return value
+
+            self.counters["misses"] += 1
+            return default
+
+    def _disk_get(self, key: str):
+        db = self._disk()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            try:
+                self._flush_touched()
+                db.commit()
+            except sqlite3.Error as e:
+                # Only recency is lost; the value was read fine
+                self._disk_error("touch", e)
+        return _decode(row[0])
+
+    def _flush_touched(self):
+        if self._touched:
+            touched, self._touched = self._touched, {}
+            self._db.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()],
+            )
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._remember(key, value)
+
+            try:
+                self._disk_set(key, value)
+            except (sqlite3.Error, OSError) as e:
+                self._disk_error("write", e)
+
+    def _disk_set(self, key: str, value):
+        blob = _encode(value)
+        db = self._disk()
+        if db is None or blob is None:
+            return
+
+        old = db.execute(
+            "SELECT size FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob), time.time()),
+        )
+        self._disk_bytes += len(blob) - (old[0] if old else 0)
+        self._writes += 1
+        if self._writes % SIZE_SYNC_EVERY == 0:
+            self._sync_size()
+
+        self._flush_touched()
+        self._evict_disk()
+        db.commit()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _evict_disk(self):
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # Other workers may have evicted (or added) rows since our last look
+        self._sync_size()
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # Trim to 90% so eviction doesn't run on every insert
+        target = self.max_disk_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed")
+        doomed = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.counters["disk_evictions"] += len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            try:
+                db = self._disk()
+                if db is not None:
+                    db.execute("DELETE FROM entries")
+                    db.commit()
+                    self._disk_bytes = 0
+            except (sqlite3.Error, OSError) as e:
+                self._disk_error("clear", e)
+
+    def stats(self):
+        return {
+            **self.counters,
+            "items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+
+def cache_stats():
+    return {cache.namespace: cache.stats() for cache in _caches}
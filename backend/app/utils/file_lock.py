@@ -0,0 +1,79 @@
+"""
+Advisory file locks shared by every process on the host (flock), used
+to elect the one process that runs the scheduler and to make sure only
+one worker builds a shared artifact (catalog files, TF-IDF index, job
+embeddings) while the others wait and then reuse it.
+
+The OS releases a flock when its process exits, however it exits, so a
+crashed leader never leaves a stale lock behind.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only exclude threads of this process
+    fcntl = None
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(path: str):
+    # Also exclude threads of this process when fcntl is unavailable
+    with _local_locks_guard:
+        return _local_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = str(path)
+        self._fd = None
+        self._thread_lock = _local_lock(self.path)
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if fcntl is None:
+            self._fd = -1
+            return True
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            os.close(fd)
+            self._thread_lock.release()
+            return False
+
+        # Owner pid, for whoever is debugging which worker is the leader
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is not None and fd >= 0:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._thread_lock.release()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on `path` for the duration of the block
+    """
+    lock = FileLock(path)
+    lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
@@ -0,0 +1,121 @@
+"""
+ASGI middleware recording per-route request counts and latency
+histograms, and running the sampling profiler on requests that ask for
+it with an `X-Profile: 1` header (only when PROFILER_ENABLED is set).
+A profiled request gets the collapsed-stack profile as its response
+body instead of the normal one; the original status is kept in the
+X-Profiled-Status header.
+"""
+import threading
+import time
+
+from app.utils.metrics import Counter, Gauge, Histogram
+from app.utils.profiler import SamplingProfiler
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last byte of the response body",
+    ["method", "route"],
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled")
+
+# Only one request is profiled at a time; sampling every thread is not free
+_profile_lock = threading.Lock()
+
+
+def _route_template(scope) -> str:
+    # Templates ("/jobs/recommend"), not raw paths, keep label cardinality
+    # bounded. Newer FastAPI keeps the router prefix in its own route
+    # context rather than on the matched route.
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    route = scope.get("route")
+    return getattr(context, "path", None) or getattr(route, "path", None) or "unmatched"
+
+
+def _wants_profile(scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            return value.strip().lower() in (b"1", b"true", b"yes")
+    return False
+
+
+class InstrumentationMiddleware:
+    def __init__(self, app, profiler_enabled: bool = False, profiler_interval: float = 0.005):
+        self.app = app
+        self.profiler_enabled = profiler_enabled
+        self.profiler_interval = profiler_interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.profiler_enabled and _wants_profile(scope) and _profile_lock.acquire(blocking=False):
+            try:
+                await self._profiled(scope, receive, send)
+            finally:
+                _profile_lock.release()
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.inc(-1)
+            self._record(scope, status, time.perf_counter() - start)
+
+    def _record(self, scope, status: int, elapsed: float):
+        method, route = scope["method"], _route_template(scope)
+        REQUESTS.inc(method=method, route=route, status=str(status))
+        REQUEST_SECONDS.observe(elapsed, method=method, route=route)
+
+    async def _profiled(self, scope, receive, send):
+        status = 500
+        body_bytes = 0
+
+        async def capture(message):
+            # The real response (including a streamed body) is produced
+            # in full, so its work is in the profile, but not sent
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+
+        profiler = SamplingProfiler(self.profiler_interval).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+            elapsed = time.perf_counter() - start
+            self._record(scope, status, elapsed)
+
+        body = profiler.collapsed().encode()
+        print(f"🔥 Profiled {scope['method']} {scope['path']}: {profiler.samples} samples in {elapsed * 1000:.0f} ms")
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(status).encode()),
+                (b"x-profile-samples", str(profiler.samples).encode()),
+                (b"x-profile-ms", f"{elapsed * 1000:.1f}".encode()),
+                (b"x-profiled-body-bytes", str(body_bytes).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,189 @@
+"""
+Process-wide metrics in the Prometheus text exposition format
+(version 0.0.4), without a client library: counters, histograms, timing
+spans and collectors that turn existing stats (caches, models, batchers)
+into samples when /metrics is scraped.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+PREFIX = "jobtune_"
+
+# Seconds; covers cached responses (sub-ms) up to model inference / batches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+_metrics = []
+_collectors = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{_escape(v)}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[n] for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        key = tuple(labels[n] for n in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = list(super().render())
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[n] for n in self.label_names)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()]
+
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                labels = _labels(self.label_names, key, [("le", _number(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_number(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def collector(fn):
+    """
+    Register fn() -> [(name, type, help, [(labels dict, value)])], called
+    on every scrape to report stats kept elsewhere
+    """
+    _collectors.append(fn)
+    return fn
+
+
+def _render_collected():
+    for fn in _collectors:
+        try:
+            families = fn()
+        except Exception as exc:
+            yield f"# collector {fn.__name__} failed: {_escape(exc)}"
+            continue
+
+        for name, kind, help, samples in families:
+            yield f"# HELP {PREFIX}{name} {help}"
+            yield f"# TYPE {PREFIX}{name} {kind}"
+            for labels, value in samples:
+                if value is None:
+                    continue
+                yield f"{PREFIX}{name}{_labels(labels, labels.values())} {_number(value)}"
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    lines.extend(_render_collected())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- SPANS ----------------
+SPAN_SECONDS = Histogram(
+    "span_duration_seconds", "Time spent in instrumented sections of the services", ["span"]
+)
+
+INFERENCE_CALLS = Counter(
+    "model_inference_calls_total", "Model forward calls (one per batch)", ["model"]
+)
+INFERENCE_ITEMS = Counter(
+    "model_inference_items_total", "Inputs run through a model", ["model"]
+)
+INFERENCE_SECONDS = Histogram(
+    "model_inference_seconds", "Latency of one model call", ["model"]
+)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a block into jobtune_span_duration_seconds{span=name}. Also
+    works as a function decorator, and around awaits (it measures wall
+    time).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SPAN_SECONDS.observe(time.perf_counter() - start, span=name)
+
+
+@contextmanager
+def inference(model: str, items: int = 1):
+    """
+    Count and time one model call over `items` inputs
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INFERENCE_SECONDS.observe(time.perf_counter() - start, model=model)
+        INFERENCE_CALLS.inc(model=model)
+        INFERENCE_ITEMS.inc(items, model=model)
@@ -0,0 +1,93 @@
+"""
+Statistical (sampling) profiler for single requests.
+
+A background thread snapshots the Python stacks of the other threads
+every `interval` seconds via sys._current_frames() and counts identical
+stacks. The result is in the "collapsed" format (one
+`frame;frame;frame count` line per distinct stack, root first), which
+flamegraph.pl, speedscope and inferno read directly.
+
+Only stacks that pass through this application's code are kept, so idle
+server threads don't drown the profile. Work done in the process pool
+(PDF extraction / rendering) runs in another process and is not in
+the profile; the spans in /metrics cover it.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frames of the profiler / instrumentation themselves are never interesting
+_SKIP_FILES = {
+    os.path.join(APP_ROOT, "utils", "profiler.py"),
+    os.path.join(APP_ROOT, "utils", "instrumentation.py"),
+}
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = "app" + filename[len(APP_ROOT):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._labels = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _sample(self):
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+
+            codes, in_app = [], False
+            while frame is not None and len(codes) < self.max_depth:
+                code = frame.f_code
+                if code.co_filename in _SKIP_FILES:
+                    frame = frame.f_back
+                    continue
+                in_app = in_app or code.co_filename.startswith(APP_ROOT)
+                codes.append(code)
+                frame = frame.f_back
+
+            if in_app:
+                self.stacks[";".join(self._label(c) for c in reversed(codes))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
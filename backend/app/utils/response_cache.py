@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.config import RESPONSE_CACHE_ITEMS, RESPONSE_CACHE_TTL
+
+
+def request_key(scope: str, payload, version=None) -> str:
+    """
+    Hash of the endpoint, whatever version its output depends on and the
+    request body in canonical form (sorted keys, no whitespace)
+    """
+    body = json.dumps(
+        jsonable_encoder(payload), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    h = hashlib.sha256()
+    h.update(f"{scope}\0{version}\0".encode())
+    h.update(body.encode())
+    return h.hexdigest()
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of rendered JSON bodies and their ETags.
+    Entries carry tags (e.g. "catalog") so everything derived from some
+    data can be dropped at once when that data changes.
+    """
+
+    def __init__(self, max_items: int = RESPONSE_CACHE_ITEMS, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0, "invalidated": 0}
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry
+
+    def set(self, key: str, body: bytes, tags=()):
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        entry = (etag, body, frozenset(tags), time.monotonic() + self.ttl)
+
+        if self.max_items > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_items:
+                    self._entries.popitem(last=False)
+                    self.counters["evictions"] += 1
+
+        return entry
+
+    def invalidate(self, tag: str = None):
+        """
+        Drop every entry with `tag` (or everything)
+        """
+        with self._lock:
+            if tag is None:
+                doomed = list(self._entries)
+            else:
+                doomed = [key for key, entry in self._entries.items() if tag in entry[2]]
+            for key in doomed:
+                del self._entries[key]
+            self.counters["invalidated"] += len(doomed)
+
+    async def respond(self, request, scope: str, payload, compute, version=None, tags=()):
+        """
+        Serve `await compute()` for this request body from the cache,
+        answering 304 when the client already holds the same ETag. Hits
+        never leave the event loop.
+        """
+        key = request_key(scope, payload, version)
+        entry = self.get(key)
+        if entry is None:
+            body = JSONResponse(jsonable_encoder(await compute())).body
+            entry = self.set(key, body, tags)
+
+        etag, body = entry[0], entry[1]
+        # Clients may reuse the response but must revalidate it
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            with self._lock:
+                self.counters["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        return Response(body, media_type="application/json", headers=headers)
+
+    def stats(self):
+        return {**self.counters, "items": len(self._entries)}
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,147 @@
+import csv
+import re
+
+TAXONOMY_FILE = "datasets/skills_taxonomy.csv"
+
+# Words plus the symbols that are part of skill names (c++, c#, f#).
+# Everything else (spaces, dots, slashes, dashes) separates tokens,
+# so "node.js", "Node JS" and "nodejs"-style aliases line up.
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+_END = None  # trie key marking the end of a skill phrase
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Token trie over every skill name and alias in the taxonomy.
+    Text is tokenized once and scanned in a single left-to-right pass
+    taking the longest phrase at each position, so matches respect word
+    boundaries ("java" never matches inside "javascript").
+    """
+
+    def __init__(self, taxonomy: dict):
+        # canonical skill -> integer id, in taxonomy order
+        self.skill_ids = {}
+        self.skills = []
+        self.categories = {}
+        self._aliases = {}
+        self._trie = {}
+        self.max_phrase = 0
+
+        for skill, entry in taxonomy.items():
+            self.skill_ids[skill] = len(self.skills)
+            self.skills.append(skill)
+            self.categories[skill] = entry.get("category", "")
+
+            phrases = list(entry.get("aliases", []))
+            # Single-letter names ("c", "r") are too ambiguous in free text
+            if len(skill) > 1:
+                phrases.append(skill)
+
+            for phrase in phrases:
+                self._add(phrase, skill)
+            for phrase in [skill, *entry.get("aliases", [])]:
+                self._aliases[" ".join(tokenize(phrase))] = skill
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, phrase: str, skill: str):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = skill
+        self.max_phrase = max(self.max_phrase, len(tokens))
+
+    def extract(self, text: str) -> list:
+        """
+        Canonical skills mentioned in `text`, in order of first mention
+        """
+        tokens = tokenize(text)
+        found = {}
+        trie = self._trie
+        i, n = 0, len(tokens)
+
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+
+            match, end = node.get(_END), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, end = node[_END], j
+
+            if match is not None:
+                found[match] = True
+                i = end
+            else:
+                i += 1
+
+        return list(found)
+
+    def normalize(self, name: str) -> str:
+        """
+        Canonical form of a single skill name or alias; unknown skills
+        are returned lowercased and stripped so they still compare equal
+        """
+        key = " ".join(tokenize(name))
+        return self._aliases.get(key, name.strip().lower())
+
+    def normalize_all(self, names) -> list:
+        return list(dict.fromkeys(
+            skill for skill in (self.normalize(name) for name in names) if skill
+        ))
+
+
+def load_taxonomy(path=TAXONOMY_FILE) -> dict:
+    """
+    skill,aliases,category CSV -> {skill: {"aliases": [...], "category": ...}}
+    (aliases are '|' separated)
+    """
+    taxonomy = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            skill = row["skill"].strip().lower()
+            if not skill:
+                continue
+            taxonomy[skill] = {
+                "aliases": [a.strip().lower() for a in (row.get("aliases") or "").split("|") if a.strip()],
+                "category": (row.get("category") or "").strip(),
+            }
+    return taxonomy
+
+
+_matcher = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """
+    Process-wide matcher, compiled from the taxonomy on first use
+    """
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def normalize_skill(name: str) -> str:
+    return get_skill_matcher().normalize(name)
+
+
+def normalize_skills(names) -> list:
+    return get_skill_matcher().normalize_all(names)
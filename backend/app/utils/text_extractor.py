@@ -1,16 +1,208 @@
+import re
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+
 from pdfminer.high_level import extract_text
-from docx import Document
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# Part of every extraction cache key: bump when the output changes
+EXTRACTOR_VERSION = 3
+
+# Fast mode: no reading-order analysis between text boxes (the costly,
+# superlinear part on busy pages) and no vertical-text detection. Lines
+# come out in box order instead of inferred column order.
+FAST_LAPARAMS = dict(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+
+class ExtractionLimitError(ValueError):
+    """
+    Raised when a document exceeds the configured size or page limits
+    """
+
 
 def extract_text_from_resume(file_path: str) -> str:
     """
     Extract text from PDF or DOCX resume
     """
-    if file_path.endswith(".pdf"):
-        return extract_text(file_path)
+    if not file_path.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise ValueError("Unsupported file format")
+
+    with open(file_path, "rb") as f:
+        return extract_text_from_bytes(f.read(), file_path)
+
+
+# ---------------- PDF ----------------
+def count_pdf_pages(stream, limit: int) -> int:
+    """
+    Count pages without laying them out, stopping once `limit` is exceeded
+    """
+    pages = 0
+    for _ in PDFPage.get_pages(stream):
+        pages += 1
+        if pages > limit:
+            break
+    stream.seek(0)
+    return pages
+
+
+def page_ranges(n_pages: int, per_task: int) -> list:
+    return [range(start, min(start + per_task, n_pages)) for start in range(0, n_pages, per_task)]
+
+
+def extract_pdf_pages(data: bytes, page_numbers=None, fast: bool = False, max_pages: int = 0) -> str:
+    """
+    Text of the given pages (all if None), each followed by a form feed
+    as pdfminer emits it, so results for consecutive page ranges join
+    into the text of the whole document. Runs in worker processes.
+    """
+    laparams = LAParams(**FAST_LAPARAMS) if fast else LAParams()
+    return extract_text(
+        BytesIO(data),
+        page_numbers=set(page_numbers) if page_numbers is not None else None,
+        maxpages=max_pages or 0,
+        laparams=laparams,
+    )
+
+
+# ---------------- DOCX ----------------
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+# Inline elements with a text equivalent (as python-docx renders them)
+_INLINE_TEXT = {f"{W}tab": "\t", f"{W}ptab": "\t", f"{W}cr": "\n", f"{W}noBreakHyphen": "-"}
+
+_PART_NUMBER = re.compile(r"(\d+)")
+
+
+def _docx_part_lines(stream) -> list:
+    """
+    Lines of one WordprocessingML part, read as a stream of XML events:
+    paragraphs in document order, table rows as cells joined by " | ",
+    and text boxes (whose paragraphs sit inside the anchoring paragraph)
+    as their own lines. Elements are cleared once read, so memory stays
+    flat however large the document is.
+    """
+    lines = []
+    # Where finished paragraphs go: the part, a table cell or a text box
+    containers = [lines]
+    paragraphs = []
+    rows = []
+    skip = 0
+    # Tabs / breaks are text only inside a run; w:tab also defines tab
+    # stops under w:pPr/w:tabs, which must not add a tab
+    runs = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+
+        # Word stores a text box twice (DrawingML + a VML fallback); the
+        # fallback copy is skipped
+        if tag == f"{MC}Fallback":
+            skip += 1 if event == "start" else -1
+            continue
+        if skip:
+            if event == "end":
+                elem.clear()
+            continue
+
+        if event == "start":
+            if tag == f"{W}r":
+                runs += 1
+            elif tag == f"{W}p":
+                paragraphs.append([])
+            elif tag in (f"{W}tc", f"{W}txbxContent"):
+                containers.append([])
+            elif tag == f"{W}tr":
+                rows.append([])
+            continue
+
+        if tag == f"{W}r":
+            runs -= 1
+            continue
+        if tag == f"{W}t":
+            if paragraphs:
+                paragraphs[-1].append(elem.text or "")
+        elif tag in _INLINE_TEXT:
+            if paragraphs and runs:
+                paragraphs[-1].append(_INLINE_TEXT[tag])
+        elif tag == f"{W}br":
+            if paragraphs and runs and elem.get(f"{W}type", "textWrapping") == "textWrapping":
+                paragraphs[-1].append("\n")
+        elif tag == f"{W}p":
+            containers[-1].append("".join(paragraphs.pop()))
+        elif tag == f"{W}tc":
+            cell = containers.pop()
+            if rows:
+                rows[-1].append(" ".join(p for p in cell if p.strip()))
+        elif tag == f"{W}tr":
+            cells = rows.pop()
+            if any(cells):
+                containers[-1].append(" | ".join(cells))
+        elif tag == f"{W}txbxContent":
+            box = containers.pop()
+            containers[-1].extend(box)
+        else:
+            continue
+
+        elem.clear()
+
+    return lines
+
+
+def _numbered_parts(names, prefix: str) -> list:
+    parts = [n for n in names if n.startswith(prefix) and n.endswith(".xml")]
+    return sorted(parts, key=lambda n: int((_PART_NUMBER.findall(n) or ["0"])[-1]))
+
+
+def extract_docx(data: bytes) -> str:
+    """
+    Body text with tables and text boxes, preceded by header lines and
+    followed by footer lines (each distinct line once)
+    """
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        names = archive.namelist()
+
+        def read(name):
+            with archive.open(name) as stream:
+                return _docx_part_lines(stream)
+
+        body = read("word/document.xml")
+
+        def distinct(parts):
+            seen = set()
+            out = []
+            for name in parts:
+                for line in read(name):
+                    if line.strip() and line not in seen:
+                        seen.add(line)
+                        out.append(line)
+            return out
+
+        headers = distinct(_numbered_parts(names, "word/header"))
+        footers = distinct(_numbered_parts(names, "word/footer"))
+
+    return "\n".join(headers + body + footers)
+
+
+# ---------------- Entry point ----------------
+def extract_text_from_bytes(data: bytes, filename: str, max_pages: int = None, fast: bool = False) -> str:
+    """
+    Extract text from an in-memory PDF or DOCX upload (no temp file).
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    name = filename.lower()
+
+    if name.endswith(".pdf"):
+        if max_pages and count_pdf_pages(BytesIO(data), max_pages) > max_pages:
+            raise ExtractionLimitError(f"PDF has more than {max_pages} pages")
+        return extract_pdf_pages(data, fast=fast, max_pages=max_pages or 0)
 
-    elif file_path.endswith(".docx"):
-        doc = Document(file_path)
-        return "\n".join([p.text for p in doc.paragraphs])
+    elif name.endswith(".docx"):
+        return extract_docx(data)
 
     else:
         raise ValueError("Unsupported file format")
@@ -0,0 +1,165 @@
+"""
+IVF-PQ job search vs exact cosine search: recall@k and latency for each
+(nprobe, rerank) setting, plus build, insert / delete and load costs.
+
+    python -m benchmarks.ann_search
+    python -m benchmarks.ann_search -n 1000000 --nprobe 8 16 32 64 --rerank 0 500 2000 -o ann.json
+
+Queries are held-out vectors from the same distribution as the catalog;
+the exact top-k of every query is the ground truth. Synthetic vectors
+(benchmarks.generators.embedding_matrix) are used unless --matrix points
+at a real job embedding matrix, e.g. one under CACHE_DIR/embeddings:
+
+    python -m benchmarks.ann_search --matrix datasets/cache/embeddings/jobs-<version>-<model>.npy
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from app.ml_models.ann_index import PQ_TRAIN_SAMPLE, TRAIN_PER_LIST, IVFPQIndex, default_nlist
+from benchmarks.generators import embedding_matrix
+from benchmarks.results import sample, save, summarize
+
+
+def exact_top_k(matrix, query, k: int):
+    scores = matrix @ query
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def recall(found, truth) -> float:
+    return len(set(found.tolist()) & set(truth.tolist())) / len(truth)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def evaluate(index, matrix, queries, truths, k, nprobe, rerank):
+    exact = (lambda entries: matrix[index.keys_of(entries).astype(np.int64)]) if rerank else None
+    recalls = []
+    for query, truth in zip(queries, truths):
+        entries, _ = index.search(query, k, nprobe=nprobe, rerank=rerank, exact=exact)
+        recalls.append(recall(index.keys_of(entries).astype(np.int64), truth))
+
+    pending = iter(list(queries) * 2)
+    latency = summarize(sample(
+        lambda: index.search(next(pending), k, nprobe=nprobe, rerank=rerank, exact=exact),
+        len(queries), warmup=1,
+    ))
+    return float(np.mean(recalls)), latency
+
+
+def run(args):
+    results = {}
+    total = args.n + args.queries + args.churn
+    if args.matrix:
+        data = np.load(args.matrix, mmap_mode="r")
+        data = np.asarray(data[np.random.default_rng(7).permutation(len(data))[:total]], dtype=np.float32)
+        total = len(data)
+        args.n = total - args.queries - args.churn
+        args.dim = data.shape[1]
+    else:
+        data = embedding_matrix(total, args.dim, seed=7)
+    matrix, queries, fresh = (
+        data[:args.n], data[args.n:args.n + args.queries], data[args.n + args.queries:]
+    )
+    keys = np.arange(args.n, dtype=np.uint64)
+    k = args.k
+    print(f"📦 {args.n} vectors x {args.dim}, {args.queries} queries, k={k}")
+
+    truths = [exact_top_k(matrix, q, k) for q in queries]
+    pending = iter(list(queries) * 2)
+    exact_latency = summarize(sample(lambda: exact_top_k(matrix, next(pending), k), args.queries, warmup=1))
+    results["exact"] = {**exact_latency, "recall": 1.0}
+
+    # ---------------- Build ----------------
+    nlist = args.nlist or default_nlist(args.n)
+    rng = np.random.default_rng(0)
+    n_train = min(args.n, max(nlist * TRAIN_PER_LIST, PQ_TRAIN_SAMPLE))
+    index, train_s = timed(lambda: IVFPQIndex.train(
+        matrix[rng.choice(args.n, n_train, replace=False)], nlist=nlist, m=args.m
+    ))
+    _, add_s = timed(lambda: (index.add(matrix, keys), index.compact()))
+    index.trained_size = args.n
+
+    code_mb = index.n_main * index.m / 2**20
+    print(f"🏗️  trained {index.nlist} lists x {index.m} bytes in {train_s:.1f}s, "
+          f"encoded in {add_s:.1f}s; codes {code_mb:.1f} MB vs {matrix.nbytes / 2**20:.1f} MB float32")
+    results["build"] = {
+        "nlist": index.nlist, "m": index.m,
+        "train_seconds": round(train_s, 2), "add_seconds": round(add_s, 2),
+        "codes_mb": round(code_mb, 2), "float32_mb": round(matrix.nbytes / 2**20, 2),
+    }
+
+    # ---------------- Recall vs latency ----------------
+    print(f"\n{'nprobe':>7} {'rerank':>7} {f'recall@{k}':>10} {'p50 ms':>9} {'p95 ms':>9} {'speedup':>8}")
+    print(f"{'exact':>7} {'':>7} {1.0:10.3f} {exact_latency['p50']:9.3f} {exact_latency['p95']:9.3f} {1.0:7.1f}x")
+    for nprobe in args.nprobe:
+        for rerank in args.rerank:
+            rec, latency = evaluate(index, matrix, queries, truths, k, nprobe, rerank)
+            speedup = exact_latency["p50"] / latency["p50"]
+            print(f"{nprobe:>7} {rerank:>7} {rec:10.3f} {latency['p50']:9.3f} {latency['p95']:9.3f} {speedup:7.1f}x")
+            results[f"nprobe={nprobe},rerank={rerank}"] = {**latency, "recall": round(rec, 4)}
+
+    # ---------------- Daily refresh ----------------
+    if args.churn:
+        new_keys = np.arange(args.n, args.n + args.churn, dtype=np.uint64)
+        gone = rng.choice(args.n, args.churn, replace=False).astype(np.uint64)
+        _, insert_s = timed(lambda: index.add(fresh, new_keys))
+        _, delete_s = timed(lambda: index.delete(gone))
+
+        live = np.ones(args.n + args.churn, dtype=bool)
+        live[gone.astype(np.int64)] = False
+        everything = np.concatenate([matrix, fresh])
+        everything[~live] = 0
+        churn_truths = [exact_top_k(everything, q, k) for q in queries]
+        nprobe, rerank = args.nprobe[len(args.nprobe) // 2], max(args.rerank)
+        rec, _ = evaluate(index, everything, queries, churn_truths, k, nprobe, rerank)
+        print(f"\n🔁 +{args.churn} / -{args.churn}: insert {insert_s * 1000:.0f} ms, "
+              f"delete {delete_s * 1000:.0f} ms, recall@{k} {rec:.3f} (nprobe={nprobe}, rerank={rerank})")
+        results["refresh"] = {
+            "churn": args.churn, "insert_ms": round(insert_s * 1000, 1),
+            "delete_ms": round(delete_s * 1000, 1), "recall": round(rec, 4),
+        }
+
+    # ---------------- Persistence ----------------
+    with tempfile.TemporaryDirectory() as tmp:
+        _, save_s = timed(lambda: index.save(tmp))
+        _, delta_save_s = timed(lambda: index.save(tmp))
+        loaded, load_s = timed(lambda: IVFPQIndex.load(tmp))
+        entries, _ = loaded.search(queries[0], k, nprobe=args.nprobe[0])
+        assert len(entries) == min(k, len(loaded))
+        print(f"💾 save {save_s * 1000:.0f} ms (refresh-only save {delta_save_s * 1000:.0f} ms), "
+              f"mmap load {load_s * 1000:.1f} ms")
+        results["persistence"] = {
+            "save_ms": round(save_s * 1000, 1),
+            "refresh_save_ms": round(delta_save_s * 1000, 1),
+            "load_ms": round(load_s * 1000, 2),
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=200000, help="catalog size")
+    parser.add_argument("--matrix", help="real embeddings (.npy) to use instead of synthetic ones")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 = sqrt(n), rounded to a power of two")
+    parser.add_argument("--m", type=int, default=0, help="bytes per vector (0 = dim / 8)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--rerank", type=int, nargs="+", default=[0, 100, 1000])
+    parser.add_argument("--churn", type=int, default=2000, help="postings inserted and deleted in the refresh test")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        save(args.output, "ann_search", results, n=args.n, dim=args.dim, k=args.k)
@@ -0,0 +1,56 @@
+"""
+Applying ATS fixes: the original loop (a substring test and a full
+str.replace of the resume per feedback item) vs the single-pass fixer,
+with up to hundreds of feedback items on long resumes.
+
+    python -m benchmarks.ats_fixes
+"""
+import argparse
+import time
+
+from app.services.ats_fixer import fix_resume
+from app.services.ats_scorer import analyze_resume
+from benchmarks.generators import structured_resume
+
+
+def legacy_apply_fixes(original_text, feedback):
+    updated_text = original_text
+    for item in feedback:
+        old = item.get("line", "")
+        new = item.get("improved_example", "")
+        if old and new and old in updated_text:
+            updated_text = updated_text.replace(old, new)
+    return updated_text
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(words, repeat):
+    print(f"{'words':>8} {'items':>6} {'legacy ms':>10} {'fixer ms':>10} {'by text ms':>11} {'hunks':>6}")
+    for n_words in words:
+        text = structured_resume(n_words, seed=n_words)
+        feedback = analyze_resume(text, [], 0)["line_feedback"]
+        # Without line numbers every item goes through content lookup
+        by_content = [{k: v for k, v in item.items() if k != "line_number"} for item in feedback]
+
+        legacy = timed(lambda: legacy_apply_fixes(text, feedback), repeat)
+        fixer = timed(lambda: fix_resume(text, feedback), repeat)
+        by_text = timed(lambda: fix_resume(text, by_content), repeat)
+        hunks = len(fix_resume(text, feedback)["patch"]["hunks"])
+        print(f"{n_words:>8} {len(feedback):>6} {legacy * 1000:10.2f} {fixer * 1000:10.2f} {by_text * 1000:11.2f} {hunks:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, nargs="+", default=[600, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.words, args.repeat)
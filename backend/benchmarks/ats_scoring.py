@@ -0,0 +1,93 @@
+"""
+ATS scoring: the original per-word substring scans vs the compiled
+single-pass rule engine, on resumes from one page up to ~100 pages and
+with growing numbers of word-list rules, plus batch scoring throughput.
+
+    python -m benchmarks.ats_scoring
+"""
+import argparse
+
+from app.services.ats_rules import ACTION_VERBS, LINE_RULES, WORD_LISTS, CompiledRules
+from app.services.ats_scorer import analyze_resumes
+from benchmarks.generators import resume_text, skill_taxonomy
+from benchmarks.results import sample
+
+WORDS_PER_PAGE = 500
+WORDS_PER_LIST = 25
+
+
+def legacy_scan(resume_text, word_lists):
+    """
+    Scan pattern of the original analyze_resume, generalized to several
+    word lists: one substring scan of the text per word, then one per
+    word per line
+    """
+    text = resume_text.lower()
+    word_count = len(text.split())
+    hits = [sum(1 for v in words if v in text) for words in word_lists.values()]
+    formatting = "|" not in text and "\t" not in text
+
+    line_feedback = []
+    for line in resume_text.split("\n"):
+        if len(line.strip()) < 10:
+            continue
+        for words in word_lists.values():
+            if not any(v in line.lower() for v in words):
+                line_feedback.append(line)
+
+    return word_count, hits, formatting, line_feedback
+
+
+def rules_with_extra_lists(n_lists):
+    """
+    The shipped rules plus `n_lists` synthetic word lists, each with a
+    line rule requiring one of its words
+    """
+    extra = [name.replace(" ", "") for name in skill_taxonomy(n_lists * WORDS_PER_LIST)]
+    word_lists = dict(WORD_LISTS)
+    line_rules = list(LINE_RULES)
+
+    for i in range(n_lists):
+        name = f"extra_{i}"
+        word_lists[name] = extra[i * WORDS_PER_LIST:(i + 1) * WORDS_PER_LIST]
+        line_rules.append({"id": name, "requires_any": name, "issue": f"Line lacks {name} terms"})
+
+    return word_lists, CompiledRules(word_lists=word_lists, line_rules=line_rules)
+
+
+def run(pages, extra_lists, repeat, batch_size):
+    vocabulary = ACTION_VERBS + ["python", "sql", "docker"]
+
+    print(f"{'pages':>6} {'words':>8} {'rules':>6} {'legacy ms':>10} {'engine ms':>10}")
+    for n_pages in pages:
+        text = resume_text(n_pages * WORDS_PER_PAGE, vocabulary, skill_every=9)
+        for n_lists in extra_lists:
+            word_lists, rules = rules_with_extra_lists(n_lists)
+            n_words = sum(len(words) for words in word_lists.values())
+
+            legacy = min(sample(lambda: legacy_scan(text, word_lists), repeat, warmup=0))
+            engine = min(sample(lambda: rules.scan(text), repeat, warmup=0))
+            print(f"{n_pages:>6} {n_pages * WORDS_PER_PAGE:>8} {n_words:>6} "
+                  f"{legacy:10.2f} {engine:10.2f}")
+
+    resumes = [
+        {"resume_text": resume_text(WORDS_PER_PAGE, vocabulary, seed=i), "skills": ["python"], "experience": 1}
+        for i in range(batch_size)
+    ]
+    elapsed_ms, = sample(lambda: analyze_resumes(resumes), 1, warmup=0)
+    print(f"batch: {batch_size} one-page resumes in {elapsed_ms:.0f} ms "
+          f"({batch_size / elapsed_ms * 1000:.0f} resumes/sec)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument(
+        "--extra-lists", type=int, nargs="+", default=[0, 4, 12],
+        help=f"extra word-list rules ({WORDS_PER_LIST} words each) to add",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.pages, args.extra_lists, args.repeat, args.batch)
@@ -0,0 +1,74 @@
+"""
+Career recommendations: the original per-request loop over CAREER_PATHS
+vs the precomputed career graph (ranking + k cheapest progressions).
+
+    python -m benchmarks.career_graph --roles 1000 --skills 5000
+"""
+import argparse
+import time
+
+from app.services.career_graph import CareerGraph
+from benchmarks.generators import career_paths, resume_skills
+from benchmarks.results import sample
+
+
+def legacy_recommend(paths, resume_skills):
+    """
+    The original recommend_career ranking (set intersections per role,
+    sorted by matched count, single next role)
+    """
+    resume_skills = set(resume_skills)
+    ranked = []
+    for role, data in paths.items():
+        required = set(data["required"])
+        matched = len(resume_skills & required)
+        if matched > 0:
+            missing = list(required - resume_skills)
+            ranked.append({
+                "current_role": role,
+                "next_role": data["next"][0] if data["next"] else None,
+                "match_score": matched,
+                "missing_skills": missing,
+            })
+    ranked.sort(key=lambda x: x["match_score"], reverse=True)
+    return ranked
+
+
+def run(n_roles, n_skills, n_resume_skills, k, repeat):
+    paths = career_paths(n_roles, n_skills)
+    skills = resume_skills(n_resume_skills, n_skills)
+
+    start = time.perf_counter()
+    graph = CareerGraph(paths)
+    build = time.perf_counter() - start
+
+    def cold(target=None):
+        graph._cached.cache_clear()
+        return graph.recommend(skills, k, target)
+
+    result = cold()
+    target = result["progressions"][-1]["roles"][-1] if result["progressions"] else None
+
+    rows = [
+        ("legacy loop", lambda: legacy_recommend(paths, skills)),
+        ("graph (cold)", cold),
+        ("graph + target", lambda: cold(target)),
+        ("graph (cached)", lambda: graph.recommend(skills, k)),
+    ]
+
+    print(f"{n_roles} roles x {n_skills} skills, resume with {n_resume_skills} skills, k={k}")
+    print(f"graph build: {build:.2f} s, {len(result['progressions'])} progressions")
+    for name, fn in rows:
+        print(f"{name:<16} {min(sample(fn, repeat, warmup=0)):9.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--roles", type=int, default=1000)
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--resume-skills", type=int, default=12)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.roles, args.skills, args.resume_skills, args.k, args.repeat)
@@ -0,0 +1,77 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+A benchmark regresses when its p50 (or p95, with --metric p95) is more
+than `threshold` slower, or its throughput more than `threshold` lower.
+Exits with status 1 if anything regressed, so it can gate CI.
+"""
+import argparse
+import sys
+
+from benchmarks.results import load
+
+
+def compare(base: dict, new: dict, metric: str = "p50", threshold: float = 0.10):
+    """
+    [(name, base value, new value, relative change, status)] where a
+    positive change is always "worse"
+    """
+    rows = []
+    base_results, new_results = base["results"], new["results"]
+
+    for name in sorted(set(base_results) | set(new_results)):
+        old, cur = base_results.get(name), new_results.get(name)
+        if not old or not cur or not old.get("samples") or not cur.get("samples"):
+            rows.append((name, None, None, None, "missing"))
+            continue
+
+        # Latency: higher is worse
+        change = (cur[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+        status = "regressed" if change > threshold else "improved" if change < -threshold else "ok"
+        rows.append((name, old[metric], cur[metric], change, status))
+
+        # Throughput: lower is worse
+        if old.get("rps") and cur.get("rps"):
+            change = (old["rps"] - cur["rps"]) / old["rps"]
+            status = "regressed" if change > threshold else "improved" if change < -threshold else "ok"
+            rows.append((f"{name} (rps)", old["rps"], cur["rps"], change, status))
+
+        if cur.get("errors", 0) > old.get("errors", 0):
+            rows.append((f"{name} (errors)", old.get("errors", 0), cur["errors"], None, "regressed"))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", choices=["p50", "p95", "p99", "mean", "min"], default="p50")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change, e.g. 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    base, new = load(args.baseline), load(args.candidate)
+    print(f"baseline:  {args.baseline} ({base.get('env', {}).get('commit')})")
+    print(f"candidate: {args.candidate} ({new.get('env', {}).get('commit')})")
+    print(f"\n{'benchmark':<40} {'base':>10} {'new':>10} {'change':>8}  status")
+
+    rows = compare(base, new, args.metric, args.threshold)
+    for name, old, cur, change, status in rows:
+        old = f"{old:10.2f}" if old is not None else f"{'-':>10}"
+        cur = f"{cur:10.2f}" if cur is not None else f"{'-':>10}"
+        change = f"{change:+8.1%}" if change is not None else f"{'':>8}"
+        flag = "❌ " if status == "regressed" else "✅ " if status == "improved" else "   "
+        print(f"{name:<40} {old} {cur} {change}  {flag}{status}")
+
+    regressed = [row for row in rows if row[4] == "regressed"]
+    if regressed:
+        print(f"\n❌ {len(regressed)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Throughput of the CPU-bound routes as the process pool grows: runs the
+in-process load test (benchmarks.load_test) once per CPU_POOL_SIZE, each
+in a fresh interpreter, and reports requests/sec and speedup over one
+worker. Scaling stops at the number of physical cores.
+
+    python -m benchmarks.executor_scaling --workers 1 2 4 8
+    python -m benchmarks.executor_scaling --queue-limit 2 --concurrency 64   # show 503 shedding
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_ROUTES = ["/ats/export-pdf (single)", "/ats/score/batch", "/resume/upload (pdf)"]
+
+
+def run_load_test(workers, args, output):
+    # By default every client fits in the queue, so nothing is shed
+    queue_limit = args.queue_limit if args.queue_limit is not None else args.concurrency
+    env = {**os.environ, "CPU_POOL_SIZE": str(workers), "CPU_QUEUE_LIMIT": str(queue_limit)}
+
+    command = [
+        sys.executable, "-m", "benchmarks.load_test",
+        "--requests", str(args.requests),
+        "--concurrency", str(args.concurrency),
+        "--no-cache", "--filter", *args.filter,
+        "-o", output,
+    ]
+    subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        return json.load(f)["results"]
+
+
+def run(args):
+    print(f"{os.cpu_count()} CPUs visible\n")
+    print(f"{'route':<32} {'workers':>8} {'rps':>9} {'speedup':>8} {'p95 ms':>9} {'503s':>6}")
+
+    by_workers = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            by_workers[workers] = run_load_test(workers, args, os.path.join(tmp, f"{workers}.json"))
+
+    base = by_workers[args.workers[0]]
+    for route in base:
+        for workers, results in by_workers.items():
+            r = results[route]
+            speedup = r["rps"] / base[route]["rps"] if base[route]["rps"] else 0
+            print(f"{route:<32} {workers:>8} {r['rps']:9.1f} {speedup:7.2f}x {r['p95']:9.1f} {r.get('rejected', 0):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--queue-limit", type=int, help="CPU_QUEUE_LIMIT for every run")
+    parser.add_argument("--filter", nargs="+", default=DEFAULT_ROUTES)
+    args = parser.parse_args()
+
+    run(args)
@@ -0,0 +1,80 @@
+"""
+Resume text extraction throughput (pages/sec) on generated fixtures:
+PDFs from one page up to dozens of pages in the default layout mode,
+the fast layout mode and split into page ranges over a process pool,
+plus content-hash cache hits and DOCX via python-docx vs the streamed
+XML reader.
+
+    python -m benchmarks.extraction
+    python -m benchmarks.extraction --workers 4 --words 600 20000 -o extraction.json
+"""
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from app.config import EXTRACT_PAGES_PER_TASK
+from app.utils.content_cache import ContentCache
+from app.utils.text_extractor import count_pdf_pages, extract_docx, extract_pdf_pages, page_ranges
+from benchmarks.generators import resume_docx, resume_pdf, structured_resume
+from benchmarks.results import print_table, sample, save, summarize
+
+
+def python_docx_text(data: bytes) -> str:
+    # What extraction did before: body paragraphs only
+    from docx import Document
+    return "\n".join(p.text for p in Document(BytesIO(data)).paragraphs)
+
+
+def parallel_pdf(pool, data: bytes, pages: int, fast: bool = False) -> str:
+    ranges = page_ranges(pages, EXTRACT_PAGES_PER_TASK)
+    return "".join(pool.map(extract_pdf_pages, [data] * len(ranges), ranges, [fast] * len(ranges)))
+
+
+def run(words, workers, repeat):
+    results = {}
+    cache = ContentCache("bench-extractions", max_disk_bytes=0)
+
+    def record(name, fn, pages):
+        stats = summarize(sample(fn, repeat))
+        stats["pages"] = pages
+        stats["pages_per_sec"] = round(pages / (stats["p50"] / 1000), 1)
+        results[name] = stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for n_words in words:
+            text = structured_resume(n_words, seed=n_words)
+            pdf, docx = resume_pdf(text), resume_docx(text)
+            pages = count_pdf_pages(BytesIO(pdf), 10_000)
+            label = f"{pages}p"
+
+            record(f"pdf.{label}.default", lambda: extract_pdf_pages(pdf), pages)
+            record(f"pdf.{label}.fast", lambda: extract_pdf_pages(pdf, fast=True), pages)
+            if pages > EXTRACT_PAGES_PER_TASK:
+                record(f"pdf.{label}.parallel.{workers}w", lambda: parallel_pdf(pool, pdf, pages), pages)
+
+            key = hashlib.sha256(pdf).hexdigest()
+            cache.set(key, extract_pdf_pages(pdf))
+            record(f"pdf.{label}.cache_hit", lambda: cache.get(hashlib.sha256(pdf).hexdigest()), pages)
+
+            record(f"docx.{n_words}w.python_docx", lambda: python_docx_text(docx), pages)
+            record(f"docx.{n_words}w.streamed", lambda: extract_docx(docx), pages)
+
+    print_table(results)
+    print()
+    for name, stats in results.items():
+        print(f"{name:<32} {stats['pages_per_sec']:>10.1f} pages/sec")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[150, 600, 2500, 12000])
+    parser.add_argument("--workers", type=int, default=4, help="processes for the page-range split")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.words, args.workers, args.repeat)
+    if args.output:
+        save(args.output, "extraction", results, workers=args.workers, repeat=args.repeat)
@@ -0,0 +1,224 @@
+"""
+Synthetic data generators shared by the benchmarks
+"""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+TITLES = [
+    "Software Engineer", "Backend Developer", "Frontend Developer",
+    "Data Analyst", "Machine Learning Engineer", "DevOps Engineer",
+    "Business Analyst", "Product Analyst", "HR Executive",
+    "Operations Executive", "QA Engineer", "Data Scientist",
+]
+
+DEMAND_LEVELS = ["high", "medium", "low"]
+
+# Real taxonomy skills, so parsing / scoring / matching find something
+RESUME_SKILLS = [
+    "python", "sql", "git", "docker", "aws", "react", "javascript",
+    "machine learning", "excel", "flask", "communication", "linux",
+]
+
+# Resume lengths (words) used by the fixtures: short, typical, long
+RESUME_LENGTHS = {"short": 150, "typical": 600, "long": 2500}
+
+
+def skill_vocabulary(n_skills: int):
+    return [f"skill{i}" for i in range(n_skills)]
+
+
+def jobs_frame(n_jobs: int, n_skills: int = 2000, seed: int = 0):
+    """
+    Jobs catalog shaped like datasets/jobs.csv.
+    Skill popularity follows a Zipf-like curve so some skills are common.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(skill_vocabulary(n_skills))
+
+    weights = 1.0 / np.arange(1, n_skills + 1)
+    weights /= weights.sum()
+
+    per_job = rng.integers(3, 9, size=n_jobs)
+    flat = rng.choice(n_skills, size=int(per_job.sum()), p=weights)
+    bounds = np.concatenate([[0], np.cumsum(per_job)])
+
+    skills = [
+        ",".join(vocab[np.unique(flat[bounds[i]:bounds[i + 1]])])
+        for i in range(n_jobs)
+    ]
+
+    titles = np.array(TITLES)[rng.integers(0, len(TITLES), size=n_jobs)]
+    intern = rng.random(n_jobs) < 0.3
+    titles = np.where(intern, np.char.add(titles, " Intern"), titles)
+
+    today = np.datetime64("2026-01-15")
+    dates = today - rng.integers(0, 30, size=n_jobs).astype("timedelta64[D]")
+
+    return pd.DataFrame({
+        "title": titles,
+        "description": [f"Work on {s.replace(',', ' and ')} projects" for s in skills],
+        "skills": skills,
+        "market_demand": np.array(DEMAND_LEVELS)[rng.integers(0, 3, size=n_jobs)],
+        "date_posted": dates.astype(str),
+    })
+
+
+def resume_skills(n: int, n_skills: int = 2000, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    vocab = skill_vocabulary(n_skills)
+    return [vocab[i] for i in rng.choice(min(n_skills, 200), size=n, replace=False)]
+
+
+FILLER_WORDS = (
+    "worked with the team to deliver features for customers using "
+    "modern tools and improved reliability across several projects while "
+    "collaborating on design reviews testing and documentation"
+).split()
+
+
+def skill_taxonomy(n_skills: int, seed: int = 2):
+    """
+    {skill: {"aliases": [...], "category": ...}} with realistic-looking
+    one to three word names, some of them with an alias
+    """
+    rng = np.random.default_rng(seed)
+    syllables = ["ka", "lo", "mi", "zu", "re", "ta", "no", "vi", "sa", "pe", "do", "ru"]
+
+    taxonomy = {}
+    while len(taxonomy) < n_skills:
+        words = [
+            "".join(rng.choice(syllables, size=rng.integers(2, 4)))
+            for _ in range(rng.integers(1, 4))
+        ]
+        name = " ".join(words)
+        aliases = ["".join(w[0] for w in words) + str(len(taxonomy))] if rng.random() < 0.3 else []
+        taxonomy[name] = {"aliases": aliases, "category": "synthetic"}
+    return taxonomy
+
+
+def resume_text(n_words: int, skills=(), skill_every: int = 25, seed: int = 3):
+    """
+    Resume-like text of about `n_words` words, mentioning one of
+    `skills` every `skill_every` words, split into short lines
+    """
+    rng = np.random.default_rng(seed)
+    skills = list(skills)
+    words = []
+    for i in range(n_words):
+        if skills and i % skill_every == 0:
+            words.append(skills[rng.integers(0, len(skills))])
+        else:
+            words.append(FILLER_WORDS[rng.integers(0, len(FILLER_WORDS))])
+
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines)
+
+
+def career_paths(n_roles: int, n_skills: int = 5000, seed: int = 4):
+    """
+    CAREER_PATHS-shaped dict: 4-12 required skills per role (Zipf-like
+    popularity) and 1-3 "next" roles, mostly towards later roles so
+    multi-hop progressions exist
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(skill_vocabulary(n_skills))
+
+    weights = 1.0 / np.arange(1, n_skills + 1)
+    weights /= weights.sum()
+
+    roles = [f"Role {i}" for i in range(n_roles)]
+    paths = {}
+    for i, role in enumerate(roles):
+        required = np.unique(rng.choice(n_skills, size=rng.integers(4, 13), p=weights))
+        later = np.arange(i + 1, n_roles)
+        next_roles = (
+            [roles[j] for j in rng.choice(later, size=min(len(later), rng.integers(1, 4)), replace=False)]
+            if len(later) else []
+        )
+        paths[role] = {
+            "category": "Tech" if rng.random() < 0.6 else "Non-Tech",
+            "level": "entry" if i < n_roles // 2 else "senior",
+            "required": list(vocab[required]),
+            "next": next_roles,
+        }
+    return paths
+
+
+def structured_resume(n_words: int, seed: int = 0, skills=RESUME_SKILLS) -> str:
+    """
+    Resume text with a name line, contact line, section headings and
+    bullet lines (what the PDF exporter and ATS scorer expect). Every
+    other bullet lacks an action verb, so ATS feedback has lines to fix.
+    """
+    body = resume_text(n_words, skills=skills, seed=seed).split("\n")
+    sections = ["EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION"]
+    lines = ["Jane Doe", "jane@example.com | +91 90000 00000", "2 years experience", ""]
+    per_section = max(1, len(body) // len(sections))
+    for i, heading in enumerate(sections):
+        lines += ["", heading]
+        lines += [
+            f"- {'Developed' if j % 2 else 'Responsible for'} {line}"
+            for j, line in enumerate(body[i * per_section:(i + 1) * per_section])
+        ]
+    return "\n".join(lines)
+
+
+def resume_pdf(text: str) -> bytes:
+    from app.services.pdf_exporter import render_resume_pdf
+    return render_resume_pdf(text)[0]
+
+
+def resume_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        if line.startswith("- "):
+            document.add_paragraph(line[2:], style="List Bullet")
+        elif line.isupper() and line.strip():
+            document.add_heading(line.title(), level=2)
+        else:
+            document.add_paragraph(line)
+
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def resume_fixtures(lengths=RESUME_LENGTHS, seed: int = 0) -> dict:
+    """
+    {length name: {"text": ..., "pdf": bytes, "docx": bytes}}
+    """
+    fixtures = {}
+    for name, n_words in lengths.items():
+        text = structured_resume(n_words, seed=seed)
+        fixtures[name] = {"text": text, "pdf": resume_pdf(text), "docx": resume_docx(text)}
+    return fixtures
+
+
+def embedding_matrix(n: int, dim: int = 384, n_topics: int = 0, latent: int = 32, seed: int = 6):
+    """
+    Normalized float32 vectors shaped like sentence embeddings of job
+    postings: topics (one role at one kind of company) grouped into
+    broader fields, all leaning in one shared direction (embeddings of
+    one model do), postings varying around their topic along a few dozen
+    latent directions plus a little isotropic noise
+    """
+    rng = np.random.default_rng(seed)
+    n_topics = n_topics or max(8, n // 250)
+    shared = rng.standard_normal(dim).astype(np.float32)
+    fields = rng.standard_normal((max(4, n_topics // 25), dim)).astype(np.float32) + 0.5 * shared
+    topics = fields[rng.integers(0, len(fields), n_topics)]
+    topics += 0.7 * rng.standard_normal((n_topics, dim)).astype(np.float32)
+    basis = rng.standard_normal((latent, dim)).astype(np.float32) / np.sqrt(latent)
+
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 65536):
+        size = min(65536, n - start)
+        block = topics[rng.integers(0, n_topics, size)]
+        block += rng.standard_normal((size, latent)).astype(np.float32) @ basis
+        block += 0.3 * rng.standard_normal((size, dim)).astype(np.float32)
+        vectors[start:start + size] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
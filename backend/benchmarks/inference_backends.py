@@ -0,0 +1,188 @@
+"""
+Inference backends compared against fp32 torch, per model: load time,
+memory, single-item latency, batched throughput and output drift.
+Every backend runs in a fresh interpreter so its memory is measured
+alone.
+
+    python -m benchmarks.inference_backends
+    python -m benchmarks.inference_backends --models embeddings --threads 4 -o backends.json
+
+Drift is measured on the same inputs as the fp32 run:
+    rewriter    exact-match rate and mean character similarity of outputs
+    embeddings  mean / min cosine to the fp32 vectors and top-10
+                neighbour overlap within the sample
+
+ONNX backends need `python -m app.ml_models.export_models` first.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from app.ml_models.job_embeddings import job_text
+from benchmarks.generators import jobs_frame, structured_resume
+from benchmarks.results import sample, save, summarize
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+TOP_K = 10
+
+
+def inputs(model: str, n: int) -> list:
+    if model == "rewriter":
+        bullets = [
+            line[2:] for line in structured_resume(n * 30, seed=5).split("\n") if line.startswith("- ")
+        ]
+        return bullets[:n]
+    jobs = jobs_frame(n, seed=5)
+    return [job_text(t, d) for t, d in zip(jobs["title"], jobs["description"])]
+
+
+def _peak_rss() -> int:
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# ---------------- One backend (child process) ----------------
+def measure(model: str, backend: str, n: int, batch: int, repeat: int, output: str):
+    from app.ml_models.backends import load_sentence_encoder, load_text2text
+    from app.ml_models.embeddings import HUB_ID
+    from app.ml_models.registry import _rss_bytes
+    from app.services.ai_rewriter import MODEL_NAME, build_prompt
+
+    texts = inputs(model, n)
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    if model == "rewriter":
+        pipe = load_text2text(MODEL_NAME, backend, max_length=128)
+        prompts = [build_prompt(t) for t in texts]
+
+        def run(items):
+            out = pipe(items, batch_size=len(items))
+            return [(r[0] if isinstance(r, list) else r)["generated_text"].strip() for r in out]
+    else:
+        encoder = load_sentence_encoder(HUB_ID, backend)
+        prompts = texts
+
+        def run(items):
+            return encoder.encode(items, batch_size=max(1, len(items)), show_progress_bar=False)
+    load_seconds = time.perf_counter() - start
+    model_bytes = max(0, _rss_bytes() - rss_before)
+
+    outputs = run(prompts)  # also warms up
+    single = iter(prompts * (repeat // len(prompts) + 1))
+    latency = summarize(sample(lambda: run([next(single)]), repeat, warmup=1))
+
+    batches = [prompts[i:i + batch] for i in range(0, len(prompts), batch)]
+    start = time.perf_counter()
+    for items in batches:
+        run(items)
+    throughput = len(prompts) / (time.perf_counter() - start)
+
+    report = {
+        "model": model,
+        "backend": backend,
+        "load_seconds": round(load_seconds, 2),
+        "model_rss_mb": round(model_bytes / 2**20, 1),
+        "peak_rss_mb": round(_peak_rss() / 2**20, 1),
+        "latency": latency,
+        "items_per_sec": round(throughput, 2),
+        "outputs": outputs if model == "rewriter" else None,
+    }
+    if model == "embeddings":
+        np.save(output + ".npy", np.asarray(outputs, dtype=np.float32))
+    with open(output, "w") as f:
+        json.dump(report, f)
+
+
+# ---------------- Comparison (parent) ----------------
+def drift(model: str, reference: dict, report: dict, ref_path: str, path: str) -> dict:
+    if model == "rewriter":
+        pairs = list(zip(reference["outputs"], report["outputs"]))
+        return {
+            "exact_match": round(sum(a == b for a, b in pairs) / len(pairs), 3),
+            "similarity": round(float(np.mean([SequenceMatcher(None, a, b).ratio() for a, b in pairs])), 3),
+        }
+
+    ref, vec = np.load(ref_path + ".npy"), np.load(path + ".npy")
+    ref = ref / np.linalg.norm(ref, axis=1, keepdims=True)
+    vec = vec / np.linalg.norm(vec, axis=1, keepdims=True)
+    cosine = (ref * vec).sum(axis=1)
+
+    k = min(TOP_K, len(ref) - 1)
+
+    def neighbours(m):
+        return np.argsort(-(m @ m.T), axis=1)[:, 1:k + 1]
+
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(neighbours(ref), neighbours(vec))] if k else [1.0]
+    return {
+        "mean_cosine": round(float(cosine.mean()), 5),
+        "min_cosine": round(float(cosine.min()), 5),
+        f"top{k}_overlap": round(float(np.mean(overlap)), 3),
+    }
+
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for model in args.models:
+            paths = {}
+            for backend in args.backends:
+                path = os.path.join(tmp, f"{model}-{backend}.json")
+                env = dict(os.environ)
+                if args.threads:
+                    env["INFERENCE_INTRA_THREADS"] = str(args.threads)
+                command = [
+                    sys.executable, "-m", "benchmarks.inference_backends", "--measure", model, backend,
+                    "-n", str(args.n), "--batch", str(args.batch), "--repeat", str(args.repeat), "--out", path,
+                ]
+                done = subprocess.run(command, env=env, capture_output=True, text=True)
+                if done.returncode != 0:
+                    error = (done.stderr.strip().splitlines() or ["failed"])[-1]
+                    print(f"⚠️ {model}/{backend}: {error}")
+                    continue
+                paths[backend] = path
+
+            if "torch" not in paths:
+                print(f"⚠️ {model}: no fp32 torch run to compare against")
+            for backend, path in paths.items():
+                with open(path) as f:
+                    report = json.load(f)
+                if "torch" in paths:
+                    with open(paths["torch"]) as f:
+                        report["drift"] = drift(model, json.load(f), report, paths["torch"], path)
+                report.pop("outputs")
+                results[f"{model}.{backend}"] = report
+
+    print(f"\n{'model/backend':<24} {'load s':>7} {'RSS MB':>8} {'p50 ms':>9} {'p95 ms':>9} {'items/s':>9}  drift")
+    for name, r in results.items():
+        lat = r["latency"]
+        print(f"{name:<24} {r['load_seconds']:>7} {r['model_rss_mb']:>8} {lat['p50']:9.1f} "
+              f"{lat['p95']:9.1f} {r['items_per_sec']:>9}  {r.get('drift', '')}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", choices=["rewriter", "embeddings"], default=["rewriter", "embeddings"])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("-n", type=int, default=64, help="inputs per model")
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=20, help="single-item latency samples")
+    parser.add_argument("--threads", type=int, help="INFERENCE_INTRA_THREADS for every run")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--measure", nargs=2, metavar=("MODEL", "BACKEND"), help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure, args.n, args.batch, args.repeat, args.out)
+    else:
+        results = run(args)
+        if args.output:
+            save(args.output, "inference_backends", results, n=args.n, batch=args.batch, threads=args.threads)
@@ -0,0 +1,89 @@
+"""
+Job matching: legacy read_csv + iterrows path vs the indexed catalog.
+
+    python -m benchmarks.job_matching --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.services.job_catalog import snapshot_from_frame
+from app.services.job_matcher import recommend_jobs
+from benchmarks.generators import jobs_frame, resume_skills
+from benchmarks.results import sample
+
+
+def legacy_recommend(jobs_file, skills):
+    """
+    The original recommend_jobs body (CSV parse + iterrows + full sort)
+    """
+    df = pd.read_csv(jobs_file)
+
+    skills = set(s.lower() for s in skills)
+    recommendations = []
+
+    for _, row in df.iterrows():
+        job_skills = set(
+            skill.strip().lower()
+            for skill in str(row["skills"]).split(",")
+        )
+
+        matched_skills = skills & job_skills
+        if not matched_skills:
+            continue
+
+        recommendations.append({
+            "title": row["title"],
+            "skills": list(job_skills),
+            "final_score": min(100, len(matched_skills) * 20),
+        })
+
+    return sorted(recommendations, key=lambda x: x["final_score"], reverse=True)
+
+
+def run(sizes, repeat, legacy_max):
+    skills = resume_skills(8)
+
+    print(f"{'jobs':>10} {'legacy ms':>12} {'indexed ms':>12} {'speedup':>9} {'build s':>9}")
+
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs_file = os.path.join(tmp, "jobs.csv")
+            jobs_frame(n).to_csv(jobs_file, index=False)
+
+            start = time.perf_counter()
+            catalog = snapshot_from_frame(pd.read_csv(jobs_file), version=str(n))
+            build = time.perf_counter() - start
+
+            indexed = min(sample(
+                lambda: recommend_jobs("", skills, 0, limit=20, catalog=catalog),
+                repeat, warmup=0,
+            ))
+
+            if n <= legacy_max:
+                legacy = min(sample(
+                    lambda: legacy_recommend(jobs_file, skills),
+                    1 if n >= 100_000 else repeat, warmup=0,
+                ))
+                legacy_ms = f"{legacy:12.1f}"
+                speedup = f"{legacy / indexed:8.0f}x"
+            else:
+                legacy_ms, speedup = f"{'skipped':>12}", f"{'-':>9}"
+
+            print(f"{n:>10} {legacy_ms} {indexed:12.3f} {speedup} {build:9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--legacy-max", type=int, default=1_000_000,
+        help="skip the (very slow) legacy path above this many jobs",
+    )
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat, args.legacy_max)
@@ -0,0 +1,49 @@
+"""
+Filtered / faceted job search over the columnar catalog.
+
+    python -m benchmarks.job_search --sizes 100000 1000000
+"""
+import argparse
+import time
+
+from app.services.job_catalog import snapshot_from_frame
+from app.services.job_search import search_jobs
+from benchmarks.generators import jobs_frame, resume_skills
+from benchmarks.results import sample
+
+QUERIES = {
+    "no filters": {},
+    "title": {"query": "data analyst"},
+    "demand + type": {"market_demand": ["high"], "job_type": ["INTERNSHIP"]},
+    "skills": {"skills": resume_skills(2)},
+    "date range": {"date_from": "2026-01-10", "date_to": "2026-01-15"},
+    "everything": {
+        "query": "engineer", "market_demand": ["high", "medium"],
+        "job_type": ["FRESHER"], "date_from": "2026-01-01",
+        "skills": resume_skills(1),
+    },
+    "deep page": {"market_demand": ["low"], "offset": 5000},
+}
+
+
+def run(sizes, repeat):
+    print(f"{'jobs':>10} {'query':<15} {'matches':>9} {'ms':>9}")
+
+    for n in sizes:
+        start = time.perf_counter()
+        catalog = snapshot_from_frame(jobs_frame(n), version=str(n))
+        print(f"{n:>10} {'(build)':<15} {'':>9} {(time.perf_counter() - start) * 1000:9.0f}")
+
+        for name, params in QUERIES.items():
+            result = search_jobs(catalog=catalog, **params)
+            best = min(sample(lambda: search_jobs(catalog=catalog, **params), repeat, warmup=0))
+            print(f"{n:>10} {name:<15} {result['total']:>9} {best:9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat)
@@ -0,0 +1,253 @@
+"""
+In-process load test of every route in app.main: the app runs through
+its real startup / shutdown (lifespan) and requests go over ASGI with
+httpx, so no server or network is involved. Reports p50 / p95 / p99
+latency and requests per second per route, in the shared JSON format
+(benchmarks.results).
+
+    python -m benchmarks.load_test -o load.json
+    python -m benchmarks.load_test --requests 500 --concurrency 32 --filter /jobs
+    python -m benchmarks.load_test --jobs 100000 --no-cache
+    python -m benchmarks.load_test --models       # also the AI rewrite routes
+
+Payloads cycle through --distinct variants, so with the response cache
+on, a route sees a mix of misses and hits; --no-cache turns it off.
+The job store and caches live in a temporary directory.
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+import zipfile
+from contextlib import asynccontextmanager
+
+from benchmarks.generators import RESUME_SKILLS, jobs_frame, resume_fixtures, resume_skills
+from benchmarks.results import print_table, save, summarize
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Drive the ASGI lifespan protocol (startup / shutdown events), which
+    httpx's ASGITransport doesn't do by itself
+    """
+    events = asyncio.Queue()
+    await events.put({"type": "lifespan.startup"})
+    started, stopped = asyncio.Event(), asyncio.Event()
+
+    async def receive():
+        return await events.get()
+
+    async def send(message):
+        if message["type"].startswith("lifespan.startup"):
+            started.set()
+        elif message["type"].startswith("lifespan.shutdown"):
+            stopped.set()
+        if message["type"].endswith(".failed"):
+            raise RuntimeError(message.get("message", "lifespan failed"))
+
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send))
+    await started.wait()
+    try:
+        yield
+    finally:
+        await events.put({"type": "lifespan.shutdown"})
+        await stopped.wait()
+        await task
+
+
+# ---------------- SCENARIOS ----------------
+def _zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def build_scenarios(resumes: dict, job_skills: list) -> dict:
+    """
+    {name: (method, path, request(variant) -> httpx kwargs, needs_models)}
+
+    `path` may also be a function of the variant, for routes addressing a
+    resource (editing sessions); it runs outside the timed request.
+    """
+    typical = resumes["typical"]
+    text = typical["text"]
+    skills = RESUME_SKILLS
+    batch_zip = _zip({f"resume_{i}.pdf": resumes["short"]["pdf"] for i in range(10)})
+
+    from app.services.ats_scorer import analyze_resume
+    from app.services.resume_sessions import resume_sessions
+    feedback = analyze_resume(text, skills, 2)["line_feedback"]
+
+    sessions = {}
+
+    def session_path(v):
+        # One open session per variant, created on first use so sessions
+        # opened by the POST scenario can't evict them first
+        if v not in sessions:
+            sessions[v] = resume_sessions.create(text, skills, 2)["session_id"]
+        return f"/ats/sessions/{sessions[v]}"
+
+    def new_session_path(v):
+        # DELETE needs a live session per request
+        return f"/ats/sessions/{resume_sessions.create(text, skills, 2)['session_id']}"
+
+    def with_variant(v, items):
+        # A different (but realistic) payload per variant
+        return items[: len(items) - v % 3] if len(items) > 3 else items
+
+    return {
+        "GET /": ("GET", "/", lambda v: {}, False),
+        "GET /models": ("GET", "/models", lambda v: {}, False),
+        "GET /cache": ("GET", "/cache", lambda v: {}, False),
+        "GET /metrics": ("GET", "/metrics", lambda v: {}, False),
+        "POST /resume/upload (pdf)": ("POST", "/resume/upload", lambda v: {
+            "files": {"file": (f"resume_{v}.pdf", typical["pdf"], "application/pdf")}
+        }, False),
+        "POST /resume/upload (docx)": ("POST", "/resume/upload", lambda v: {
+            "files": {"file": (f"resume_{v}.docx", typical["docx"], "application/octet-stream")}
+        }, False),
+        "POST /resume/batch (10 pdf zip)": ("POST", "/resume/batch", lambda v: {
+            "files": {"files": ("resumes.zip", batch_zip, "application/zip")}
+        }, False),
+        "POST /jobs/recommend": ("POST", "/jobs/recommend", lambda v: {"json": {
+            "resume_text": text, "skills": with_variant(v, job_skills), "experience": v % 5,
+        }}, False),
+        "POST /jobs/recommend (lexical)": ("POST", "/jobs/recommend", lambda v: {"json": {
+            "resume_text": text, "skills": job_skills, "experience": v % 5, "ranking": "lexical",
+        }}, False),
+        "POST /jobs/search": ("POST", "/jobs/search", lambda v: {"json": {
+            "query": ["engineer", "analyst", "developer"][v % 3],
+            "market_demand": ["high"], "offset": v % 50,
+        }}, False),
+        "POST /ats/score": ("POST", "/ats/score", lambda v: {"json": {
+            "resume_text": text, "skills": with_variant(v, skills), "experience": v % 5,
+        }}, False),
+        "POST /ats/score/batch (20)": ("POST", "/ats/score/batch", lambda v: {"json": {
+            "resumes": [{"resume_text": r["text"], "skills": skills, "experience": v % 5}
+                        for r in resumes.values()] * 7,
+        }}, False),
+        "POST /ats/apply-fixes": ("POST", "/ats/apply-fixes", lambda v: {"json": {
+            "resume_text": text, "feedback": with_variant(v, feedback),
+        }}, False),
+        "POST /ats/sessions": ("POST", "/ats/sessions", lambda v: {"json": {
+            "resume_text": text, "skills": with_variant(v, skills), "experience": v % 5,
+        }}, False),
+        "PATCH /ats/sessions/{id}": ("PATCH", session_path, lambda v: {"json": {
+            "edits": [{"start": 1 + v % 5, "end": 2 + v % 5, "lines": [f"- Led project {v} for the team"]}],
+        }}, False),
+        "GET /ats/sessions/{id}": ("GET", session_path, lambda v: {}, False),
+        "DELETE /ats/sessions/{id}": ("DELETE", new_session_path, lambda v: {}, False),
+        "POST /ats/export-pdf (single)": ("POST", "/ats/export-pdf", lambda v: {"json": {
+            "resume_text": text,
+        }}, False),
+        "POST /ats/export-pdf/batch (10)": ("POST", "/ats/export-pdf/batch", lambda v: {"json": {
+            "resumes": [{"filename": f"r{i}", "resume_text": text} for i in range(10)],
+        }}, False),
+        "POST /career/recommend": ("POST", "/career/recommend", lambda v: {"json": {
+            "skills": with_variant(v, skills), "k": 1 + v % 5,
+        }}, False),
+        "POST /ats/ai-rewrite": ("POST", "/ats/ai-rewrite", lambda v: {"json": {
+            "line": f"worked on feature {v} with the team",
+        }}, True),
+        "POST /ats/ai-rewrite/bulk (16)": ("POST", "/ats/ai-rewrite/bulk", lambda v: {"json": {
+            "lines": [f"worked on feature {v}-{i} with the team" for i in range(16)],
+        }}, True),
+    }
+
+
+async def run_scenario(client, method, path, make_request, n_requests, concurrency, distinct):
+    latencies, errors, rejected = [], 0, 0
+    counter = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors, rejected
+        for i in counter:
+            url = path(i % distinct) if callable(path) else path
+            start = time.perf_counter()
+            response = await client.request(method, url, **make_request(i % distinct))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code == 503:
+                rejected += 1
+            elif response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return summarize(latencies, rps=round(len(latencies) / elapsed, 1), errors=errors, rejected=rejected)
+
+
+async def run(args, workdir):
+    # Throwaway store / caches; must be set before the app is imported
+    os.environ["JOBS_DB"] = os.path.join(workdir, "jobs.sqlite")
+    os.environ["CACHE_DIR"] = os.path.join(workdir, "cache")
+
+    import httpx
+    from app.main import app
+    from app.utils.response_cache import response_cache
+
+    job_skills = RESUME_SKILLS
+    if args.jobs:
+        from app.database.job_store import bulk_upsert
+        start = time.perf_counter()
+        bulk_upsert(jobs_frame(args.jobs).to_dict("records"))
+        print(f"🗄️ Loaded {args.jobs} synthetic jobs in {time.perf_counter() - start:.1f}s")
+        job_skills = RESUME_SKILLS[:4] + resume_skills(4)
+
+    if args.no_cache:
+        response_cache.max_items = 0
+
+    scenarios = {
+        name: scenario for name, scenario in build_scenarios(resume_fixtures(), job_skills).items()
+        if (args.models or not scenario[3]) and (not args.filter or any(f in name for f in args.filter))
+    }
+
+    results = {}
+    async with lifespan(app):
+        # Let the startup date refresh (scheduler thread) land first
+        await asyncio.sleep(args.settle)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name, (method, path, make_request, _) in scenarios.items():
+                # One untimed request per variant warms lazy state
+                for v in range(min(args.distinct, 2)):
+                    await client.request(method, path(v) if callable(path) else path, **make_request(v))
+                results[name] = await run_scenario(
+                    client, method, path, make_request,
+                    args.requests, args.concurrency, args.distinct,
+                )
+                print(f"  {name:<34} p50 {results[name]['p50']:8.2f} ms  {results[name]['rps']:8.1f} rps")
+
+    print()
+    print_table(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct", type=int, default=20, help="payload variants per route")
+    parser.add_argument("--jobs", type=int, default=0, help="add this many synthetic jobs to the store")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--filter", nargs="+", help="only routes whose name contains one of these")
+    parser.add_argument("--models", action="store_true", help="include the AI rewrite routes")
+    parser.add_argument("--settle", type=float, default=1.0, help="seconds to wait after startup")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jobtune-load-") as workdir:
+        results = asyncio.run(run(args, workdir))
+    if args.output:
+        save(
+            args.output, "load", results,
+            requests=args.requests, concurrency=args.concurrency,
+            jobs=args.jobs, response_cache=not args.no_cache,
+        )
@@ -0,0 +1,177 @@
+"""
+Microbenchmarks of every backend hot path, on synthetic fixtures:
+job matching and search over a generated catalog, resume parsing and
+ATS scoring at several resume lengths, PDF / DOCX extraction, career
+recommendations, PDF export and ATS fixes. Results use the shared JSON
+format (benchmarks.results), so two runs can be diffed with
+benchmarks.compare.
+
+    python -m benchmarks.micro -o micro.json
+    python -m benchmarks.micro --jobs 100000 --filter jobs. --repeat 50
+    python -m benchmarks.micro --models          # also the HF rewriter
+"""
+import argparse
+import tempfile
+
+from app.ml_models.tfidf_model import sync_tfidf_index
+from app.services.ats_fixer import apply_fixes
+from app.services.ats_scorer import analyze_resume, analyze_resumes
+from app.services.career_recommender import get_career_graph, recommend_career
+from app.services.job_catalog import snapshot_from_frame
+from app.services.job_matcher import recommend_jobs
+from app.services.job_search import search_jobs
+from app.services.pdf_exporter import render_resume_pdf
+from app.services.resume_parser import parse_resume
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.text_extractor import extract_text_from_bytes
+from benchmarks.generators import RESUME_SKILLS, jobs_frame, resume_fixtures, resume_skills
+from benchmarks.results import print_table, sample, save, summarize
+
+BENCHMARKS = {}
+
+
+def benchmark(name, needs_models=False):
+    """
+    Register a setup function: it receives the shared fixtures and
+    returns the zero-argument callable that gets timed
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, needs_models)
+        return setup
+    return register
+
+
+# ---------------- FIXTURES ----------------
+def build_fixtures(n_jobs: int, index_dir: str) -> dict:
+    catalog = snapshot_from_frame(jobs_frame(n_jobs), version=f"bench-{n_jobs}")
+    sync_tfidf_index(catalog, directory=index_dir)
+
+    resumes = resume_fixtures()
+    for fixture in resumes.values():
+        fixture["parsed"] = parse_resume(fixture["text"])
+        fixture["analysis"] = analyze_resume(fixture["text"], RESUME_SKILLS, 2)
+
+    return {"catalog": catalog, "resumes": resumes, "skills": resume_skills(8)}
+
+
+# ---------------- JOBS ----------------
+@benchmark("jobs.recommend.skills")
+def _(fx):
+    return lambda: recommend_jobs("", fx["skills"], 2, ranking="skills", catalog=fx["catalog"])
+
+
+@benchmark("jobs.recommend.lexical")
+def _(fx):
+    text = fx["resumes"]["typical"]["text"]
+    return lambda: recommend_jobs(text, fx["skills"], 2, ranking="lexical", catalog=fx["catalog"])
+
+
+@benchmark("jobs.search.unfiltered")
+def _(fx):
+    return lambda: search_jobs(catalog=fx["catalog"])
+
+
+@benchmark("jobs.search.filtered")
+def _(fx):
+    params = {
+        "query": "engineer", "market_demand": ["high", "medium"],
+        "skills": fx["skills"][:1], "date_from": "2026-01-01",
+    }
+    return lambda: search_jobs(catalog=fx["catalog"], **params)
+
+
+# ---------------- RESUMES ----------------
+def _per_length(prefix, make):
+    for length in ("short", "typical", "long"):
+        benchmark(f"{prefix}.{length}")(lambda fx, length=length: make(fx["resumes"][length]))
+
+
+_per_length("resume.extract_pdf", lambda r: lambda: extract_text_from_bytes(r["pdf"], "resume.pdf", 20))
+_per_length("resume.extract_docx", lambda r: lambda: extract_text_from_bytes(r["docx"], "resume.docx"))
+_per_length("resume.parse", lambda r: lambda: parse_resume(r["text"]))
+_per_length("skills.extract", lambda r: lambda: get_skill_matcher().extract(r["text"]))
+
+
+# ---------------- ATS ----------------
+_per_length("ats.score", lambda r: lambda: analyze_resume(r["text"], r["parsed"]["skills"], 2))
+_per_length("ats.apply_fixes", lambda r: lambda: apply_fixes(r["text"], r["analysis"]["line_feedback"]))
+_per_length("ats.export_pdf", lambda r: lambda: render_resume_pdf(r["text"]))
+
+
+@benchmark("ats.score_batch.50")
+def _(fx):
+    items = [
+        {"resume_text": r["text"], "skills": r["parsed"]["skills"], "experience": 2}
+        for r in fx["resumes"].values()
+    ] * 17
+    return lambda: analyze_resumes(items[:50])
+
+
+# ---------------- CAREER ----------------
+@benchmark("career.recommend.cold")
+def _(fx):
+    graph = get_career_graph()
+
+    def run():
+        graph._cached.cache_clear()
+        recommend_career(RESUME_SKILLS, k=3)
+    return run
+
+
+@benchmark("career.recommend.target")
+def _(fx):
+    graph = get_career_graph()
+
+    def run():
+        graph._cached.cache_clear()
+        recommend_career(["python", "sql"], k=3, target_role="Senior Data Analyst")
+    return run
+
+
+@benchmark("career.recommend.cached")
+def _(fx):
+    return lambda: recommend_career(RESUME_SKILLS, k=3)
+
+
+# ---------------- MODELS ----------------
+@benchmark("ai.rewrite.line", needs_models=True)
+def _(fx):
+    from app.services.ai_rewriter import rewrite_line_hf
+    return lambda: rewrite_line_hf("worked on backend apis for the team")
+
+
+@benchmark("ai.rewrite.lines_16", needs_models=True)
+def _(fx):
+    from app.services.ai_rewriter import rewrite_lines_hf
+    lines = [f"worked on feature {i} with the team" for i in range(16)]
+    return lambda: rewrite_lines_hf(lines)
+
+
+def run(n_jobs, repeat, name_filter=None, models=False):
+    selected = {
+        name: setup for name, (setup, needs_models) in BENCHMARKS.items()
+        if (models or not needs_models) and (not name_filter or any(f in name for f in name_filter))
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory() as index_dir:
+        fixtures = build_fixtures(n_jobs, index_dir)
+        for name, setup in selected.items():
+            results[name] = summarize(sample(setup(fixtures), repeat))
+
+    print_table(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000, help="synthetic catalog size")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--filter", nargs="+", help="only benchmarks whose name contains one of these")
+    parser.add_argument("--models", action="store_true", help="include benchmarks that load HF models")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.repeat, args.filter, args.models)
+    if args.output:
+        save(args.output, "micro", results, jobs=args.jobs, repeat=args.repeat)
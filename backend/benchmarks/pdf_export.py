@@ -0,0 +1,78 @@
+"""
+PDF export throughput (pages/sec): the original line-truncating canvas
+loop vs the layout engine, in one process and across a process pool.
+
+    python -m benchmarks.pdf_export --resumes 200 --words 1500 -w 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.services.pdf_exporter import layout_pages, render_resume_pdf
+from benchmarks.generators import structured_resume
+
+
+def legacy_generate(text: str):
+    """
+    The original generate_resume_pdf
+    """
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    y = height - 40
+    for line in text.split("\n"):
+        pdf.drawString(40, y, line[:100])
+        y -= 15
+        if y < 40:
+            pdf.showPage()
+            y = height - 40
+    pdf.save()
+    return buffer
+
+
+def run(n_resumes, n_words, workers):
+    docs = [structured_resume(n_words, seed) for seed in range(n_resumes)]
+    pages = sum(len(layout_pages(doc)) for doc in docs)
+    print(f"{n_resumes} resumes, ~{n_words} words each, {pages} pages")
+
+    def report(name, seconds, n_pages=pages):
+        print(f"{name:<22} {seconds:8.2f} s {n_pages / seconds:10.1f} pages/s")
+
+    start = time.perf_counter()
+    for doc in docs:
+        legacy_generate(doc)
+    legacy = time.perf_counter() - start
+    legacy_pages = sum(
+        -(-len(doc.split("\n")) // 50) for doc in docs  # 50 lines per legacy page
+    )
+    report("legacy (truncating)", legacy, legacy_pages)
+
+    start = time.perf_counter()
+    for doc in docs:
+        layout_pages(doc)
+    report("layout only", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for doc in docs:
+        render_resume_pdf(doc)
+    report("render, 1 process", time.perf_counter() - start)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(render_resume_pdf, docs[:workers]))  # start the workers
+        start = time.perf_counter()
+        list(pool.map(render_resume_pdf, docs, chunksize=4))
+        report(f"render, {workers} workers", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    run(args.resumes, args.words, args.workers)
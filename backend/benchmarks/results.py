@@ -0,0 +1,103 @@
+"""
+JSON result format shared by the benchmark suite:
+
+    {
+      "suite": "micro" | "load",
+      "created": "2026-01-15T10:00:00",
+      "env": {"python": ..., "numpy": ..., "cpu_count": ..., "commit": ...},
+      "results": {
+        "<name>": {"unit": "ms", "samples": n, "min": ..., "mean": ...,
+                   "p50": ..., "p95": ..., "p99": ..., "rps": ..., "errors": ...}
+      }
+    }
+
+rps / errors are only present for load test scenarios.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+
+def summarize(samples_ms, **extra) -> dict:
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if not len(samples):
+        return {"unit": "ms", "samples": 0, **extra}
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "unit": "ms",
+        "samples": int(len(samples)),
+        "min": round(float(samples.min()), 3),
+        "mean": round(float(samples.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        **extra,
+    }
+
+
+def sample(fn, repeat: int, warmup: int = 1) -> list:
+    """
+    Wall time of `repeat` calls of fn(), in ms
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": _git_commit(),
+    }
+
+
+def print_table(results: dict):
+    print(f"{'benchmark':<34} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'rps':>9}")
+    for name, r in results.items():
+        if not r.get("samples"):
+            print(f"{name:<34} {'-':>6}")
+            continue
+        rps = f"{r['rps']:9.1f}" if "rps" in r else f"{'':>9}"
+        print(f"{name:<34} {r['samples']:>6} {r['p50']:10.2f} {r['p95']:10.2f} {r['p99']:10.2f} {rps}")
+
+
+def save(path, suite: str, results: dict, **meta):
+    report = {
+        "suite": suite,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "env": environment(),
+        **meta,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {path}")
+
+
+def load(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
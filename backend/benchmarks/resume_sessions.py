@@ -0,0 +1,44 @@
+"""
+Re-scoring after a one-line edit: posting the whole resume to
+analyze_resume again vs a resume session that only redoes the edited
+line, for resumes from one page to ~100 pages.
+
+    python -m benchmarks.resume_sessions
+"""
+import argparse
+import random
+
+from app.services.ats_scorer import analyze_resume
+from app.services.resume_sessions import ResumeSession
+from benchmarks.generators import structured_resume
+from benchmarks.results import sample, summarize
+
+
+def run(words, edits):
+    print(f"{'words':>8} {'lines':>6} {'full p50 ms':>12} {'edit p50 ms':>12} {'speedup':>8}")
+    for n_words in words:
+        text = structured_resume(n_words, seed=n_words)
+        session = ResumeSession(text, ["python"], 1)
+        replacements = structured_resume(600, seed=1).split("\n")
+        rng = random.Random(n_words)
+
+        def full():
+            analyze_resume(session.text, ["python"], 1)
+
+        def edit():
+            line = rng.randrange(len(session.lines))
+            session.apply([{"start": line, "end": line + 1, "lines": [rng.choice(replacements)]}])
+            session.result(changed=[line])
+
+        full_ms = summarize(sample(full, edits, warmup=2))["p50"]
+        edit_ms = summarize(sample(edit, edits, warmup=2))["p50"]
+        print(f"{n_words:>8} {len(session.lines):>6} {full_ms:12.3f} {edit_ms:12.3f} {full_ms / edit_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, nargs="+", default=[600, 5000, 50000])
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.words, args.edits)
@@ -0,0 +1,66 @@
+"""
+AI rewrite throughput: one generation per line vs the micro-batcher.
+Loads flan-t5 on first use, so expect a warm-up pause.
+
+    python -m benchmarks.rewrite_batching --lines 64 --batch 16
+"""
+import argparse
+import asyncio
+import time
+
+from app.ml_models.registry import registry
+from app.services.ai_rewriter import rewrite_line_hf, rewrite_lines_hf
+from app.services.batcher import MicroBatcher
+
+SAMPLE_LINES = [
+    "worked on backend apis for the college fest website",
+    "responsible for testing the mobile app before releases",
+    "made dashboards in excel for the sales team",
+    "helped migrate the database to postgres",
+    "wrote python scripts to clean survey data",
+    "part of the team that built an inventory tool",
+]
+
+
+def sequential(lines):
+    start = time.perf_counter()
+    for line in lines:
+        rewrite_line_hf(line)
+    return time.perf_counter() - start
+
+
+async def batched(lines, max_batch, max_wait_ms):
+    batcher = MicroBatcher(rewrite_lines_hf, max_batch=max_batch, max_wait=max_wait_ms / 1000)
+
+    # Every line arrives as its own concurrent request
+    start = time.perf_counter()
+    await asyncio.gather(*(batcher.submit(line) for line in lines))
+    elapsed = time.perf_counter() - start
+
+    await batcher.close()
+    return elapsed, batcher.batches
+
+
+def run(n_lines, max_batch, max_wait_ms):
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] + f" ({i})" for i in range(n_lines)]
+
+    registry.warmup(["rewriter"])
+    rewrite_line_hf(lines[0])
+
+    seq = sequential(lines)
+    bat, batches = asyncio.run(batched(lines, max_batch, max_wait_ms))
+
+    print(f"lines: {n_lines}  max_batch: {max_batch}  max_wait: {max_wait_ms}ms")
+    print(f"one-at-a-time: {n_lines / seq:8.2f} lines/sec ({seq:.1f}s)")
+    print(f"micro-batched: {n_lines / bat:8.2f} lines/sec ({bat:.1f}s, {batches} batches)")
+    print(f"speedup:       {seq / bat:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    run(args.lines, args.batch, args.wait_ms)
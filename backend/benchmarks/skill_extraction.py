@@ -0,0 +1,50 @@
+"""
+Skill extraction: the old substring loop over a skills list vs the
+compiled token-trie SkillMatcher, at large taxonomy sizes.
+
+    python -m benchmarks.skill_extraction --skills 10000 --words 500 5000
+"""
+import argparse
+import time
+
+from app.utils.skill_matcher import SkillMatcher
+from benchmarks.generators import resume_text, skill_taxonomy
+from benchmarks.results import sample
+
+
+def legacy_extract(text, skills_db):
+    """
+    The original parse_resume loop: one substring scan per skill
+    """
+    text_lower = text.lower()
+    return list(set(skill for skill in skills_db if skill in text_lower))
+
+
+def run(n_skills, word_counts, repeat):
+    taxonomy = skill_taxonomy(n_skills)
+    skills_db = list(taxonomy)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    build = time.perf_counter() - start
+    print(f"taxonomy: {n_skills} skills, matcher built in {build * 1000:.0f} ms")
+
+    print(f"{'words':>8} {'legacy ms':>11} {'matcher ms':>11} {'speedup':>9} {'found':>7}")
+    for n_words in word_counts:
+        text = resume_text(n_words, skills_db[:200])
+
+        legacy = min(sample(lambda: legacy_extract(text, skills_db), repeat, warmup=0))
+        compiled = min(sample(lambda: matcher.extract(text), repeat, warmup=0))
+        found = len(matcher.extract(text))
+
+        print(f"{n_words:>8} {legacy:11.2f} {compiled:11.3f} {legacy / compiled:8.0f}x {found:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=10_000)
+    parser.add_argument("--words", type=int, nargs="+", default=[300, 1_000, 5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.skills, args.words, args.repeat)
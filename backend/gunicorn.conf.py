@@ -0,0 +1,58 @@
+"""
+Multi-worker deployment:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+One uvicorn worker per core (WEB_CONCURRENCY to override). The app is
+imported once in the master and the workers are forked from it, so
+models listed in MODEL_WARMUP (GUNICORN_PRELOAD_MODELS when unset) are
+loaded once and shared copy-on-write.
+The job catalog and embedding matrix are memory-mapped files shared by
+every worker, and a file lock elects the one worker that runs the
+scheduler.
+"""
+import os
+
+_cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(_cpus)))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# Every worker has its own process pool; split the cores between them
+# instead of starting workers x cores processes
+os.environ.setdefault("CPU_POOL_SIZE", str(max(1, _cpus // workers)))
+
+
+def when_ready(server):
+    # Runs in the master before forking: load models here so their
+    # weights are shared instead of copied into every worker
+    from app.config import GUNICORN_PRELOAD_MODELS, MODEL_WARMUP
+    from app.ml_models.registry import registry
+
+    names = MODEL_WARMUP or GUNICORN_PRELOAD_MODELS
+    loaded = []
+    for name in names:
+        try:
+            registry.warmup([name])
+            loaded.append(name)
+        except Exception as e:
+            # Workers still load it on first use
+            server.log.warning("Could not preload model %s: %s", name, e)
+    if loaded:
+        server.log.info("Models preloaded in master: %s", ", ".join(loaded))
+
+
+def post_fork(server, worker):
+    # Intra-op threads from every worker would oversubscribe the cores;
+    # INFERENCE_INTRA_THREADS, when set, wins
+    import sys
+
+    from app.config import INFERENCE_INTRA_THREADS
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(INFERENCE_INTRA_THREADS or max(1, _cpus // workers))
@@ -6,10 +6,28 @@ export interface ResumeData {
 
 export interface ATSLineFeedback {
   line: string;
+  line_number?: number;
   issues: string[];
   improved_example: string;
 }
 
+export interface ATSPatchHunk {
+  start: number;
+  end: number;
+  before: string;
+  after: string;
+  item: number;
+}
+
+export interface ATSFixResult {
+  improved_resume?: string;
+  patch: {
+    hunks: ATSPatchHunk[];
+    lines_before: number;
+    unmatched: number[];
+  };
+}
+
 export interface ATSResult {
   ats_score: number;
   suggestions: string[];